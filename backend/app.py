@@ -1,21 +1,27 @@
 """
 Flask 主应用 - AI 赋能的智能简历分析系统
 """
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
-import os
 import json
 from datetime import datetime
 from werkzeug.utils import secure_filename
 
 from config import (
     DEBUG, UPLOAD_FOLDER, MAX_FILE_SIZE, REDIS_ENABLED, 
-    REDIS_HOST, REDIS_PORT, REDIS_DB
+    REDIS_HOST, REDIS_PORT, REDIS_DB, PDF_SANDBOX_ENABLED,
+    BATCH_EXTRACT_MAX_ITEMS, LLM_EXTRACTION_MODE, LLM_REQUEST_DEADLINE, PROGRESSIVE_UPLOAD
 )
 from services.pdf_parser import PDFParser
+from services.pdf_sandbox import PDFSandbox
 from services.ai_hybrid_extractor import HybridExtractor  # 使用混合提取器（优先LLM，备选正则）
+from services.batch_extractor import BatchExtractor
 from services.resume_matcher import ResumeMatcher
 from services.cache import CacheManager
+from services.singleflight import SingleFlight
+from services.enrichment import ENRICHMENT_QUEUE, PENDING, DONE, FAILED
+from services.resume_document import ResumeDocument
+from utils.text_cleaner import clean_text
 
 # 初始化 Flask 应用
 app = Flask(__name__)
@@ -33,17 +39,118 @@ redis_config = {
 }
 cache_manager = CacheManager(use_redis=REDIS_ENABLED, redis_config=redis_config)
 
+# 相同请求并发到达时只计算一次，其余请求共享结果（启用 Redis 时跨进程生效）
+single_flight = SingleFlight(cache_manager)
+
 # 存储已上传简历信息（内存存储，用于演示）
 uploaded_resumes = {}
 
+# 沙箱因超限终止解析时返回的错误类型
+SANDBOX_LIMIT_ERRORS = ('timeout', 'page_timeout', 'cpu_limit', 'memory_limit', 'crashed')
+
+# 补全事件流的心跳间隔（秒），以及等待后台补全的最长时间
+ENRICHMENT_EVENTS_KEEPALIVE = 15
+ENRICHMENT_EVENTS_MAX_WAIT = LLM_REQUEST_DEADLINE * 2
+
+def build_upload_response(resume_data, from_cache=False):
+    """
+    根据存储的简历记录构造上传接口的返回体
+    """
+    extracted_info = resume_data['extracted_info']
+    return jsonify({
+        'success': True,
+        'message': '简历已存在（来自缓存）' if from_cache else '简历上传成功',
+        'data': {
+            'resume_id': resume_data['resume_id'],
+            'filename': resume_data['filename'],
+            'base_info': extracted_info['base_info'],
+            'optional_info': extracted_info['optional_info'],
+            'skills': extracted_info['skills'],
+            'keywords': extracted_info['keywords'],
+            'summary': extracted_info.get('summary'),
+            'truncated': resume_data['pdf_info'].get('truncated', False),
+            'enrichment_status': resume_data.get('enrichment_status')
+        },
+        'from_cache': from_cache
+    }), 200
+
+
+def build_resume_payload(resume_data):
+    """
+    简历详情接口和补全事件流共用的返回数据
+    """
+    return {
+        'resume_id': resume_data['resume_id'],
+        'filename': resume_data['filename'],
+        'upload_time': resume_data['upload_time'],
+        'extracted_info': resume_data['extracted_info'],
+        'enrichment_status': resume_data.get('enrichment_status')
+    }
+
+
+def format_sse_event(event, data):
+    """
+    格式化一条 Server-Sent Events 事件
+    """
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def sse_response(events):
+    """
+    以 text/event-stream 流式返回事件（关闭代理缓冲）
+    """
+    return Response(
+        stream_with_context(events),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+def start_enrichment(resume_data, document, cache_key):
+    """
+    在后台执行 LLM 提取，完成后替换记录中的正则结果
+    """
+    def on_done(result, error):
+        if error is None and result:
+            resume_data['extracted_info'] = result
+            resume_data['enrichment_status'] = DONE
+            # 补全后才写入缓存，避免重复上传命中只有正则结果的记录
+            cache_manager.set(cache_key, resume_data)
+        else:
+            # LLM 失败时保留正则结果、不写缓存，重复上传时重新补全
+            resume_data['enrichment_status'] = FAILED
+    
+    # fallback=False：LLM 不可用、熔断或没有返回任何字段时抛出异常，而不是返回纯正则结果
+    ENRICHMENT_QUEUE.submit(
+        resume_data['resume_id'],
+        lambda: HybridExtractor.extract_all_info(document, fallback=False),
+        on_done
+    )
+
 
 @app.route('/health', methods=['GET'])
 def health():
-    """健康检查端点"""
+    """健康检查端点（附带 LLM 调用指标、缓存、熔断和限流状态）"""
+    llm_metrics = None
+    if HybridExtractor.llm_available:
+        from services.ai_llm_extractor import LLM_CLIENT
+        from services.llm_cache import LLM_CACHE
+        from services.circuit_breaker import LLM_BREAKER
+        from services.rate_limiter import LLM_RATE_LIMITER
+        llm_metrics = LLM_CLIENT.get_metrics()
+        llm_metrics['cache'] = LLM_CACHE.get_stats() if LLM_CACHE is not None else None
+        llm_metrics['breaker'] = LLM_BREAKER.get_state() if LLM_BREAKER is not None else None
+        llm_metrics['rate_limiter'] = LLM_RATE_LIMITER.get_metrics() if LLM_RATE_LIMITER is not None else None
+        if LLM_EXTRACTION_MODE == 'batched':
+            from services.ai_llm_extractor import LLM_BATCHER
+            llm_metrics['batcher'] = LLM_BATCHER.get_stats()
+    
     return jsonify({
         'status': 'healthy',
         'timestamp': datetime.now().isoformat(),
-        'service': 'Resume Analysis System'
+        'service': 'Resume Analysis System',
+        'llm': llm_metrics,
+        'enrichment': ENRICHMENT_QUEUE.get_stats()
     }), 200
 
 
@@ -53,6 +160,9 @@ def upload_resume():
     上传简历接口
     
     接收 PDF 格式的简历文件，解析内容并提取关键信息
+    
+    可选表单参数 max_pages / max_chars 限制解析的页数和字符数；
+    progressive=true 时先返回正则提取结果（enrichment_status 为 pending），LLM 结果在后台补全
     """
     try:
         # 检查是否上传了文件
@@ -81,71 +191,87 @@ def upload_resume():
                 'error': 'Only PDF files are supported'
             }), 400
         
-        # 保存文件
+        # 流式读入内存（先校验 %PDF 文件头和大小），同时计算内容哈希
         filename = secure_filename(file.filename)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_')
-        filename = timestamp + filename
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        
-        os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-        file.save(filepath)
-        
-        # 验证 PDF 文件
-        is_valid, error_msg = PDFParser.validate_pdf(filepath)
-        if not is_valid:
-            os.remove(filepath)  # 删除无效文件
+        read_result = PDFParser.read_stream(
+            file.stream, MAX_FILE_SIZE, file.content_length
+        )
+        if not read_result['success']:
             return jsonify({
                 'success': False,
-                'message': f'PDF 验证失败: {error_msg}',
-                'error': error_msg
+                'message': f'PDF 验证失败: {read_result["error"]}',
+                'error': read_result['error']
             }), 400
+        content_hash = read_result['data']['sha256']
+        
+        # 以内容哈希（及解析预算）生成简历 ID，相同文件重复上传得到相同 ID
+        max_pages = request.form.get('max_pages', type=int)
+        max_chars = request.form.get('max_chars', type=int)
+        cache_key = CacheManager.generate_key('resume', {
+            'sha256': content_hash,
+            'max_pages': max_pages,
+            'max_chars': max_chars
+        })
+        resume_id = f"resume_{cache_key.split(':', 1)[1][:16]}"
         
-        # 解析 PDF
-        parse_result = PDFParser.extract_text(filepath)
+        # 命中已解析记录时直接返回，跳过 PDF 解析和信息提取
+        resume_data = uploaded_resumes.get(resume_id) or cache_manager.get(cache_key)
+        if resume_data:
+            if isinstance(resume_data, str):
+                resume_data = json.loads(resume_data)
+            uploaded_resumes[resume_id] = resume_data
+            if resume_data.get('enrichment_status') in (PENDING, FAILED) and HybridExtractor.llm_available:
+                # 上次补全失败或尚未完成：重新提交（进行中的任务不会重复提交），客户端继续等待补全结果
+                resume_data['enrichment_status'] = PENDING
+                start_enrichment(resume_data, ResumeDocument(clean_text(resume_data['resume_text'])), cache_key)
+            return build_upload_response(resume_data, from_cache=True)
+        
+        # 单次打开 PDF 完成校验和解析（可选页数/字符预算），默认在沙箱子进程中执行
+        parser = PDFSandbox if PDF_SANDBOX_ENABLED else PDFParser
+        parse_result = parser.parse(
+            read_result['data']['buffer'], max_pages=max_pages, max_chars=max_chars
+        )
         if not parse_result['success']:
-            os.remove(filepath)
             return jsonify({
                 'success': False,
                 'message': f'PDF 解析失败: {parse_result["error"]}',
-                'error': parse_result['error']
-            }), 500
+                'error': parse_result['error'],
+                'error_type': parse_result.get('error_type', 'parse_error')
+            }), 422 if parse_result.get('error_type') in SANDBOX_LIMIT_ERRORS else 400
         
         # 提取关键信息（使用混合提取器：优先LLM，失败时回退）
         resume_text = parse_result['data']['raw_text']
-        extracted_info = HybridExtractor.extract_all_info(resume_text)
-        
-        # 生成简历 ID
-        resume_id = f"resume_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        progressive = request.form.get('progressive', str(PROGRESSIVE_UPLOAD)).lower() in ('1', 'true', 'yes')
+        if progressive and HybridExtractor.llm_available:
+            # 渐进式：立即返回正则结果，LLM 提取在后台完成
+            document = ResumeDocument(clean_text(resume_text))
+            extracted_info = HybridExtractor.extract_regex_info(document)
+            enrichment_status = PENDING
+        else:
+            extracted_info = HybridExtractor.extract_all_info(resume_text)
+            enrichment_status = None
         
         # 存储简历信息
         resume_data = {
             'resume_id': resume_id,
             'filename': filename,
-            'filepath': filepath,
+            'content_hash': content_hash,
             'upload_time': datetime.now().isoformat(),
             'resume_text': resume_text,
             'pdf_info': parse_result['data'],
-            'extracted_info': extracted_info
+            'extracted_info': extracted_info,
+            'enrichment_status': enrichment_status
         }
         
         uploaded_resumes[resume_id] = resume_data
         
-        # 缓存简历信息
-        cache_key = CacheManager.generate_key('resume', {'filename': filename})
-        cache_manager.set(cache_key, resume_data)
+        if enrichment_status == PENDING:
+            start_enrichment(resume_data, document, cache_key)
+        else:
+            # 按内容哈希缓存解析与提取结果
+            cache_manager.set(cache_key, resume_data)
         
-        return jsonify({
-            'success': True,
-            'message': '简历上传成功',
-            'data': {
-                'resume_id': resume_id,
-                'filename': filename,
-                'base_info': extracted_info['base_info'],
-                'optional_info': extracted_info['optional_info'],
-                'skills': extracted_info['skills'],
-                'keywords': extracted_info['keywords']
-            }
-        }), 200
+        return build_upload_response(resume_data)
     
     except Exception as e:
         return jsonify({
@@ -158,7 +284,7 @@ def upload_resume():
 @app.route('/api/resume/<resume_id>', methods=['GET'])
 def get_resume(resume_id):
     """
-    获取已解析的简历信息
+    获取已解析的简历信息（渐进式上传时可轮询 enrichment_status，直到不再是 pending）
     """
     if resume_id not in uploaded_resumes:
         return jsonify({
@@ -171,15 +297,87 @@ def get_resume(resume_id):
     
     return jsonify({
         'success': True,
-        'data': {
-            'resume_id': resume_data['resume_id'],
-            'filename': resume_data['filename'],
-            'upload_time': resume_data['upload_time'],
-            'extracted_info': resume_data['extracted_info']
-        }
+        'data': build_resume_payload(resume_data)
     }), 200
 
 
+@app.route('/api/resume/<resume_id>/events', methods=['GET'])
+def resume_events(resume_id):
+    """
+    简历补全事件流（Server-Sent Events）
+    
+    连接后立即推送一次当前记录（event: resume），后台补全完成时再推送一次，
+    记录不再是 pending 时发送 event: end 并关闭
+    """
+    if resume_id not in uploaded_resumes:
+        return jsonify({
+            'success': False,
+            'message': '简历不存在',
+            'error': f'Resume with ID {resume_id} not found'
+        }), 404
+    
+    resume_data = uploaded_resumes[resume_id]
+    
+    def generate():
+        # 先读版本号再读记录，之后的更新都会唤醒等待
+        version = ENRICHMENT_QUEUE.version(resume_id)
+        yield format_sse_event('resume', build_resume_payload(resume_data))
+        
+        waited = 0
+        while resume_data.get('enrichment_status') == PENDING and waited < ENRICHMENT_EVENTS_MAX_WAIT:
+            new_version = ENRICHMENT_QUEUE.wait_for_update(resume_id, version, ENRICHMENT_EVENTS_KEEPALIVE)
+            if new_version == version:
+                waited += ENRICHMENT_EVENTS_KEEPALIVE
+                yield ': keep-alive\n\n'
+                continue
+            version = new_version
+            yield format_sse_event('resume', build_resume_payload(resume_data))
+        
+        yield format_sse_event('end', {'enrichment_status': resume_data.get('enrichment_status')})
+    
+    return sse_response(generate())
+
+
+@app.route('/api/resume/<resume_id>/summary/stream', methods=['GET'])
+def stream_summary(resume_id):
+    """
+    流式生成简历摘要（Server-Sent Events）
+    
+    event: token 推送 LLM 增量输出的文本片段；最后以 event: done 推送完整摘要和来源（llm 或 fallback）。
+    LLM 不可用、熔断或输出中断时 done 中为已提取的摘要，客户端应以 done 的内容为准
+    """
+    if resume_id not in uploaded_resumes:
+        return jsonify({
+            'success': False,
+            'message': '简历不存在',
+            'error': f'Resume with ID {resume_id} not found'
+        }), 404
+    
+    resume_data = uploaded_resumes[resume_id]
+    
+    def generate():
+        if HybridExtractor.llm_available:
+            from services.ai_llm_extractor import LLMExtractor
+            from services.llm_client import LLMStreamError
+            parts = []
+            try:
+                for text in LLMExtractor.stream_summary_with_llm(clean_text(resume_data['resume_text'])):
+                    parts.append(text)
+                    yield format_sse_event('token', {'text': text})
+                if parts:
+                    yield format_sse_event('done', {'summary': ''.join(parts), 'source': 'llm'})
+                    return
+            except LLMStreamError as e:
+                print(f"[Summary] 流式摘要失败，使用已提取的摘要: {e}")
+        
+        yield format_sse_event('done', {
+            'summary': resume_data['extracted_info'].get('summary') or '',
+            'source': 'fallback'
+        })
+    
+    return sse_response(generate())
+
+
 @app.route('/api/match', methods=['POST'])
 def match_resume():
     """
@@ -211,10 +409,17 @@ def match_resume():
         
         resume_data = uploaded_resumes[resume_id]
         
-        # 生成缓存键
+        # 生成缓存键：包含参与匹配的提取结果，后台补全替换技能后不再命中按正则结果算出的匹配
+        match_input = {
+            'skills': resume_data['extracted_info']['skills'],
+            'resume_text': resume_data['resume_text'],
+            'optional_info': resume_data['extracted_info']['optional_info']
+        }
         cache_key = CacheManager.generate_key('match', {
             'resume_id': resume_id,
-            'job_description': job_description
+            'job_description': job_description,
+            'skills': match_input['skills'],
+            'optional_info': match_input['optional_info']
         })
         
         # 检查缓存
@@ -227,24 +432,17 @@ def match_resume():
                 'from_cache': True
             }), 200
         
-        # 执行匹配
-        match_result = ResumeMatcher.match_resume_to_job(
-            {
-                'skills': resume_data['extracted_info']['skills'],
-                'resume_text': resume_data['resume_text'],
-                'optional_info': resume_data['extracted_info']['optional_info']
-            },
-            job_description
+        # 执行匹配（并发的相同请求只计算一次，结果写入缓存）
+        match_result, shared = single_flight.do(
+            cache_key, lambda: ResumeMatcher.match_resume_to_job(match_input, job_description)
         )
         
-        # 缓存结果
-        cache_manager.set(cache_key, match_result)
-        
         return jsonify({
             'success': True,
             'message': '匹配成功',
             'data': match_result,
-            'from_cache': False
+            'from_cache': False,
+            'shared': shared
         }), 200
     
     except Exception as e:
@@ -274,13 +472,28 @@ def extract_info():
         
         resume_text = data['resume_text']
         
-        # 提取信息（使用混合提取器）
-        extracted_info = HybridExtractor.extract_all_info(resume_text)
+        # 检查缓存
+        cache_key = CacheManager.generate_key('extract', {'resume_text': resume_text})
+        cached_result = cache_manager.get(cache_key)
+        if cached_result:
+            return jsonify({
+                'success': True,
+                'message': '信息提取成功（来自缓存）',
+                'data': json.loads(cached_result) if isinstance(cached_result, str) else cached_result,
+                'from_cache': True
+            }), 200
+        
+        # 提取信息（使用混合提取器；并发的相同请求只计算一次，结果写入缓存）
+        extracted_info, shared = single_flight.do(
+            cache_key, lambda: HybridExtractor.extract_all_info(resume_text)
+        )
         
         return jsonify({
             'success': True,
             'message': '信息提取成功',
-            'data': extracted_info
+            'data': extracted_info,
+            'from_cache': False,
+            'shared': shared
         }), 200
     
     except Exception as e:
@@ -291,6 +504,80 @@ def extract_info():
         }), 500
 
 
+def parse_batch_texts():
+    """
+    解析批量提取请求体
+
+    支持三种格式：
+    - JSON 数组：["文本1", "文本2"] 或 [{"resume_text": "..."}, ...]
+    - JSON 对象：{"resume_texts": [...]}
+    - NDJSON（Content-Type 为 application/x-ndjson）：每行一个字符串或 {"resume_text": "..."}
+
+    Returns:
+        (文本列表, 错误信息)
+    """
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        items = []
+        body = request.get_data(as_text=True)
+        for line_number, line in enumerate(body.splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except json.JSONDecodeError:
+                return None, f'第 {line_number} 行不是合法的 JSON'
+    else:
+        data = request.get_json(silent=True)
+        items = data.get('resume_texts') if isinstance(data, dict) else data
+        if not isinstance(items, list):
+            return None, '请求体应为 JSON 数组、包含 resume_texts 的对象或 NDJSON'
+
+    texts = []
+    for index, item in enumerate(items):
+        text = item.get('resume_text') if isinstance(item, dict) else item
+        if not isinstance(text, str) or not text.strip():
+            return None, f'第 {index} 项缺少 resume_text'
+        texts.append(text)
+    return texts, None
+
+
+@app.route('/api/extract/batch', methods=['POST'])
+def extract_batch():
+    """
+    批量提取接口
+
+    相同内容的文本只提取一次，多份简历在线程池中并发处理。
+    结果以 NDJSON 流式返回，按完成顺序输出，每行带输入下标 index，最后一行为 summary 统计。
+    """
+    texts, error = parse_batch_texts()
+    if error:
+        return jsonify({
+            'success': False,
+            'message': error,
+            'error': 'Invalid batch'
+        }), 400
+
+    if not texts:
+        return jsonify({
+            'success': False,
+            'message': '批量请求为空',
+            'error': 'Empty batch'
+        }), 400
+
+    if len(texts) > BATCH_EXTRACT_MAX_ITEMS:
+        return jsonify({
+            'success': False,
+            'message': f'单次最多提交 {BATCH_EXTRACT_MAX_ITEMS} 份简历',
+            'error': 'Batch too large'
+        }), 413
+
+    def generate():
+        for record in BatchExtractor.iter_results(texts):
+            yield json.dumps(record, ensure_ascii=False) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
 @app.route('/api/resumes', methods=['GET'])
 def list_resumes():
     """
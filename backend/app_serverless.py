@@ -1,14 +1,18 @@
 import json
-import os
 from datetime import datetime
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 
 # 导入核心服务
+from config import PDF_SANDBOX_ENABLED
 from services.pdf_parser import PDFParser
+from services.pdf_sandbox import PDFSandbox
 from services.ai_hybrid_extractor import HybridExtractor
+from services.circuit_breaker import LLM_BREAKER
+from services.rate_limiter import LLM_RATE_LIMITER
 from services.resume_matcher import ResumeMatcher
 from services.cache import CacheManager
+from services.singleflight import SingleFlight
 
 # 初始化 Flask
 app = Flask(__name__)
@@ -25,6 +29,9 @@ CORS(app, resources={
 # 初始化缓存管理器（本地缓存，支持 Redis）
 cache_manager = CacheManager(use_redis=False, redis_config=None)
 
+# 相同请求并发到达时只计算一次，其余请求共享结果
+single_flight = SingleFlight(cache_manager)
+
 # 内存存储
 sessions = {}
 max_sessions = 100
@@ -107,26 +114,27 @@ def upload_resume():
         return jsonify({'success': False, 'message': 'Only PDF files are supported'}), 400
     
     try:
-        # 保存临时文件
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        temp_path = f'/tmp/{timestamp}_{file.filename}'
-        file.save(temp_path)
-        
-        # 验证和解析 PDF
-        is_valid, error = PDFParser.validate_pdf(temp_path)
-        if not is_valid:
-            return jsonify({'success': False, 'message': f'PDF validation failed: {error}'}), 400
+        # 流式读入内存并校验 %PDF 文件头和大小，无需写入 /tmp
+        read_result = PDFParser.read_stream(file.stream, content_length=file.content_length)
+        if not read_result['success']:
+            return jsonify({'success': False, 'message': f'PDF validation failed: {read_result["error"]}'}), 400
         
-        parse_result = PDFParser.extract_text(temp_path)
+        # 单次打开完成验证和解析（沙箱子进程中执行，超时或超限即终止）
+        parser = PDFSandbox if PDF_SANDBOX_ENABLED else PDFParser
+        parse_result = parser.parse(read_result['data']['buffer'])
         if not parse_result['success']:
-            return jsonify({'success': False, 'message': f'PDF parsing failed: {parse_result["error"]}'}), 500
+            return jsonify({
+                'success': False,
+                'message': f'PDF parsing failed: {parse_result["error"]}',
+                'error_type': parse_result.get('error_type', 'parse_error')
+            }), 400
         
         # 提取信息
         resume_text = parse_result['data']['raw_text']
         extracted_info = HybridExtractor.extract_all_info(resume_text)
         
-        # 生成 session ID
-        session_id = f"session_{timestamp}"
+        # 以内容哈希生成 session ID，避免同一秒内上传冲突
+        session_id = f"session_{read_result['data']['sha256'][:16]}"
         sessions[session_id] = {
             'filename': file.filename,
             'upload_time': datetime.now().isoformat(),
@@ -136,7 +144,7 @@ def upload_resume():
         
         # 清理旧 session
         if len(sessions) > max_sessions:
-            oldest = min(sessions.keys())
+            oldest = min(sessions, key=lambda k: sessions[k]['upload_time'])
             del sessions[oldest]
         
         return jsonify({
@@ -151,12 +159,6 @@ def upload_resume():
     
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
-    finally:
-        # 清理临时文件
-        try:
-            os.remove(temp_path)
-        except:
-            pass
 
 
 @app.route('/api/match', methods=['POST'])
@@ -196,20 +198,18 @@ def match_resume():
                 'from_cache': True
             }), 200
         
-        # 缓存未命中，执行匹配
-        match_result = ResumeMatcher.match_resume_to_job({
+        # 缓存未命中，执行匹配（并发的相同请求只计算一次，结果写入缓存）
+        match_result, shared = single_flight.do(cache_key, lambda: ResumeMatcher.match_resume_to_job({
             'skills': session['extracted_info']['skills'],
             'resume_text': session['resume_text'],
             'optional_info': session['extracted_info']['optional_info']
-        }, job_desc)
-        
-        # 缓存结果（同时支持本地和 Redis 缓存）
-        cache_manager.set(cache_key, match_result)
+        }, job_desc))
         
         return jsonify({
             'success': True,
             'data': match_result,
-            'from_cache': False
+            'from_cache': False,
+            'shared': shared
         }), 200
     
     except Exception as e:
@@ -243,16 +243,16 @@ def extract_info():
                 'from_cache': True
             }), 200
         
-        # 缓存未命中，执行提取
-        extracted = HybridExtractor.extract_all_info(data['resume_text'])
-        
-        # 缓存结果（同时支持本地和 Redis 缓存）
-        cache_manager.set(cache_key, extracted)
+        # 缓存未命中，执行提取（并发的相同请求只计算一次，结果写入缓存）
+        extracted, shared = single_flight.do(
+            cache_key, lambda: HybridExtractor.extract_all_info(data['resume_text'])
+        )
         
         return jsonify({
             'success': True,
             'data': extracted,
-            'from_cache': False
+            'from_cache': False,
+            'shared': shared
         }), 200
     
     except Exception as e:
@@ -261,11 +261,13 @@ def extract_info():
 
 @app.route('/health', methods=['GET'])
 def health():
-    """健康检查"""
+    """健康检查（附带 LLM 熔断和限流状态）"""
     return jsonify({
         'status': 'healthy',
         'service': 'Resume Analyzer API',
-        'timestamp': datetime.now().isoformat()
+        'timestamp': datetime.now().isoformat(),
+        'llm_breaker': LLM_BREAKER.get_state() if LLM_BREAKER is not None else None,
+        'llm_rate_limiter': LLM_RATE_LIMITER.get_metrics() if LLM_RATE_LIMITER is not None else None
     }), 200
 
 
@@ -0,0 +1,130 @@
+"""
+提取流程基准测试：在本地桩服务器上测量 HybridExtractor.extract_all_info 的端到端吞吐量和尾延迟，
+依次注入延迟抖动、500、429 和格式错误 JSON
+
+每个场景在独立子进程中运行，熔断器、限流器和连接池状态互不影响。
+
+用法（在 backend 目录下运行）：
+    python benchmarks/bench_extract_pipeline.py [--scenario all] [--resumes N] [--concurrency N]
+        [--latency-ms N] [--mode combined] [--no-rate-limit]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llm_stub_server import STUB_FIELDS, StubOptions, start_stub_server
+
+# 场景名 → 桩服务器故障注入参数（延迟均值由 --latency-ms 指定）
+SCENARIOS = {
+    'baseline': {},
+    'jitter': {'latency_dist': 'lognormal', 'latency_sigma': 1.0},
+    'errors': {'latency_dist': 'lognormal', 'latency_sigma': 1.0, 'error_rate': 0.1},
+    'throttled': {'latency_dist': 'lognormal', 'latency_sigma': 1.0, 'rate_limit_rate': 0.2},
+    'malformed': {'latency_dist': 'lognormal', 'latency_sigma': 1.0, 'malformed_rate': 0.1},
+}
+
+RESUME_TEMPLATE = ('候选人{index} 电话 138{index:08d} 邮箱 user{index}@example.com 求职意向 后端开发工程师 '
+                   '工作经历 某科技公司 后端开发 {years}年 负责订单系统 熟悉 Python Django MySQL Redis 本科 ')
+
+
+def percentile(ordered, percent):
+    return ordered[min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))]
+
+
+def print_header():
+    print(f'{"场景":<10} {"吞吐量":>10} {"p50":>8} {"p95":>8} {"p99":>8} {"max":>8}  '
+          f'{"LLM 结果":>8}  桩服务器统计 / 熔断状态 / 限流排队')
+
+
+def run_scenario(args):
+    options = StubOptions(latency_ms=args.latency_ms, seed=args.seed, **SCENARIOS[args.scenario])
+    server, url = start_stub_server(options)
+
+    # 在导入后端模块前指向桩服务器，关闭响应缓存以免命中
+    os.environ.update({
+        'LLM_API_URL': url,
+        'LLM_API_KEY': 'stub-key',
+        'LLM_CACHE_ENABLED': 'False',
+        'LLM_EXTRACTION_MODE': args.mode,
+        'LLM_RATE_LIMIT_ENABLED': 'False' if args.no_rate_limit else 'True'
+    })
+    from services.ai_hybrid_extractor import HybridExtractor
+    from services.circuit_breaker import LLM_BREAKER
+    from services.rate_limiter import LLM_RATE_LIMITER
+
+    texts = [RESUME_TEMPLATE.format(index=index, years=index % 10 + 1) * 3 for index in range(args.resumes)]
+    # 预热分词词典，避免首个请求的加载时间计入延迟
+    HybridExtractor.extract_regex_info(texts[0])
+
+    def timed(text):
+        start = time.perf_counter()
+        result = HybridExtractor.extract_all_info(text)
+        return (time.perf_counter() - start) * 1000, result
+
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.concurrency) as executor:
+            outcomes = list(executor.map(timed, texts))
+        elapsed = time.perf_counter() - start
+    finally:
+        server.shutdown()
+
+    latencies = sorted(latency for latency, _ in outcomes)
+    from_llm = sum(1 for _, result in outcomes if result['base_info'].get('name') == STUB_FIELDS['name'])
+    stats = options.stats
+    breaker = LLM_BREAKER.get_state()['state'] if LLM_BREAKER is not None else '-'
+    limiter_wait = LLM_RATE_LIMITER.get_metrics()['wait_ms']['p95'] if LLM_RATE_LIMITER is not None else None
+    limiter_wait = '-' if limiter_wait is None else f'{limiter_wait:.0f}ms'
+    print(f'{args.scenario:<10} {len(texts) / elapsed:>6.1f}份/秒 '
+          f'{latencies[len(latencies) // 2]:>6.0f}ms {percentile(latencies, 95):>6.0f}ms '
+          f'{percentile(latencies, 99):>6.0f}ms {latencies[-1]:>6.0f}ms  '
+          f'{from_llm:>4}/{len(texts):<4}  '
+          f'请求 {stats["requests"]} 500 {stats["errors"]} 429 {stats["rate_limited"]} '
+          f'截断 {stats["malformed"]} / {breaker}  限流等待 p95 {limiter_wait}', flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='extract_all_info 端到端吞吐量与尾延迟基准测试')
+    parser.add_argument('--scenario', choices=('all',) + tuple(SCENARIOS), default='all', help='故障注入场景')
+    parser.add_argument('--resumes', type=int, default=100, help='每个场景提取的简历数')
+    parser.add_argument('--concurrency', type=int, default=8, help='并发提取的线程数')
+    parser.add_argument('--latency-ms', type=float, default=300, help='桩服务器延迟（均值或中位数）')
+    parser.add_argument('--mode', choices=('combined', 'separate', 'chunked', 'batched'), default='combined',
+                        help='LLM_EXTRACTION_MODE')
+    parser.add_argument('--no-rate-limit', action='store_true', help='关闭出站限流，只测桩服务器和提取流程本身')
+    parser.add_argument('--seed', type=int, default=1, help='故障注入的随机种子')
+    parser.add_argument('--no-header', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if not args.no_header:
+        print(f'模式 {args.mode}，每个场景 {args.resumes} 份简历，并发 {args.concurrency}，'
+              f'桩服务器延迟 {args.latency_ms}ms')
+        print_header()
+
+    if args.scenario != 'all':
+        run_scenario(args)
+        return 0
+
+    for scenario in SCENARIOS:
+        # 子进程中只输出结果行，后端日志丢弃
+        command = [sys.executable, os.path.abspath(__file__), '--scenario', scenario, '--no-header',
+                   '--resumes', str(args.resumes), '--concurrency', str(args.concurrency),
+                   '--latency-ms', str(args.latency_ms), '--mode', args.mode, '--seed', str(args.seed)]
+        if args.no_rate_limit:
+            command.append('--no-rate-limit')
+        completed = subprocess.run(command, capture_output=True, text=True)
+        rows = [line for line in completed.stdout.splitlines() if line.startswith(scenario)]
+        if completed.returncode != 0 or not rows:
+            print(f'{scenario:<10} 运行失败: {completed.stderr.strip().splitlines()[-1:]}')
+            continue
+        print(rows[-1])
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
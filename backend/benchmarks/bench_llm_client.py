@@ -0,0 +1,85 @@
+"""
+LLM 客户端基准测试：在本地桩服务器上比较每次 requests.post 新建连接与共享连接池会话的延迟和握手次数，
+并验证 429/500 的退避重试
+
+用法（在 backend 目录下运行）：
+    python benchmarks/bench_llm_client.py [--calls N] [--concurrency N] [--latency-ms N]
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.llm_client import LLMClient
+from llm_stub_server import StubOptions, start_stub_server
+
+PROMPT = '请从以下简历文本中提取信息：' + '熟悉 Python Django MySQL Redis ' * 50
+
+
+def unpooled_call(url):
+    """
+    原实现：每次调用 requests.post，不复用连接
+    """
+    response = requests.post(url, json={
+        'model': 'stub', 'input': {'messages': [{'role': 'user', 'content': PROMPT}]}
+    }, timeout=30)
+    return response.json()['output']['choices'][0]['message']['content']
+
+
+def run(label, func, calls, concurrency, server):
+    server.options.stats.update({key: 0 for key in server.options.stats})
+    latencies = []
+
+    def timed(_):
+        start = time.perf_counter()
+        result = func()
+        latencies.append((time.perf_counter() - start) * 1000)
+        return result
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        results = list(executor.map(timed, range(calls)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    stats = server.options.stats
+    print(f'{label:<26} {elapsed:>6.2f}s  p50 {latencies[len(latencies) // 2]:>6.1f}ms  '
+          f'p95 {latencies[int(len(latencies) * 0.95) - 1]:>6.1f}ms  '
+          f'连接 {stats["connections"]:>4}  请求 {stats["requests"]:>4}  '
+          f'成功 {sum(1 for r in results if r)}/{calls}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='LLM 客户端连接复用与重试基准测试')
+    parser.add_argument('--calls', type=int, default=200, help='调用次数')
+    parser.add_argument('--concurrency', type=int, default=8, help='并发数')
+    parser.add_argument('--latency-ms', type=float, default=20, help='桩服务器模拟延迟')
+    args = parser.parse_args()
+
+    server, url = start_stub_server(StubOptions(latency_ms=args.latency_ms, seed=1))
+    try:
+        run('requests.post（无连接池）', lambda: unpooled_call(url), args.calls, args.concurrency, server)
+
+        client = LLMClient(url, 'stub-key', 'stub', pool_size=args.concurrency)
+        run('LLMClient（共享连接池）', lambda: client.generate(PROMPT), args.calls, args.concurrency, server)
+        print(f'客户端指标: {client.get_metrics()}')
+
+        # 注入 20% 的 429 和 10% 的 500，验证退避重试
+        server.options.rate_limit_rate = 0.2
+        server.options.error_rate = 0.1
+        client = LLMClient(url, 'stub-key', 'stub', pool_size=args.concurrency,
+                           max_retries=4, backoff_base=0.01)
+        run('LLMClient（429/500 注入）', lambda: client.generate(PROMPT), args.calls, args.concurrency, server)
+        print(f'客户端指标: {client.get_metrics()}')
+    finally:
+        server.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+PDF 解析引擎基准测试：比较 accurate（pdfplumber）与 fast（文本层直读）的吞吐量和提取一致性
+
+用法（在 backend 目录下运行）：
+    python benchmarks/bench_pdf_engines.py <PDF 目录或通配符> [--repeat N]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from difflib import SequenceMatcher
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.pdf_parser import PDFParser
+
+
+def collect_pdfs(target):
+    """
+    收集待测试的 PDF 文件列表
+    """
+    if os.path.isdir(target):
+        target = os.path.join(target, '**', '*.pdf')
+    return sorted(glob.glob(target, recursive=True))
+
+
+def run_engine(pdf_path, engine, repeat):
+    """
+    用指定引擎串行解析 repeat 次，返回 (最后一次结果, 平均耗时)
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = PDFParser.parse(pdf_path, max_workers=1, engine=engine)
+    return result, (time.perf_counter() - start) / repeat
+
+
+def fidelity(reference, candidate):
+    """
+    以词序列相似度衡量 fast 引擎相对 accurate 引擎的提取一致性
+    """
+    return SequenceMatcher(None, reference.split(), candidate.split(), autojunk=False).ratio()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='比较 PDF 解析引擎的吞吐量和提取一致性')
+    parser.add_argument('target', help='PDF 目录或通配符')
+    parser.add_argument('--repeat', type=int, default=1, help='每个文件重复解析的次数')
+    args = parser.parse_args()
+    
+    pdf_files = collect_pdfs(args.target)
+    if not pdf_files:
+        print(f'未找到 PDF 文件: {args.target}')
+        return 1
+    
+    totals = {'accurate': 0.0, 'fast': 0.0}
+    total_pages = 0
+    fallback_pages = 0
+    scores = []
+    
+    print(f"{'文件':<40} {'页数':>4} {'accurate(s)':>12} {'fast(s)':>10} {'回退页':>6} {'一致性':>8}")
+    for pdf_path in pdf_files:
+        accurate, accurate_time = run_engine(pdf_path, 'accurate', args.repeat)
+        fast, fast_time = run_engine(pdf_path, 'fast', args.repeat)
+        if not accurate['success'] or not fast['success']:
+            print(f"{os.path.basename(pdf_path):<40} 解析失败: {accurate['error'] or fast['error']}")
+            continue
+        
+        pages = accurate['data']['total_pages']
+        fallbacks = sum(1 for page in fast['data']['pages'] if page['engine'] != 'fast')
+        score = fidelity(accurate['data']['raw_text'], fast['data']['raw_text'])
+        
+        totals['accurate'] += accurate_time
+        totals['fast'] += fast_time
+        total_pages += pages
+        fallback_pages += fallbacks
+        scores.append(score)
+        
+        print(f"{os.path.basename(pdf_path)[:40]:<40} {pages:>4} {accurate_time:>12.3f} "
+              f"{fast_time:>10.3f} {fallbacks:>6} {score:>8.3f}")
+    
+    if not scores:
+        return 1
+    
+    print()
+    for engine, elapsed in totals.items():
+        print(f'{engine:<8}: {elapsed:.3f}s, {total_pages / elapsed if elapsed else 0:.1f} 页/秒')
+    print(f"加速比: {totals['accurate'] / totals['fast'] if totals['fast'] else 0:.2f}x")
+    print(f'回退页数: {fallback_pages}/{total_pages}')
+    print(f'平均一致性: {sum(scores) / len(scores):.3f}，最低: {min(scores):.3f}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+技能词表基准测试：验证词表从几十个词条增长到上万个时，索引构建耗时可接受且单份简历的匹配耗时基本不变
+
+用法（在 backend 目录下运行）：
+    python benchmarks/bench_skill_taxonomy.py [--sizes 55,1000,10000] [--repeat N]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import SKILL_TAXONOMY_PATH
+from services.skill_taxonomy import SkillTaxonomy, _TaxonomyIndex
+
+SAMPLE_RESUME = (
+    "求职意向：Python 后端开发，5年工作经验。\n"
+    "熟悉 Django、Flask、postgres、Redis，使用 k8s 和 Docker 部署 SpringBoot 服务，"
+    "了解 Golang 与 Node.js，邮箱 zhangsan@example.com，曾在 Google 实习。\n"
+) * 40
+
+
+def synthetic_entries(base_entries, size):
+    """
+    在真实词表基础上补充合成词条，直到达到指定规模
+    """
+    entries = list(base_entries)
+    index = 0
+    while len(entries) < size:
+        entries.append({
+            'name': f'Skill{index:05d}',
+            'category': 'synthetic',
+            'aliases': [f'sk-{index:05d}', f'技能{index:05d}']
+        })
+        index += 1
+    return entries[:size]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='技能词表规模基准测试')
+    parser.add_argument('--sizes', default='55,1000,10000', help='词条数量，逗号分隔')
+    parser.add_argument('--repeat', type=int, default=200, help='每种规模的匹配次数')
+    args = parser.parse_args()
+
+    base_entries = SkillTaxonomy.load_entries(SKILL_TAXONOMY_PATH)
+    expected = None
+
+    print(f'简历长度 {len(SAMPLE_RESUME)} 字符')
+    print(f'{"词条数":>8} {"匹配词":>8} {"状态数":>8} {"构建耗时":>10} {"单份匹配":>10}')
+    for size in (int(s) for s in args.sizes.split(',')):
+        entries = synthetic_entries(base_entries, max(size, len(base_entries)))
+
+        start = time.perf_counter()
+        index = _TaxonomyIndex(entries)
+        build = time.perf_counter() - start
+
+        skills = index.skills.find_all(SAMPLE_RESUME)
+        # 合成词条不会出现在样例简历中，结果应与真实词表一致
+        if expected is None:
+            expected = skills
+        assert skills == expected, (skills, expected)
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            index.skills.find_all(SAMPLE_RESUME)
+        per_doc = (time.perf_counter() - start) / args.repeat
+
+        print(f'{len(entries):>8} {index.term_count:>8} {index.skills.state_count:>8} '
+              f'{build * 1000:>8.1f}ms {per_doc * 1000:>8.3f}ms')
+
+    print()
+    print(f'匹配结果: {expected}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
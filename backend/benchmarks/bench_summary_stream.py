@@ -0,0 +1,112 @@
+"""
+流式摘要基准测试：在本地桩服务器上比较非流式调用与 SSE 增量输出的首字节时间（TTFB）和总耗时，
+并通过 /api/resume/<id>/summary/stream 端点验证事件转发
+
+用法（在 backend 目录下运行）：
+    python benchmarks/bench_summary_stream.py [--runs N] [--first-token-ms N] [--token-interval-ms N] [--chunks N]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llm_stub_server import StubOptions, start_stub_server
+
+RESUME_TEXT = '张三 电话 13800138000 工作经历 某公司 后端开发 5年 熟悉 Python Django MySQL Redis ' * 10
+
+
+def median(values):
+    ordered = sorted(values)
+    return ordered[len(ordered) // 2]
+
+
+def report(label, ttfb, total):
+    print(f'{label:<22} TTFB 中位数 {median(ttfb):>7.1f}ms  总耗时中位数 {median(total):>7.1f}ms')
+
+
+def bench_client(client, prompt, runs):
+    ttfb, total = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        client.generate(prompt, max_tokens=300)
+        elapsed = (time.perf_counter() - start) * 1000
+        ttfb.append(elapsed)
+        total.append(elapsed)
+    report('generate（非流式）', ttfb, total)
+
+    ttfb, total = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        first = None
+        for _ in client.stream(prompt, max_tokens=300):
+            if first is None:
+                first = (time.perf_counter() - start) * 1000
+        ttfb.append(first)
+        total.append((time.perf_counter() - start) * 1000)
+    report('stream（增量输出）', ttfb, total)
+
+
+def bench_endpoint(runs):
+    import app
+
+    resume_id = 'resume_bench_stream'
+    app.uploaded_resumes[resume_id] = {
+        'resume_id': resume_id,
+        'filename': 'bench.pdf',
+        'upload_time': '',
+        'resume_text': RESUME_TEXT,
+        'extracted_info': {'summary': ''}
+    }
+    test_client = app.app.test_client()
+
+    ttfb, total = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        response = test_client.get(f'/api/resume/{resume_id}/summary/stream', buffered=False)
+        first = None
+        events = b''
+        for chunk in response.response:
+            if first is None:
+                first = (time.perf_counter() - start) * 1000
+            events += chunk
+        response.close()
+        ttfb.append(first)
+        total.append((time.perf_counter() - start) * 1000)
+    report('SSE 端点', ttfb, total)
+    source = 'llm' if b'"source": "llm"' in events else 'fallback'
+    print(f'最后一次事件流共 {events.count(b"event: token")} 个 token 事件，来源 {source}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='流式摘要首字节时间基准测试')
+    parser.add_argument('--runs', type=int, default=10, help='每种方式的调用次数')
+    parser.add_argument('--first-token-ms', type=float, default=300, help='桩服务器首个 token 前的延迟')
+    parser.add_argument('--token-interval-ms', type=float, default=40, help='桩服务器相邻片段的间隔')
+    parser.add_argument('--chunks', type=int, default=25, help='生成内容的片段数')
+    args = parser.parse_args()
+
+    options = StubOptions(latency_ms=args.first_token_ms, stream_chunks=args.chunks,
+                          token_interval_ms=args.token_interval_ms, seed=1)
+    server, url = start_stub_server(options)
+
+    # 在导入后端模块前指向桩服务器，并关闭响应缓存以免命中
+    os.environ['LLM_API_URL'] = url
+    os.environ['LLM_API_KEY'] = 'stub-key'
+    os.environ['LLM_CACHE_ENABLED'] = 'False'
+    from services.llm_client import LLMClient
+    from services.ai_llm_extractor import LLMExtractor
+
+    try:
+        client = LLMClient(url, 'stub-key', 'stub')
+        bench_client(client, LLMExtractor._summary_prompt(RESUME_TEXT), args.runs)
+        bench_endpoint(args.runs)
+        print(f'桩服务器统计: {server.options.stats}')
+    finally:
+        server.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,255 @@
+"""
+LLM 桩服务器：模拟 DashScope 文本生成接口（output.choices[].message.content），用于在本地测试
+客户端的连接复用、重试和退避，X-DashScope-SSE 增量输出（分块的 text/event-stream 响应），
+以及提取流程在延迟抖动、500、429 和格式错误 JSON 下的表现
+
+提示词要求返回 JSON 时按提示词类型返回提取结果（单份简历对象、技能数组或批量数组），否则返回普通文本。
+
+用法（在 backend 目录下运行）：
+    python benchmarks/llm_stub_server.py [--port 8765] [--latency-ms 50] [--latency-dist lognormal]
+        [--error-rate 0.05] [--rate-limit-rate 0.1] [--malformed-rate 0.05]
+
+然后设置 LLM_API_URL=http://127.0.0.1:8765/ 启动后端。也可以在其他脚本中通过 start_stub_server() 启动。
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LATENCY_DISTRIBUTIONS = ('fixed', 'uniform', 'exponential', 'lognormal')
+
+# 返回给提取类提示词的字段值，调用方可据此判断结果是否来自 LLM
+STUB_FIELDS = {
+    'name': '桩候选人',
+    'phone': '13800000000',
+    'email': 'stub@example.com',
+    'address': '北京',
+    'job_intention': '后端开发工程师',
+    'work_experience_years': 5,
+    'education_background': '本科',
+    'skills': ['Python', 'Flask', 'MySQL', 'Redis'],
+    'summary': '5年后端开发经验，熟悉 Python 和数据库。'
+}
+
+
+class StubOptions:
+    """故障注入参数"""
+
+    def __init__(self, latency_ms=50, error_rate=0.0, rate_limit_rate=0.0, retry_after=0.1, seed=None,
+                 stream_chunks=8, token_interval_ms=0, malformed_rate=0.0, latency_dist='fixed',
+                 latency_sigma=0.5, stream_charset='UTF-8'):
+        """
+        Args:
+            latency_ms: 首个 token 前的延迟（毫秒）；非 fixed 分布时为均值（lognormal 为中位数）
+            error_rate / rate_limit_rate: 返回 500 / 429 的比例
+            malformed_rate: 返回 200 但内容为截断 JSON 的比例
+            latency_dist: 延迟分布，fixed / uniform（0 到 2 倍均值）/ exponential / lognormal
+            latency_sigma: lognormal 分布的 sigma，越大长尾越重
+            retry_after: 429 响应的 Retry-After（秒）
+            seed: 随机种子
+            stream_chunks: 生成内容的片段数（流式响应逐段发送）
+            token_interval_ms: 相邻片段之间的生成间隔（毫秒）；非流式响应等待全部片段生成后一次返回
+            stream_charset: 流式响应 Content-Type 中的 charset，None 表示不声明
+        """
+        if latency_dist not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f'未知的延迟分布: {latency_dist}')
+        self.latency_ms = latency_ms
+        self.latency_dist = latency_dist
+        self.latency_sigma = latency_sigma
+        self.malformed_rate = malformed_rate
+        self.stream_chunks = stream_chunks
+        self.token_interval_ms = token_interval_ms
+        self.stream_charset = stream_charset
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'connections': 0, 'errors': 0, 'rate_limited': 0, 'malformed': 0,
+                      'streamed': 0}
+
+    def count(self, key):
+        with self.lock:
+            self.stats[key] += 1
+
+    def roll(self):
+        with self.lock:
+            return self.random.random()
+
+    def sample_latency(self):
+        """按配置的分布抽取一次延迟（秒）"""
+        with self.lock:
+            if self.latency_dist == 'uniform':
+                latency_ms = self.random.uniform(0, 2 * self.latency_ms)
+            elif self.latency_dist == 'exponential':
+                latency_ms = self.random.expovariate(1 / self.latency_ms) if self.latency_ms > 0 else 0
+            elif self.latency_dist == 'lognormal':
+                latency_ms = self.latency_ms * self.random.lognormvariate(0, self.latency_sigma)
+            else:
+                latency_ms = self.latency_ms
+        return latency_ms / 1000
+
+
+def make_content(prompt):
+    """
+    按提示词类型生成回复内容：批量提取返回带编号的数组，技能提取返回数组，其他 JSON 提示词返回字段对象
+
+    Returns:
+        JSON 字符串；提示词不要求 JSON 时返回 None
+    """
+    batch_ids = re.findall(r'=== 简历 id=(\d+) ===', prompt)
+    if batch_ids:
+        return json.dumps([{'id': int(item_id), **STUB_FIELDS} for item_id in batch_ids], ensure_ascii=False)
+    if '仅返回JSON数组' in prompt:
+        return json.dumps(STUB_FIELDS['skills'], ensure_ascii=False)
+    if '仅返回JSON' in prompt:
+        return json.dumps(STUB_FIELDS, ensure_ascii=False)
+    return None
+
+
+def _make_handler(options):
+    class StubHandler(BaseHTTPRequestHandler):
+        # HTTP/1.1 才会保持连接，客户端可以复用
+        protocol_version = 'HTTP/1.1'
+        # 响应头和响应体分两次写出，关闭 Nagle 避免与客户端延迟 ACK 叠加出 40ms 停顿
+        disable_nagle_algorithm = True
+
+        def setup(self):
+            super().setup()
+            options.count('connections')
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status, body, headers=None):
+            data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+            options.count('requests')
+
+            roll = options.roll()
+            if roll < options.rate_limit_rate:
+                options.count('rate_limited')
+                self._send_json(429, {'code': 'Throttling', 'message': 'Requests rate limit exceeded'},
+                                {'Retry-After': str(options.retry_after)})
+                return
+            if roll < options.rate_limit_rate + options.error_rate:
+                options.count('errors')
+                self._send_json(500, {'code': 'InternalError', 'message': 'stub error'})
+                return
+
+            prompt = request.get('input', {}).get('messages', [{}])[-1].get('content', '')
+            pieces = [f'stub response ({len(prompt)} chars)'] + [f' 片段{i}' for i in range(1, options.stream_chunks)]
+            content = make_content(prompt)
+            if content is not None and roll < options.rate_limit_rate + options.error_rate + options.malformed_rate:
+                # 模拟输出被截断：状态码正常，但 JSON 不完整
+                options.count('malformed')
+                content = content[:len(content) // 2]
+            time.sleep(options.sample_latency())
+
+            if self.headers.get('X-DashScope-SSE') == 'enable':
+                options.count('streamed')
+                self._send_stream(pieces, len(prompt))
+                return
+
+            time.sleep(options.token_interval_ms * (len(pieces) - 1) / 1000)
+            self._send_json(200, {
+                'output': {
+                    'choices': [{
+                        'finish_reason': 'stop',
+                        'message': {'role': 'assistant', 'content': content or ''.join(pieces)}
+                    }]
+                },
+                'usage': {'input_tokens': len(prompt), 'output_tokens': len(pieces)}
+            })
+
+        def _write_chunk(self, data):
+            # HTTP/1.1 分块传输编码，连接可继续复用
+            self.wfile.write(f'{len(data):x}\r\n'.encode('ascii') + data + b'\r\n')
+            self.wfile.flush()
+
+        def _send_stream(self, pieces, input_tokens):
+            self.send_response(200)
+            content_type = 'text/event-stream'
+            if options.stream_charset:
+                content_type += f';charset={options.stream_charset}'
+            self.send_header('Content-Type', content_type)
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+
+            for index, piece in enumerate(pieces, 1):
+                if index > 1:
+                    time.sleep(options.token_interval_ms / 1000)
+                event = {
+                    'output': {
+                        'choices': [{
+                            'finish_reason': 'stop' if index == len(pieces) else 'null',
+                            'message': {'role': 'assistant', 'content': piece}
+                        }]
+                    },
+                    'usage': {'input_tokens': input_tokens, 'output_tokens': index}
+                }
+                data = json.dumps(event, ensure_ascii=False)
+                self._write_chunk(f'id:{index}\nevent:result\n:HTTP_STATUS/200\ndata:{data}\n\n'.encode('utf-8'))
+            self._write_chunk(b'')
+
+    return StubHandler
+
+
+def start_stub_server(options=None, host='127.0.0.1', port=0):
+    """
+    在后台线程中启动桩服务器
+
+    Returns:
+        (server, url)，调用 server.shutdown() 停止
+    """
+    options = options or StubOptions()
+    server = ThreadingHTTPServer((host, port), _make_handler(options))
+    server.daemon_threads = True
+    server.options = options
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://{host}:{server.server_address[1]}/'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='DashScope 文本生成接口桩服务器')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=50, help='每次请求的模拟延迟（非 fixed 分布时为均值）')
+    parser.add_argument('--latency-dist', choices=LATENCY_DISTRIBUTIONS, default='fixed', help='延迟分布')
+    parser.add_argument('--latency-sigma', type=float, default=0.5, help='lognormal 分布的 sigma')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='返回 500 的比例')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='返回 429 的比例')
+    parser.add_argument('--malformed-rate', type=float, default=0.0, help='返回截断 JSON 的比例')
+    parser.add_argument('--retry-after', type=float, default=0.1, help='429 响应的 Retry-After（秒）')
+    parser.add_argument('--stream-chunks', type=int, default=8, help='生成内容的片段数')
+    parser.add_argument('--token-interval-ms', type=float, default=0, help='相邻片段之间的生成间隔')
+    args = parser.parse_args()
+
+    options = StubOptions(args.latency_ms, args.error_rate, args.rate_limit_rate, args.retry_after,
+                          stream_chunks=args.stream_chunks, token_interval_ms=args.token_interval_ms,
+                          malformed_rate=args.malformed_rate, latency_dist=args.latency_dist,
+                          latency_sigma=args.latency_sigma)
+    server, url = start_stub_server(options, port=args.port)
+    print(f'桩服务器已启动: {url}')
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(options.stats)
+
+
+if __name__ == '__main__':
+    main()
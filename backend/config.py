@@ -22,9 +22,98 @@ REDIS_HOST = os.getenv('REDIS_HOST', 'localhost')
 REDIS_PORT = int(os.getenv('REDIS_PORT', 6379))
 REDIS_DB = int(os.getenv('REDIS_DB', 0))
 
+# 单飞配置：相同请求并发到达时只计算一次（启用 Redis 时跨进程生效）
+SINGLEFLIGHT_LOCK_TTL = float(os.getenv('SINGLEFLIGHT_LOCK_TTL', 60))  # Redis 锁过期时间（秒），应大于单次提取的最长耗时
+SINGLEFLIGHT_POLL_INTERVAL = float(os.getenv('SINGLEFLIGHT_POLL_INTERVAL', 0.1))  # 等待其他进程时轮询缓存的间隔（秒）
+SINGLEFLIGHT_WAIT_TIMEOUT = float(os.getenv('SINGLEFLIGHT_WAIT_TIMEOUT', 60))  # 等待其他进程的最长时间（秒）
+
 # 上传配置
 UPLOAD_FOLDER = os.getenv('UPLOAD_FOLDER', 'uploads')
 MAX_FILE_SIZE = int(os.getenv('MAX_FILE_SIZE', 10 * 1024 * 1024))  # 10MB
 
-# 创建上传文件夹
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+# 渐进式上传：先返回正则提取结果，LLM 提取在后台完成后更新记录（可用表单参数 progressive 按请求覆盖）
+PROGRESSIVE_UPLOAD = os.getenv('PROGRESSIVE_UPLOAD', 'False').lower() == 'true'
+ENRICHMENT_MAX_WORKERS = int(os.getenv('ENRICHMENT_MAX_WORKERS', 4))  # 后台补全的线程数
+
+# PDF 解析配置
+PDF_ENGINE = os.getenv('PDF_ENGINE', 'accurate')  # accurate（pdfplumber）或 fast（文本层直读）
+PDF_PARALLEL_WORKERS = int(os.getenv('PDF_PARALLEL_WORKERS', 0))  # 0 表示使用 CPU 核数，1 表示串行
+PDF_PARALLEL_MIN_PAGES = int(os.getenv('PDF_PARALLEL_MIN_PAGES', 8))  # 少于该页数时串行解析
+
+# PDF 沙箱解析配置（子进程中解析，超限即终止）
+# 沙箱内逐页串行解析，不使用 PDF_PARALLEL_WORKERS；需要多进程并行解析时关闭沙箱（失去超时和资源限制）
+PDF_SANDBOX_ENABLED = os.getenv('PDF_SANDBOX_ENABLED', 'True').lower() == 'true'
+PDF_PARSE_TIMEOUT = float(os.getenv('PDF_PARSE_TIMEOUT', 60))  # 整个文档的墙钟时间上限（秒）
+PDF_PAGE_TIMEOUT = float(os.getenv('PDF_PAGE_TIMEOUT', 15))  # 单页解析时间上限（秒）
+PDF_MAX_MEMORY_MB = int(os.getenv('PDF_MAX_MEMORY_MB', 1024))  # 子进程在 fork 时继承的地址空间之外可再使用的内存
+PDF_MAX_CPU_SECONDS = int(os.getenv('PDF_MAX_CPU_SECONDS', 60))  # 子进程 CPU 时间上限
+
+# LLM 提取配置
+# combined：一次调用提取全部字段，缺失或校验失败的字段单独回退到正则
+# separate：基本信息、可选信息、技能、摘要分四次调用
+# chunked：按分段切分为不超过 token 预算的块，各块并发提取后合并（长简历不再截断）
+# batched：并发到达的多份简历合并为一次调用（微批处理），适合批量导入和高并发上传
+LLM_EXTRACTION_MODE = os.getenv('LLM_EXTRACTION_MODE', 'combined')
+LLM_CHUNK_TOKENS = int(os.getenv('LLM_CHUNK_TOKENS', 1500))  # chunked 模式下每块的 token 预算
+LLM_CHUNK_MAX_COUNT = int(os.getenv('LLM_CHUNK_MAX_COUNT', 6))  # 单份简历最多的块数，超出部分丢弃
+LLM_BATCH_SIZE = int(os.getenv('LLM_BATCH_SIZE', 4))  # 一次调用最多包含的简历数
+LLM_BATCH_WAIT_MS = float(os.getenv('LLM_BATCH_WAIT_MS', 20))  # 微批处理收集请求的最长等待（毫秒）
+LLM_REQUEST_DEADLINE = float(os.getenv('LLM_REQUEST_DEADLINE', 35))  # 单份简历等待 LLM 的总时间预算（秒），超时字段回退到正则
+LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', 8))  # 共享 LLM 调用线程池大小
+
+# LLM HTTP 客户端配置
+LLM_API_URL = os.getenv(
+    'LLM_API_URL',
+    'https://dashscope.aliyuncs.com/api/v1/services/aigc/text-generation/generation'
+)  # 本地测试可指向桩服务器 benchmarks/llm_stub_server.py
+# 未配置时不调用 LLM，只使用正则提取；兼容部署文档中的 ALIYUN_QWEN_API_KEY
+LLM_API_KEY = os.getenv('LLM_API_KEY') or os.getenv('ALIYUN_QWEN_API_KEY', '')
+LLM_MODEL = os.getenv('LLM_MODEL', 'qwen-plus')
+LLM_POOL_SIZE = int(os.getenv('LLM_POOL_SIZE', 10))  # 连接池大小（keep-alive 连接数上限）
+LLM_CONNECT_TIMEOUT = float(os.getenv('LLM_CONNECT_TIMEOUT', 5))  # 建立连接超时（秒）
+LLM_READ_TIMEOUT = float(os.getenv('LLM_READ_TIMEOUT', 30))  # 读取响应超时（秒）
+LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', 2))  # 429、5xx 和网络错误的最大重试次数
+LLM_BACKOFF_BASE = float(os.getenv('LLM_BACKOFF_BASE', 0.5))  # 指数退避初始值（秒）
+LLM_BACKOFF_MAX = float(os.getenv('LLM_BACKOFF_MAX', 8))  # 单次退避及 Retry-After 的上限（秒）
+
+# LLM 响应缓存配置（SQLite，重启后仍可命中；Serverless 环境请指向持久化挂载目录）
+LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'True').lower() == 'true'
+LLM_CACHE_PATH = os.getenv('LLM_CACHE_PATH', os.path.join('cache', 'llm_cache.sqlite3'))
+LLM_CACHE_TTL_HOURS = float(os.getenv('LLM_CACHE_TTL_HOURS', 24 * 7))  # 条目有效期（小时）
+LLM_CACHE_MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', 10000))  # 最大条目数，超出按最近访问时间淘汰
+
+# LLM 熔断配置（滑动窗口内错误率或 p95 延迟超限时熔断，熔断期间直接使用正则提取）
+LLM_BREAKER_ENABLED = os.getenv('LLM_BREAKER_ENABLED', 'True').lower() == 'true'
+LLM_BREAKER_WINDOW_SECONDS = float(os.getenv('LLM_BREAKER_WINDOW_SECONDS', 60))  # 滑动窗口长度（秒）
+LLM_BREAKER_MIN_CALLS = int(os.getenv('LLM_BREAKER_MIN_CALLS', 10))  # 窗口内至少多少次调用才评估
+LLM_BREAKER_ERROR_RATE = float(os.getenv('LLM_BREAKER_ERROR_RATE', 0.5))  # 错误率阈值
+LLM_BREAKER_P95_MS = float(os.getenv('LLM_BREAKER_P95_MS', 20000))  # p95 延迟阈值（毫秒），0 表示不按延迟熔断
+LLM_BREAKER_OPEN_SECONDS = float(os.getenv('LLM_BREAKER_OPEN_SECONDS', 30))  # 熔断后多久开始半开探测（秒）
+LLM_BREAKER_HALF_OPEN_PROBES = int(os.getenv('LLM_BREAKER_HALF_OPEN_PROBES', 2))  # 半开状态放行的探测次数
+
+# LLM 出站限流配置（请求数和 token 数令牌桶 + 并发上限，交互请求优先于批量任务）
+LLM_RATE_LIMIT_ENABLED = os.getenv('LLM_RATE_LIMIT_ENABLED', 'True').lower() == 'true'
+LLM_RATE_LIMIT_RPM = float(os.getenv('LLM_RATE_LIMIT_RPM', 600))  # 每分钟请求数上限，0 表示不限
+LLM_RATE_LIMIT_TPM = float(os.getenv('LLM_RATE_LIMIT_TPM', 500000))  # 每分钟 token 数上限（提示词估算值 + 最大生成长度），0 表示不限
+LLM_RATE_LIMIT_BURST_SECONDS = float(os.getenv('LLM_RATE_LIMIT_BURST_SECONDS', 5))  # 令牌桶容量相当于多少秒的配额
+LLM_RATE_LIMIT_CONCURRENCY = int(os.getenv('LLM_RATE_LIMIT_CONCURRENCY', 8))  # 每个进程同时进行的 LLM 调用数上限
+LLM_RATE_LIMIT_MAX_WAIT = float(os.getenv('LLM_RATE_LIMIT_MAX_WAIT', 20))  # 排队的最长等待时间（秒），超时后回退到正则提取
+LLM_RATE_LIMIT_REDIS = os.getenv('LLM_RATE_LIMIT_REDIS', 'True').lower() == 'true'  # REDIS_ENABLED 时令牌桶放在 Redis 中，多个进程共享配额
+LLM_RATE_LIMIT_REDIS_TIMEOUT = float(os.getenv('LLM_RATE_LIMIT_REDIS_TIMEOUT', 0.5))  # Redis 令牌桶的连接和读写超时（秒），出错后改用进程内令牌桶
+
+# 批量提取配置（/api/extract/batch）
+BATCH_EXTRACT_MAX_ITEMS = int(os.getenv('BATCH_EXTRACT_MAX_ITEMS', 100))  # 单次请求最多的简历数
+BATCH_EXTRACT_MAX_WORKERS = int(os.getenv('BATCH_EXTRACT_MAX_WORKERS', 4))  # 并发提取的线程数
+
+# 技能词表配置（JSON 文件，修改后无需重启即可生效）
+SKILL_TAXONOMY_PATH = os.getenv(
+    'SKILL_TAXONOMY_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'skill_taxonomy.json')
+)
+SKILL_TAXONOMY_RELOAD_SECONDS = float(os.getenv('SKILL_TAXONOMY_RELOAD_SECONDS', 30))  # 检查文件变更的间隔，0 表示不自动重载
+
+# 创建上传文件夹（只读文件系统如 Serverless 环境下忽略）
+try:
+    os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+except OSError:
+    pass
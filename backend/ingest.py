@@ -0,0 +1,197 @@
+"""
+离线批量导入工具 - 将目录中的 PDF 简历批量解析为 JSONL
+
+用法：
+    python ingest.py <PDF 目录或通配符> -o resumes.jsonl [--workers N] [--regex-only] [--llm-batch N]
+
+已完成文件的内容哈希记录在检查点文件中，重复运行时自动跳过，可随时中断后续跑。
+指定 --llm-batch 时子进程只解析 PDF，主进程每凑齐 N 份简历调用一次 LLM 批量提取。
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+from services.pdf_parser import PDFParser
+from services.ai_extractor import AIExtractor
+from services.ai_hybrid_extractor import HybridExtractor
+from services.rate_limiter import PRIORITY_BATCH, llm_priority
+
+# 子进程共享的运行参数，由 _init_worker 设置
+_worker_options = {}
+
+
+def collect_pdfs(target):
+    """
+    收集待导入的 PDF 文件列表（目录递归查找，或按通配符匹配）
+    """
+    if os.path.isdir(target):
+        target = os.path.join(target, '**', '*.pdf')
+    return sorted(
+        path for path in glob.glob(target, recursive=True)
+        if path.lower().endswith('.pdf')
+    )
+
+
+def load_checkpoint(checkpoint_path):
+    """
+    读取检查点文件中已完成的文件哈希
+    """
+    if not os.path.exists(checkpoint_path):
+        return set()
+    with open(checkpoint_path, 'r', encoding='utf-8') as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def _init_worker(completed_hashes, regex_only, engine, include_text, defer_extraction=False):
+    _worker_options.update({
+        'completed_hashes': completed_hashes,
+        'regex_only': regex_only,
+        'engine': engine,
+        'include_text': include_text,
+        'defer_extraction': defer_extraction
+    })
+
+
+def process_file(pdf_path):
+    """
+    解析单个 PDF 并提取信息（进程池任务）
+
+    Returns:
+        导入记录字典；已在检查点中的文件返回 status 为 skipped。
+        延后提取时不含 extracted_info，简历全文放在 resume_text 中由主进程批量提取
+    """
+    record = {
+        'file': pdf_path,
+        'sha256': None,
+        'status': 'failed',
+        'error': None
+    }
+
+    try:
+        with open(pdf_path, 'rb') as f:
+            content = f.read()
+        record['sha256'] = hashlib.sha256(content).hexdigest()
+
+        if record['sha256'] in _worker_options['completed_hashes']:
+            record['status'] = 'skipped'
+            return record
+
+        parse_result = PDFParser.parse(
+            content, max_workers=1, engine=_worker_options['engine']
+        )
+        if not parse_result['success']:
+            record['error'] = parse_result['error']
+            return record
+
+        resume_text = parse_result['data']['raw_text']
+        extractor = AIExtractor if _worker_options['regex_only'] else HybridExtractor
+
+        record['status'] = 'ok'
+        record['total_pages'] = parse_result['data']['total_pages']
+        if _worker_options['defer_extraction']:
+            record['resume_text'] = resume_text
+            return record
+        with llm_priority(PRIORITY_BATCH):
+            record['extracted_info'] = extractor.extract_all_info(resume_text)
+        if _worker_options['include_text']:
+            record['resume_text'] = resume_text
+    except Exception as e:
+        record['error'] = str(e)
+
+    return record
+
+
+def main():
+    parser = argparse.ArgumentParser(description='批量解析 PDF 简历并输出 JSONL')
+    parser.add_argument('target', help='PDF 目录或通配符，如 "data/**/*.pdf"')
+    parser.add_argument('-o', '--output', default='resumes.jsonl', help='输出 JSONL 文件（追加写入）')
+    parser.add_argument('--checkpoint', default=None, help='检查点文件，默认为 <output>.done')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='进程数')
+    parser.add_argument('--regex-only', action='store_true', help='仅使用正则提取，不调用 LLM')
+    parser.add_argument('--engine', choices=('accurate', 'fast'), default=None,
+                        help='PDF 解析引擎，默认使用 PDF_ENGINE 配置')
+    parser.add_argument('--include-text', action='store_true', help='在记录中包含简历全文')
+    parser.add_argument('--progress-every', type=int, default=100, help='每处理多少个文件输出一次进度')
+    parser.add_argument('--llm-batch', type=int, default=0,
+                        help='每次 LLM 调用包含的简历数（大于 1 时启用批量提取，与 --regex-only 互斥）')
+    args = parser.parse_args()
+
+    checkpoint_path = args.checkpoint or f'{args.output}.done'
+    pdf_files = collect_pdfs(args.target)
+    if not pdf_files:
+        print(f'未找到 PDF 文件: {args.target}')
+        return 1
+
+    completed_hashes = load_checkpoint(checkpoint_path)
+    print(f'待处理 {len(pdf_files)} 个文件，检查点中已完成 {len(completed_hashes)} 个')
+
+    counts = {'ok': 0, 'skipped': 0, 'failed': 0}
+    start_time = time.time()
+    defer_extraction = args.llm_batch > 1 and not args.regex_only
+    # 等待批量提取的记录及其哈希
+    pending = []
+    pending_hashes = set()
+
+    with open(args.output, 'a', encoding='utf-8') as output, \
+            open(checkpoint_path, 'a', encoding='utf-8') as checkpoint, \
+            Pool(args.workers, initializer=_init_worker,
+                 initargs=(completed_hashes, args.regex_only, args.engine, args.include_text,
+                           defer_extraction)) as pool:
+
+        def write_record(record):
+            output.write(json.dumps(record, ensure_ascii=False) + '\n')
+            output.flush()
+
+            # 失败的文件不写入检查点，下次运行时重试
+            if record['status'] == 'ok':
+                checkpoint.write(record['sha256'] + '\n')
+                checkpoint.flush()
+                completed_hashes.add(record['sha256'])
+
+        def flush_pending():
+            # 子进程继续解析后续 PDF，主进程在此期间等待 LLM
+            with llm_priority(PRIORITY_BATCH):
+                extracted = HybridExtractor.extract_batch([record['resume_text'] for record in pending])
+            for record, extracted_info in zip(pending, extracted):
+                record['extracted_info'] = extracted_info
+                if not args.include_text:
+                    del record['resume_text']
+                write_record(record)
+            pending.clear()
+            pending_hashes.clear()
+
+        for done, record in enumerate(pool.imap_unordered(process_file, pdf_files, chunksize=4), 1):
+            # 同一次运行中内容重复的文件只保留第一份
+            if record['status'] == 'ok' and (record['sha256'] in completed_hashes
+                                             or record['sha256'] in pending_hashes):
+                record['status'] = 'skipped'
+            counts[record['status']] += 1
+
+            if record['status'] == 'ok' and defer_extraction:
+                pending.append(record)
+                pending_hashes.add(record['sha256'])
+                if len(pending) >= args.llm_batch:
+                    flush_pending()
+            elif record['status'] != 'skipped':
+                write_record(record)
+
+            if done % args.progress_every == 0 or done == len(pdf_files):
+                elapsed = time.time() - start_time
+                processed = counts['ok'] + counts['failed']
+                print(f'[{done}/{len(pdf_files)}] 成功 {counts["ok"]} 跳过 {counts["skipped"]} '
+                      f'失败 {counts["failed"]}，耗时 {elapsed:.1f}s，'
+                      f'{processed / elapsed if elapsed else 0:.2f} 份/秒')
+
+        if pending:
+            flush_pending()
+
+    return 0 if counts['failed'] == 0 else 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,9 +3,11 @@ AI 关键信息提取模块
 """
 import re
 from utils.text_cleaner import (
-    is_valid_email, is_valid_phone, normalize_phone, 
-    normalize_email, extract_keywords, clean_text
+    is_valid_email, is_valid_phone, extract_keywords, clean_text
 )
+from services.contact_scanner import ContactScanner
+from services.resume_document import ResumeDocument
+from services.skill_taxonomy import SKILL_TAXONOMY
 
 
 class AIExtractor:
@@ -15,73 +17,20 @@ class AIExtractor:
     def extract_base_info(resume_text):
         """
         提取基本信息：姓名、电话、邮箱、地址
-        """
-        base_info = {
-            'name': None,
-            'phone': None,
-            'email': None,
-            'address': None
-        }
-        
-        lines = resume_text.split('\n')
-        text_for_search = resume_text
-        
-        # 提取电话号码
-        phones = re.findall(r'1[3-9]\d{9}|0\d{2,3}\d{7,8}', text_for_search)
-        if phones:
-            base_info['phone'] = normalize_phone(phones[0])
-        else:
-            # 尝试其他电话格式
-            phone_patterns = [
-                r'电话[：:]\s*([0-9\-\s]+)',
-                r'tel[：:]\s*([0-9\-\s]+)',
-                r'phone[：:]\s*([0-9\-\s]+)',
-            ]
-            for pattern in phone_patterns:
-                match = re.search(pattern, text_for_search, re.IGNORECASE)
-                if match:
-                    phone_str = match.group(1)
-                    base_info['phone'] = normalize_phone(phone_str)
-                    break
-        
-        # 提取邮箱
-        emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text_for_search)
-        if emails:
-            base_info['email'] = normalize_email(emails[0])
-        
-        # 提取姓名（通常在文档开头或标注了"姓名"）
-        name_patterns = [
-            r'姓名[：:]\s*([^\s\n，,]+)',
-            r'name[：:]\s*([^\s\n]+)',
-            r'^([^\s\n，,]+)\s*[\u4e00-\u9fa5]',  # 开头为名字
-        ]
-        for pattern in name_patterns:
-            match = re.search(pattern, text_for_search, re.IGNORECASE)
-            if match:
-                potential_name = match.group(1).strip()
-                # 验证名字长度
-                if 2 <= len(potential_name) <= 20 and not potential_name.isdigit():
-                    base_info['name'] = potential_name
-                    break
-        
-        # 提取地址
-        address_patterns = [
-            r'地址[：:]\s*([^\n]+)',
-            r'address[：:]\s*([^\n]+)',
-            r'现住地[：:]\s*([^\n]+)',
-        ]
-        for pattern in address_patterns:
-            match = re.search(pattern, text_for_search, re.IGNORECASE)
-            if match:
-                base_info['address'] = match.group(1).strip()
-                break
         
-        return base_info
+        Args:
+            resume_text: 简历文本或 ResumeDocument，优先在 contact 分段中查找
+        """
+        # 各字段按优先级依次匹配预编译的正则，找到第一个有效候选即停止
+        return ContactScanner.extract(resume_text)
     
     @staticmethod
     def extract_optional_info(resume_text):
         """
         提取可选信息：求职意向、工作年限、学历背景
+        
+        Args:
+            resume_text: 简历文本或 ResumeDocument
         """
         optional_info = {
             'job_intention': None,
@@ -89,7 +38,7 @@ class AIExtractor:
             'education': None
         }
         
-        text_lower = resume_text.lower()
+        document = ResumeDocument.of(resume_text)
         
         # 提取求职意向
         job_patterns = [
@@ -98,7 +47,7 @@ class AIExtractor:
             r'目标职位[：:]\s*([^\n]+)',
         ]
         for pattern in job_patterns:
-            match = re.search(pattern, resume_text, re.IGNORECASE)
+            match = document.search(pattern, 'contact', flags=re.IGNORECASE)
             if match:
                 optional_info['job_intention'] = match.group(1).strip()
                 break
@@ -111,7 +60,7 @@ class AIExtractor:
             r'experience[：:]\s*(\d+)\s*years',
         ]
         for pattern in years_patterns:
-            match = re.search(pattern, resume_text, re.IGNORECASE)
+            match = document.search(pattern, 'contact', 'experience', flags=re.IGNORECASE)
             if match:
                 try:
                     optional_info['work_experience_years'] = int(match.group(1))
@@ -127,7 +76,7 @@ class AIExtractor:
             r'education[：:]\s*([^\n]+)',
         ]
         for pattern in education_patterns:
-            match = re.search(pattern, resume_text, re.IGNORECASE)
+            match = document.search(pattern, 'education', flags=re.IGNORECASE)
             if match:
                 optional_info['education'] = match.group(0).strip()
                 break
@@ -138,40 +87,22 @@ class AIExtractor:
     def extract_skills(resume_text):
         """
         提取技能信息
-        """
-        skills = []
         
-        # 常见的技能关键词
-        skill_keywords = [
-            'Python', 'Java', 'JavaScript', 'C++', 'C#', 'Go', 'Rust', 'PHP',
-            'React', 'Vue', 'Angular', 'Django', 'Flask', 'Spring', 'FastAPI',
-            'MySQL', 'MongoDB', 'Redis', 'PostgreSQL', 'Oracle',
-            'Docker', 'Kubernetes', 'AWS', 'GCP', 'Azure',
-            'Git', 'Linux', 'SQL', 'RESTful', 'API',
-            'HTML', 'CSS', 'Webpack', 'Node.js', 'Express',
-            'TensorFlow', 'PyTorch', 'Keras', 'Scikit-learn',
-            'MQ', 'Kafka', 'RabbitMQ', 'Elasticsearch',
-            '微服务', '分布式', '高并发', '数据分析', '机器学习',
-            'AI', 'NLP', '深度学习', '计算机视觉', '大数据',
-        ]
-        
-        for skill in skill_keywords:
-            if skill.lower() in resume_text.lower():
-                skills.append(skill)
-        
-        # 去重
-        skills = list(set(skills))
-        
-        return skills
+        Args:
+            resume_text: 简历文本或 ResumeDocument
+        """
+        # 单次线性扫描匹配全部技能关键词（按词边界，复用文档的小写视图）
+        return SKILL_TAXONOMY.find_skills(ResumeDocument.of(resume_text))
     
     @staticmethod
     def extract_all_info(resume_text):
         """
-        一次性提取所有信息
+        一次性提取所有信息（文档模型只构建一次，各提取步骤共享）
         """
+        document = ResumeDocument.of(resume_text)
         return {
-            'base_info': AIExtractor.extract_base_info(resume_text),
-            'optional_info': AIExtractor.extract_optional_info(resume_text),
-            'skills': AIExtractor.extract_skills(resume_text),
-            'keywords': extract_keywords(resume_text, top_n=15)
+            'base_info': AIExtractor.extract_base_info(document),
+            'optional_info': AIExtractor.extract_optional_info(document),
+            'skills': AIExtractor.extract_skills(document),
+            'keywords': extract_keywords(document.text, top_n=15)
         }
@@ -3,11 +3,31 @@
 """
 import json
 import re
-from typing import Dict, List, Optional
+import time
+from concurrent.futures import TimeoutError as FuturesTimeoutError, wait
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple, Union
 from utils.text_cleaner import (
-    is_valid_email, is_valid_phone, normalize_phone, 
-    normalize_email, extract_keywords, clean_text
+    is_valid_email, is_valid_phone, extract_keywords, clean_text
 )
+from config import LLM_EXTRACTION_MODE, LLM_REQUEST_DEADLINE, LLM_MAX_CONCURRENCY
+from services.circuit_breaker import LLM_BREAKER
+from services.contact_scanner import ContactScanner
+from services.rate_limiter import PriorityExecutor
+from services.resume_document import ResumeDocument
+from services.skill_taxonomy import SKILL_TAXONOMY
+from services.text_chunker import TextChunker
+
+# 与 LLMExtractor 合并模式的字段一致
+BASE_INFO_FIELDS = ('name', 'phone', 'email', 'address')
+OPTIONAL_INFO_FIELDS = ('job_intention', 'work_experience_years', 'education_background')
+
+# 所有请求共享的 LLM 调用线程池（交互请求和批量任务各自使用独立的线程）
+_LLM_EXECUTOR = PriorityExecutor(max_workers=LLM_MAX_CONCURRENCY, thread_name_prefix='llm')
+
+
+class LLMExtractionError(Exception):
+    """LLM 不可用、熔断或未返回任何字段（仅在 fallback=False 时抛出）"""
 
 
 class HybridExtractor:
@@ -17,92 +37,75 @@ class HybridExtractor:
     llm_available = False
     try:
         from services.ai_llm_extractor import LLMExtractor
-        llm_available = True
+        llm_available = bool(LLMExtractor.API_KEY)
+        if not llm_available:
+            print("[HybridExtractor] 未配置 LLM_API_KEY，将只使用正则提取")
     except Exception as e:
         print(f"[HybridExtractor] LLM 模块加载失败，将使用备选方案: {e}")
     
     @staticmethod
-    def extract_base_info(resume_text: str) -> Dict:
-        """提取基本信息 - LLM优先，备选方案"""
-        base_info = {
-            'name': None,
-            'phone': None,
-            'email': None,
-            'address': None
-        }
+    def _llm_enabled() -> bool:
+        """LLM 可用且未熔断；熔断期间直接使用备选方案，不再等待超时"""
+        return HybridExtractor.llm_available and not (LLM_BREAKER is not None and LLM_BREAKER.is_open())
+    
+    @staticmethod
+    def extract_base_info(resume_text: Union[str, ResumeDocument], fallback: bool = True) -> Dict:
+        """提取基本信息 - LLM优先，备选方案（resume_text 可为 ResumeDocument；fallback=False 时 LLM 无结果抛出异常）"""
+        document = ResumeDocument.of(resume_text)
         
         # 首先尝试 LLM 提取
-        if HybridExtractor.llm_available:
+        if HybridExtractor._llm_enabled():
             try:
                 from services.ai_llm_extractor import LLMExtractor
-                llm_result = LLMExtractor.extract_base_info_with_llm(resume_text)
-                if llm_result.get('phone') or llm_result.get('email'):
+                llm_result = LLMExtractor.extract_base_info_with_llm(document)
+                # 电话和邮箱缺失时已由正则补全，fallback=False 时只有 LLM 返回了姓名或地址才算有结果
+                if fallback and (llm_result.get('phone') or llm_result.get('email')):
+                    return llm_result
+                if not fallback and (llm_result.get('name') or llm_result.get('address')):
                     return llm_result
             except Exception as e:
                 print(f"[HybridExtractor] LLM 提取失败，使用备选方案: {e}")
         
-        # 备选方案：正则表达式提取
-        lines = resume_text.split('\n')
-        text_for_search = resume_text
-        
-        # 提取电话号码
-        phones = re.findall(r'1[3-9]\d{9}|0\d{2,3}\d{7,8}', text_for_search)
-        if phones:
-            base_info['phone'] = normalize_phone(phones[0])
-        
-        # 提取邮箱
-        emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text_for_search)
-        if emails:
-            base_info['email'] = normalize_email(emails[0])
-        
-        # 提取姓名
-        name_patterns = [
-            r'姓名[：:]\s*([^\s\n，,]+)',
-            r'name[：:]\s*([^\s\n]+)',
-            r'^([^\s\n，,]+)\s*[\u4e00-\u9fa5]',
-        ]
-        for pattern in name_patterns:
-            match = re.search(pattern, text_for_search, re.IGNORECASE)
-            if match:
-                potential_name = match.group(1).strip()
-                if 2 <= len(potential_name) <= 20 and not potential_name.isdigit():
-                    base_info['name'] = potential_name
-                    break
+        if not fallback:
+            raise LLMExtractionError('LLM 未返回基本信息')
         
-        # 提取地址
-        address_patterns = [
-            r'地址[：:]\s*([^\n]+)',
-            r'address[：:]\s*([^\n]+)',
-            r'现住地[：:]\s*([^\n]+)',
-        ]
-        for pattern in address_patterns:
-            match = re.search(pattern, text_for_search, re.IGNORECASE)
-            if match:
-                base_info['address'] = match.group(1).strip()
-                break
-        
-        return base_info
+        # 备选方案：正则表达式提取
+        return HybridExtractor._regex_base_info(document)
     
     @staticmethod
-    def extract_optional_info(resume_text: str) -> Dict:
-        """提取可选信息 - LLM优先，备选方案"""
-        optional_info = {
-            'job_intention': None,
-            'work_experience_years': None,
-            'education_background': None
-        }
+    def _regex_base_info(document: ResumeDocument) -> Dict:
+        """正则提取基本信息（优先在 contact 分段中查找）"""
+        return ContactScanner.extract(document, phone_labels=False)
+    
+    @staticmethod
+    def extract_optional_info(resume_text: Union[str, ResumeDocument], fallback: bool = True) -> Dict:
+        """提取可选信息 - LLM优先，备选方案（resume_text 可为 ResumeDocument；fallback=False 时 LLM 无结果抛出异常）"""
+        document = ResumeDocument.of(resume_text)
         
         # 首先尝试 LLM 提取
-        if HybridExtractor.llm_available:
+        if HybridExtractor._llm_enabled():
             try:
                 from services.ai_llm_extractor import LLMExtractor
-                llm_result = LLMExtractor.extract_optional_info_with_llm(resume_text)
+                llm_result = LLMExtractor.extract_optional_info_with_llm(document)
                 if llm_result.get('job_intention') or llm_result.get('work_experience_years'):
                     return llm_result
             except Exception as e:
                 print(f"[HybridExtractor] LLM 可选信息提取失败，使用备选方案")
         
+        if not fallback:
+            raise LLMExtractionError('LLM 未返回可选信息')
+        
         # 备选方案：正则表达式提取
+        return HybridExtractor._regex_optional_info(document)
+    
+    @staticmethod
+    def _regex_optional_info(document: ResumeDocument) -> Dict:
+        """正则提取可选信息"""
+        optional_info = {
+            'job_intention': None,
+            'work_experience_years': None,
+            'education_background': None
+        }
         
         # 求职意向
         job_patterns = [
@@ -111,7 +114,7 @@ class HybridExtractor:
             r'应聘岗位[：:]\s*([^\n]+)',
         ]
         for pattern in job_patterns:
-            match = re.search(pattern, resume_text, re.IGNORECASE)
+            match = document.search(pattern, 'contact', flags=re.IGNORECASE)
             if match:
                 optional_info['job_intention'] = match.group(1).strip()
                 break
@@ -122,7 +125,7 @@ class HybridExtractor:
             r'工作年限[：:]\s*(\d+)',
         ]
         for pattern in years_patterns:
-            match = re.search(pattern, resume_text)
+            match = document.search(pattern, 'contact', 'experience')
             if match:
                 try:
                     optional_info['work_experience_years'] = int(match.group(1))
@@ -137,7 +140,7 @@ class HybridExtractor:
             r'(博士|硕士|本科|专科|高中)',
         ]
         for pattern in edu_patterns:
-            match = re.search(pattern, resume_text)
+            match = document.search(pattern, 'education')
             if match:
                 optional_info['education_background'] = match.group(1).strip()
                 break
@@ -145,68 +148,293 @@ class HybridExtractor:
         return optional_info
     
     @staticmethod
-    def extract_skills(resume_text: str) -> List[str]:
-        """提取技能 - LLM优先，备选方案"""
+    def extract_skills(resume_text: Union[str, ResumeDocument], fallback: bool = True) -> List[str]:
+        """提取技能 - LLM优先，备选方案（resume_text 可为 ResumeDocument；fallback=False 时 LLM 无结果抛出异常）"""
+        document = ResumeDocument.of(resume_text)
         
         # 首先尝试 LLM 提取
-        if HybridExtractor.llm_available:
+        if HybridExtractor._llm_enabled():
             try:
-                from ai_llm_extractor import LLMExtractor
-                llm_skills = LLMExtractor.extract_skills_with_llm(resume_text)
+                from services.ai_llm_extractor import LLMExtractor
+                llm_skills = LLMExtractor.extract_skills_with_llm(document)
                 if llm_skills and len(llm_skills) > 0:
                     return llm_skills
             except Exception as e:
                 print(f"[HybridExtractor] LLM 技能提取失败，使用备选方案")
         
-        # 备选方案：关键词提取
-        skill_keywords = [
-            'Python', 'Java', 'JavaScript', 'C++', 'C#', 'Go', 'Rust', 'PHP',
-            'React', 'Vue', 'Angular', 'Django', 'Flask', 'Spring', 'FastAPI',
-            'MySQL', 'MongoDB', 'Redis', 'PostgreSQL', 'Oracle',
-            'Docker', 'Kubernetes', 'AWS', 'GCP', 'Azure',
-            'Git', 'Linux', 'SQL', 'RESTful', 'API',
-            'HTML', 'CSS', 'Webpack', 'Node.js', 'Express',
-            'TensorFlow', 'PyTorch', 'Keras', 'Scikit-learn',
-            'MQ', 'Kafka', 'RabbitMQ', 'Elasticsearch',
-            '微服务', '分布式', '高并发', '数据分析', '机器学习',
-            'AI', 'NLP', '深度学习', '计算机视觉', '大数据',
-        ]
-        
-        skills = []
-        for keyword in skill_keywords:
-            if keyword.lower() in resume_text.lower():
-                skills.append(keyword)
+        if not fallback:
+            raise LLMExtractionError('LLM 未返回技能')
         
-        return list(set(skills))
+        # 备选方案：关键词自动机单次扫描
+        return HybridExtractor._regex_skills(document)
+    
+    @staticmethod
+    def _regex_skills(document: ResumeDocument) -> List[str]:
+        """按技能词表匹配技能"""
+        return SKILL_TAXONOMY.find_skills(document)
     
     @staticmethod
-    def generate_summary(resume_text: str) -> str:
-        """生成总结 - LLM优先，备选方案"""
+    def generate_summary(resume_text: Union[str, ResumeDocument], fallback: bool = True) -> str:
+        """生成总结 - LLM优先，备选方案（resume_text 可为 ResumeDocument；fallback=False 时 LLM 无结果抛出异常）"""
+        document = ResumeDocument.of(resume_text)
         
         # 首先尝试 LLM 提取
-        if HybridExtractor.llm_available:
+        if HybridExtractor._llm_enabled():
             try:
-                from ai_llm_extractor import LLMExtractor
-                llm_summary = LLMExtractor.generate_summary_with_llm(resume_text)
+                from services.ai_llm_extractor import LLMExtractor
+                llm_summary = LLMExtractor.generate_summary_with_llm(document)
                 if llm_summary:
                     return llm_summary
             except Exception as e:
                 print(f"[HybridExtractor] LLM 总结生成失败")
         
+        if not fallback:
+            raise LLMExtractionError('LLM 未返回摘要')
+        
         # 备选方案：简单的前几句摘录
-        sentences = re.split(r'[。！？\n]', resume_text)
+        return HybridExtractor._regex_summary(document)
+    
+    @staticmethod
+    def _regex_summary(document: ResumeDocument) -> str:
+        """摘录前几句作为摘要"""
+        sentences = re.split(r'[。！？\n]', document.text)
         summary = '。'.join([s.strip() for s in sentences[:3] if s.strip()])
         return summary if summary else ''
     
     @staticmethod
-    def extract_all_info(resume_text: str) -> Dict:
-        """提取所有信息 - 混合方案"""
-        cleaned_text = clean_text(resume_text)
+    def extract_regex_info(resume_text: Union[str, ResumeDocument]) -> Dict:
+        """只使用正则和词表提取所有信息（毫秒级，不调用 LLM）"""
+        if isinstance(resume_text, ResumeDocument):
+            document = resume_text
+        else:
+            document = ResumeDocument(clean_text(resume_text))
+        
+        return {
+            'base_info': HybridExtractor._regex_base_info(document),
+            'optional_info': HybridExtractor._regex_optional_info(document),
+            'skills': HybridExtractor._regex_skills(document),
+            'keywords': extract_keywords(document.text),
+            'summary': HybridExtractor._regex_summary(document)
+        }
+    
+    @staticmethod
+    def extract_all_info(resume_text: Union[str, ResumeDocument], fallback: bool = True) -> Dict:
+        """
+        提取所有信息 - 混合方案（清洗后构建一次文档模型，各字段共享）
+        
+        Args:
+            resume_text: 简历文本或 ResumeDocument
+            fallback: 为 False 时，LLM 不可用、熔断或没有返回任何字段则抛出 LLMExtractionError，
+                不返回纯正则结果（后台补全据此区分失败）；LLM 只返回部分字段时其余字段仍回退到正则
+        """
+        if isinstance(resume_text, ResumeDocument):
+            document = resume_text
+        else:
+            document = ResumeDocument(clean_text(resume_text))
+        
+        if not HybridExtractor._llm_enabled():
+            if not fallback:
+                raise LLMExtractionError('LLM 不可用或已熔断')
+            return HybridExtractor.extract_regex_info(document)
+        
+        if LLM_EXTRACTION_MODE == 'combined':
+            return HybridExtractor._extract_all_combined(document, fallback)
+        if LLM_EXTRACTION_MODE == 'chunked':
+            return HybridExtractor._extract_all_chunked(document, fallback)
+        if LLM_EXTRACTION_MODE == 'batched':
+            return HybridExtractor._extract_all_batched(document, fallback)
+        
+        # 分开提取：四类字段并发调用 LLM，共享同一个截止时间
+        tasks = {
+            'base_info': (HybridExtractor.extract_base_info, HybridExtractor._regex_base_info),
+            'optional_info': (HybridExtractor.extract_optional_info, HybridExtractor._regex_optional_info),
+            'skills': (HybridExtractor.extract_skills, HybridExtractor._regex_skills),
+            'summary': (HybridExtractor.generate_summary, HybridExtractor._regex_summary)
+        }
+        if fallback:
+            results, keywords = HybridExtractor._run_with_deadline(document, tasks)
+        else:
+            # LLM 没有结果的字段先记为 None，全部没有结果时抛出，否则再回退到正则
+            results, keywords = HybridExtractor._run_with_deadline(document, {
+                name: (partial(extract, fallback=False), lambda document: None)
+                for name, (extract, _) in tasks.items()
+            })
+            if all(value is None for value in results.values()):
+                raise LLMExtractionError('LLM 未返回任何字段')
+            results = {
+                name: value if value is not None else tasks[name][1](document)
+                for name, value in results.items()
+            }
+        
+        return {
+            'base_info': results['base_info'],
+            'optional_info': results['optional_info'],
+            'skills': results['skills'],
+            'keywords': keywords,
+            'summary': results['summary']
+        }
+    
+    @staticmethod
+    def _run_with_deadline(document: ResumeDocument,
+                           tasks: Dict[str, Tuple[Callable, Callable]],
+                           deadline: float = LLM_REQUEST_DEADLINE) -> Tuple[Dict, List[str]]:
+        """
+        在共享线程池中并发执行各字段的 LLM 提取，超过截止时间仍未返回的字段使用正则结果
+        
+        Args:
+            document: 简历文档
+            tasks: 字段名 → (LLM 提取函数, 正则回退函数)
+            deadline: 整个请求的时间预算（秒）
+            
+        Returns:
+            (字段名 → 结果, 关键词列表)；关键词在等待 LLM 期间于当前线程计算
+        """
+        expires_at = time.monotonic() + deadline
+        futures = {
+            _LLM_EXECUTOR.submit(extract, document): name
+            for name, (extract, _) in tasks.items()
+        }
+        
+        keywords = extract_keywords(document.text)
+        
+        done, pending = wait(futures, timeout=max(0, expires_at - time.monotonic()))
+        results = {}
+        for future, name in futures.items():
+            fallback = tasks[name][1]
+            if future in pending:
+                # 未开始的任务直接取消；已在进行的请求结果将被丢弃
+                future.cancel()
+                print(f"[HybridExtractor] {name} 超过 {deadline} 秒未返回，使用备选方案")
+                results[name] = fallback(document)
+                continue
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                print(f"[HybridExtractor] {name} 提取失败，使用备选方案: {e}")
+                results[name] = fallback(document)
+        
+        return results, keywords
+    
+    @staticmethod
+    def _extract_all_combined(document: ResumeDocument, fallback: bool = True) -> Dict:
+        """
+        合并模式：一次 LLM 调用提取全部字段，缺失或校验失败的字段单独回退到正则
+        """
+        def extract_combined(document):
+            from services.ai_llm_extractor import LLMExtractor
+            return LLMExtractor.extract_combined_with_llm(document)
+        
+        results, keywords = HybridExtractor._run_with_deadline(document, {
+            'combined': (extract_combined, lambda document: {})
+        })
+        HybridExtractor._check_llm_fields(results['combined'], fallback)
+        return HybridExtractor._merge_with_regex(document, results['combined'], keywords)
+    
+    @staticmethod
+    def _extract_all_chunked(document: ResumeDocument, fallback: bool = True) -> Dict:
+        """
+        分块模式：按分段切分为不超过 token 预算的块，各块并发调用 LLM，
+        合并后缺失的字段回退到正则；超过截止时间的块不参与合并
+        """
+        from services.ai_llm_extractor import LLMExtractor
+        
+        def extract_chunk(chunk):
+            return lambda document: LLMExtractor.extract_combined_with_llm(chunk, max_chars=None)
+        
+        chunks = TextChunker.split(document)
+        names = [f'chunk_{index}' for index in range(len(chunks))]
+        results, keywords = HybridExtractor._run_with_deadline(document, {
+            name: (extract_chunk(chunk), lambda document: {})
+            for name, chunk in zip(names, chunks)
+        })
+        fields = LLMExtractor.merge_chunk_fields([results[name] for name in names])
+        HybridExtractor._check_llm_fields(fields, fallback)
+        return HybridExtractor._merge_with_regex(document, fields, keywords)
+    
+    @staticmethod
+    def _extract_all_batched(document: ResumeDocument, fallback: bool = True) -> Dict:
+        """
+        批量模式：提交到共享微批处理器，与同一时间到达的其他简历合并为一次 LLM 调用
+        """
+        from services.ai_llm_extractor import LLM_BATCHER
+        
+        expires_at = time.monotonic() + LLM_REQUEST_DEADLINE
+        future = LLM_BATCHER.submit(document)
+        keywords = extract_keywords(document.text)
+        
+        try:
+            fields = future.result(timeout=max(0, expires_at - time.monotonic()))
+        except FuturesTimeoutError:
+            future.cancel()
+            print(f"[HybridExtractor] 批量提取超过 {LLM_REQUEST_DEADLINE} 秒未返回，使用备选方案")
+            fields = {}
+        except Exception as e:
+            print(f"[HybridExtractor] 批量提取失败，使用备选方案: {e}")
+            fields = {}
+        
+        HybridExtractor._check_llm_fields(fields, fallback)
+        return HybridExtractor._merge_with_regex(document, fields, keywords)
+    
+    @staticmethod
+    def _check_llm_fields(fields: Dict, fallback: bool):
+        """fallback=False 且 LLM 没有返回任何字段（调用失败、超时或响应无法解析）时抛出 LLMExtractionError"""
+        if not fallback and all(value is None for value in fields.values()):
+            raise LLMExtractionError('LLM 未返回任何字段')
+    
+    @staticmethod
+    def extract_batch(resume_texts: List[Union[str, ResumeDocument]]) -> List[Dict]:
+        """
+        批量导入使用：一次 LLM 调用提取一组简历，缺失的字段回退到正则
+        
+        Args:
+            resume_texts: 简历文本或 ResumeDocument 列表（建议不超过 LLM_BATCH_SIZE 份）
+            
+        Returns:
+            与输入顺序一致的提取结果列表
+        """
+        documents = [
+            text if isinstance(text, ResumeDocument) else ResumeDocument(clean_text(text))
+            for text in resume_texts
+        ]
+        if not HybridExtractor._llm_enabled():
+            return [HybridExtractor.extract_all_info(document) for document in documents]
+        
+        from services.ai_llm_extractor import LLMExtractor
+        try:
+            fields_list = LLMExtractor.extract_batch_with_llm(documents)
+        except Exception as e:
+            print(f"[HybridExtractor] 批量提取失败，使用备选方案: {e}")
+            fields_list = [{} for _ in documents]
+        
+        return [
+            HybridExtractor._merge_with_regex(document, fields, extract_keywords(document.text))
+            for document, fields in zip(documents, fields_list)
+        ]
+    
+    @staticmethod
+    def _merge_with_regex(document: ResumeDocument, fields: Dict, keywords: List[str]) -> Dict:
+        """
+        以 LLM 字段为准组装结果，缺失的字段按组回退到正则
+        """
+        def merge(llm_values, fallback):
+            # 正则结果按需计算，全部字段都由 LLM 提供时不执行
+            if all(value is not None for value in llm_values.values()):
+                return llm_values
+            regex_values = fallback(document)
+            return {
+                field: value if value is not None else regex_values.get(field)
+                for field, value in llm_values.items()
+            }
+        
+        base_info = merge({field: fields.get(field) for field in BASE_INFO_FIELDS},
+                          HybridExtractor._regex_base_info)
+        optional_info = merge({field: fields.get(field) for field in OPTIONAL_INFO_FIELDS},
+                              HybridExtractor._regex_optional_info)
         
         return {
-            'base_info': HybridExtractor.extract_base_info(cleaned_text),
-            'optional_info': HybridExtractor.extract_optional_info(cleaned_text),
-            'skills': HybridExtractor.extract_skills(cleaned_text),
-            'keywords': extract_keywords(cleaned_text),
-            'summary': HybridExtractor.generate_summary(cleaned_text)
+            'base_info': base_info,
+            'optional_info': optional_info,
+            'skills': fields.get('skills') or HybridExtractor._regex_skills(document),
+            'keywords': keywords,
+            'summary': fields.get('summary') or HybridExtractor._regex_summary(document)
         }
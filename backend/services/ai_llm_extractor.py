@@ -3,26 +3,63 @@
 """
 import json
 import re
-import requests
-from typing import Dict, List, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Union
 from utils.text_cleaner import (
     is_valid_email, is_valid_phone, normalize_phone, 
     normalize_email, extract_keywords, clean_text
 )
+from config import LLM_EXTRACTION_MODE, LLM_API_URL, LLM_API_KEY, LLM_MODEL, LLM_MAX_CONCURRENCY
+from services.circuit_breaker import LLM_BREAKER
+from services.llm_batcher import MicroBatcher
+from services.llm_cache import LLM_CACHE
+from services.llm_client import LLMClient, LLMStreamError
+from services.rate_limiter import LLM_RATE_LIMITER, RateLimitTimeout, submit_with_context
+from services.contact_scanner import ContactScanner
+from services.resume_document import ResumeDocument
+from services.skill_taxonomy import SKILL_TAXONOMY
+from services.text_chunker import TextChunker, estimate_tokens
+
+# 合并模式下一次提取的字段
+BASE_INFO_FIELDS = ('name', 'phone', 'email', 'address')
+OPTIONAL_INFO_FIELDS = ('job_intention', 'work_experience_years', 'education_background')
+
+# 分块合并时学历从高到低的顺序
+DEGREE_RANKING = ('博士', '硕士', '本科', '专科', '高中')
 
 
 class LLMExtractor:
     """使用大语言模型的信息提取器"""
     
     # 通义千问 API 配置
-    API_KEY = "sk-fa9248d9096f44d385501939bdc99c6b"
-    API_URL = "https://dashscope.aliyuncs.com/api/v1/services/aigc/text-generation/generation"
-    MODEL = "qwen-plus"
+    API_KEY = LLM_API_KEY
+    API_URL = LLM_API_URL
+    MODEL = LLM_MODEL
     
+    @staticmethod
+    def _acquire_rate_limit(prompt: str, max_tokens: int) -> bool:
+        """
+        获取出站限流许可（按提示词估算 token 数加最大生成长度计费，优先级取自当前上下文）
+        
+        Returns:
+            False 表示排队超时，调用方应放弃本次调用；True 时调用结束后须 release
+        """
+        if LLM_RATE_LIMITER is None:
+            return True
+        try:
+            LLM_RATE_LIMITER.acquire(estimate_tokens(prompt) + max_tokens)
+            return True
+        except RateLimitTimeout as e:
+            print(f"[LLMExtractor] {e}，跳过本次调用")
+            return False
+        
     @staticmethod
     def call_qwen_api(prompt: str, max_tokens: int = 1000) -> Optional[str]:
         """
-        调用通义千问 API
+        调用通义千问 API（先查响应缓存；熔断期间直接返回 None；按优先级排队限流；共享连接池，429/5xx 自动退避重试）
+        
+        响应不会自动写入缓存，调用方解析成功后调用 cache_response
         
         Args:
             prompt: 提示词
@@ -31,60 +68,65 @@ class LLMExtractor:
         Returns:
             API 返回的文本内容或 None
         """
+        params = {'max_tokens': max_tokens, 'temperature': 0.3}
+        cache_key = LLMExtractor._cache_key(prompt, max_tokens)
+        if cache_key is not None:
+            cached = LLM_CACHE.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        # 先检查熔断，熔断期间不消耗限流配额，也不排队
+        if LLM_BREAKER is not None and not LLM_BREAKER.allow_request():
+            return None
+        if not LLMExtractor._acquire_rate_limit(prompt, max_tokens):
+            if LLM_BREAKER is not None:
+                LLM_BREAKER.cancel_request()
+            return None
         try:
-            headers = {
-                "Authorization": f"Bearer {LLMExtractor.API_KEY}",
-                "Content-Type": "application/json"
-            }
-            
-            payload = {
-                "model": LLMExtractor.MODEL,
-                "input": {
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ]
-                },
-                "parameters": {
-                    "max_tokens": max_tokens,
-                    "temperature": 0.3
-                }
-            }
-            
-            response = requests.post(
-                LLMExtractor.API_URL,
-                headers=headers,
-                json=payload,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                if result.get("output", {}).get("choices"):
-                    content = result["output"]["choices"][0]["message"]["content"]
-                    print(f"[LLM API] 成功获取响应: {content[:100]}")
-                    return content
-            else:
-                print(f"[LLM API] HTTP 错误: {response.status_code} - {response.text[:200]}")
-                return None
-                
-        except Exception as e:
-            print(f"[LLM API] 异常: {str(e)}")
+            started = time.perf_counter()
+            content = None
+            try:
+                content = LLM_CLIENT.generate(prompt, **params)
+            finally:
+                # 出现意外异常时也要记录，否则半开状态的探测名额无法释放
+                if LLM_BREAKER is not None:
+                    LLM_BREAKER.record(content is not None, (time.perf_counter() - started) * 1000)
+        finally:
+            if LLM_RATE_LIMITER is not None:
+                LLM_RATE_LIMITER.release()
+        return content
+        
+    @staticmethod
+    def _cache_key(prompt: str, max_tokens: int) -> Optional[str]:
+        if LLM_CACHE is None:
             return None
+        return LLM_CACHE.make_key(LLMExtractor.MODEL, prompt, {'max_tokens': max_tokens, 'temperature': 0.3})
+        
+    @staticmethod
+    def cache_response(prompt: str, content: str, max_tokens: int = 1000):
+        """
+        将解析和校验通过的响应写入缓存
+        
+        call_qwen_api 不写缓存：截断或格式错误的响应如果被缓存，有效期内同一份简历都只能回退到正则，
+        所以由调用方在解析成功后调用本方法。
+        """
+        cache_key = LLMExtractor._cache_key(prompt, max_tokens)
+        if cache_key is not None and content:
+            LLM_CACHE.set(cache_key, content, model=LLMExtractor.MODEL)
     
     @staticmethod
-    def extract_base_info_with_llm(resume_text: str) -> Dict:
+    def extract_base_info_with_llm(resume_text: Union[str, ResumeDocument]) -> Dict:
         """
         使用 LLM 提取基本信息（姓名、电话、邮箱、地址）
         
         Args:
-            resume_text: 简历文本
+            resume_text: 简历文本或 ResumeDocument
             
         Returns:
             包含基本信息的字典
         """
+        document = ResumeDocument.of(resume_text)
+        resume_text = document.text
         base_info = {
             'name': None,
             'phone': None,
@@ -112,38 +154,35 @@ class LLMExtractor:
             try:
                 # 尝试解析 JSON
                 json_match = re.search(r'\{.*\}', result_text, re.DOTALL)
-                if json_match:
-                    result_json = json.loads(json_match.group())
+                result_json = json.loads(json_match.group()) if json_match else None
+                if isinstance(result_json, dict):
                     base_info['name'] = result_json.get('name')
                     base_info['phone'] = normalize_phone(result_json.get('phone')) if result_json.get('phone') else None
                     base_info['email'] = normalize_email(result_json.get('email')) if result_json.get('email') else None
                     base_info['address'] = result_json.get('address')
+                    LLMExtractor.cache_response(prompt, result_text)
             except json.JSONDecodeError:
                 pass
         
         # 备用：如果 LLM 提取失败，使用正则表达式备选方案
-        if not base_info['phone'] or not base_info['email']:
-            phones = re.findall(r'1[3-9]\d{9}|0\d{2,3}\d{7,8}', resume_text)
-            if phones and not base_info['phone']:
-                base_info['phone'] = normalize_phone(phones[0])
-            
-            emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', resume_text)
-            if emails and not base_info['email']:
-                base_info['email'] = normalize_email(emails[0])
+        missing = [field for field in ('phone', 'email') if not base_info[field]]
+        if missing:
+            base_info.update(ContactScanner.extract(document, fields=missing, phone_labels=False))
         
         return base_info
     
     @staticmethod
-    def extract_optional_info_with_llm(resume_text: str) -> Dict:
+    def extract_optional_info_with_llm(resume_text: Union[str, ResumeDocument]) -> Dict:
         """
         使用 LLM 提取可选信息（求职意向、工作年限、学历背景）
         
         Args:
-            resume_text: 简历文本
+            resume_text: 简历文本或 ResumeDocument
             
         Returns:
             包含可选信息的字典
         """
+        resume_text = ResumeDocument.of(resume_text).text
         optional_info = {
             'job_intention': None,
             'work_experience_years': None,
@@ -166,27 +205,29 @@ class LLMExtractor:
         if result_text:
             try:
                 json_match = re.search(r'\{.*\}', result_text, re.DOTALL)
-                if json_match:
-                    result_json = json.loads(json_match.group())
+                result_json = json.loads(json_match.group()) if json_match else None
+                if isinstance(result_json, dict):
                     optional_info['job_intention'] = result_json.get('job_intention')
                     optional_info['work_experience_years'] = result_json.get('work_experience_years')
                     optional_info['education_background'] = result_json.get('education_background')
+                    LLMExtractor.cache_response(prompt, result_text)
             except json.JSONDecodeError:
                 pass
         
         return optional_info
     
     @staticmethod
-    def extract_skills_with_llm(resume_text: str) -> List[str]:
+    def extract_skills_with_llm(resume_text: Union[str, ResumeDocument]) -> List[str]:
         """
         使用 LLM 提取技能列表
         
         Args:
-            resume_text: 简历文本
+            resume_text: 简历文本或 ResumeDocument
             
         Returns:
             技能列表
         """
+        resume_text = ResumeDocument.of(resume_text).text
         prompt = f"""请从以下简历文本中提取所有技能和专业技术栈（如编程语言、框架、工具等）。
 以JSON数组格式返回，格式如：["Python", "Flask", "Django", "MySQL"]
 
@@ -206,31 +247,363 @@ class LLMExtractor:
                     skills = json.loads(json_match.group())
             except json.JSONDecodeError:
                 pass
+            if isinstance(skills, list) and skills:
+                LLMExtractor.cache_response(prompt, result_text)
         
         return skills if isinstance(skills, list) else []
     
     @staticmethod
-    def generate_summary_with_llm(resume_text: str) -> Optional[str]:
+    def generate_summary_with_llm(resume_text: Union[str, ResumeDocument]) -> Optional[str]:
         """
         使用 LLM 生成简历摘要
         
         Args:
-            resume_text: 简历文本
+            resume_text: 简历文本或 ResumeDocument
             
         Returns:
             简历摘要
         """
-        prompt = f"""请为以下简历生成一个简洁的摘要（不超过100字），总结候选人的主要资质和特点。
+        prompt = LLMExtractor._summary_prompt(resume_text)
+        summary = LLMExtractor.call_qwen_api(prompt, max_tokens=300)
+        if summary and summary.strip():
+            LLMExtractor.cache_response(prompt, summary, max_tokens=300)
+        return summary
+    
+    @staticmethod
+    def _summary_prompt(resume_text: Union[str, ResumeDocument]) -> str:
+        resume_text = ResumeDocument.of(resume_text).text
+        return f"""请为以下简历生成一个简洁的摘要（不超过100字），总结候选人的主要资质和特点。
 
 简历文本：
 {resume_text[:2000]}
 
 摘要："""
+    
+    @staticmethod
+    def stream_summary_with_llm(resume_text: Union[str, ResumeDocument]) -> Iterator[str]:
+        """
+        流式生成简历摘要（DashScope 增量输出），逐段产出文本
+        
+        与 generate_summary_with_llm 使用相同的提示词和缓存键：命中缓存时一次产出完整摘要，
+        完整生成后写入缓存。
+        
+        Args:
+            resume_text: 简历文本或 ResumeDocument
+            
+        Yields:
+            摘要的文本片段
+            
+        Raises:
+            LLMStreamError: 排队超时、熔断中、调用失败或输出中断
+        """
+        prompt = LLMExtractor._summary_prompt(resume_text)
+        params = {'max_tokens': 300, 'temperature': 0.3}
+        cache_key = LLMExtractor._cache_key(prompt, params['max_tokens'])
+        if cache_key is not None:
+            cached = LLM_CACHE.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+        
+        if LLM_BREAKER is not None and not LLM_BREAKER.allow_request():
+            raise LLMStreamError('LLM 熔断中')
+        if not LLMExtractor._acquire_rate_limit(prompt, params['max_tokens']):
+            if LLM_BREAKER is not None:
+                LLM_BREAKER.cancel_request()
+            raise LLMStreamError('LLM 调用排队超时')
+        try:
+            started = time.perf_counter()
+            parts = []
+            ok = False
+            try:
+                for text in LLM_CLIENT.stream(prompt, **params):
+                    parts.append(text)
+                    yield text
+                ok = True
+            except GeneratorExit:
+                # 客户端断开不算接口故障，且必须记录结果以释放半开状态的探测名额
+                ok = True
+                raise
+            finally:
+                if LLM_BREAKER is not None:
+                    LLM_BREAKER.record(ok, (time.perf_counter() - started) * 1000)
+        finally:
+            # 流式输出期间一直占用并发名额
+            if LLM_RATE_LIMITER is not None:
+                LLM_RATE_LIMITER.release()
+        
+        if parts and cache_key is not None:
+            LLM_CACHE.set(cache_key, ''.join(parts), model=LLMExtractor.MODEL)
+    
+    @staticmethod
+    def _clean_str(value, max_length=None) -> Optional[str]:
+        if not isinstance(value, str):
+            return None
+        value = value.strip()
+        if not value or value.lower() in ('null', 'none', 'n/a'):
+            return None
+        if max_length and len(value) > max_length:
+            return None
+        return value
+    
+    @staticmethod
+    def validate_fields(result_json) -> Dict:
+        """
+        逐字段校验合并提取的结果，缺失或不合法的字段为 None
+        
+        Args:
+            result_json: LLM 返回的 JSON 对象
+            
+        Returns:
+            字段 → 校验后的值（skills 为列表，其余为字符串或整数）
+        """
+        if not isinstance(result_json, dict):
+            result_json = {}
+        clean_str = LLMExtractor._clean_str
+        fields = {}
+        
+        name = clean_str(result_json.get('name'))
+        fields['name'] = name if name and 2 <= len(name) <= 20 and not name.isdigit() else None
+        
+        phone = result_json.get('phone')
+        phone = normalize_phone(str(phone)) if isinstance(phone, (str, int)) else None
+        fields['phone'] = phone if phone and is_valid_phone(phone) else None
+        
+        email = clean_str(result_json.get('email'))
+        email = normalize_email(email) if email else None
+        fields['email'] = email if email and is_valid_email(email) else None
+        
+        fields['address'] = clean_str(result_json.get('address'), max_length=200)
+        fields['job_intention'] = clean_str(result_json.get('job_intention'), max_length=100)
+        fields['education_background'] = clean_str(result_json.get('education_background'), max_length=200)
+        
+        # 工作年限：接受数字或 "5年" 这类字符串
+        years = result_json.get('work_experience_years')
+        if isinstance(years, str):
+            years_match = re.match(r'\s*(\d{1,2})', years)
+            years = int(years_match.group(1)) if years_match else None
+        if isinstance(years, float) and years.is_integer():
+            years = int(years)
+        fields['work_experience_years'] = (
+            years if isinstance(years, int) and not isinstance(years, bool) and 0 <= years <= 60 else None
+        )
+        
+        skills = result_json.get('skills')
+        if isinstance(skills, list):
+            skills = list(dict.fromkeys(
+                skill.strip() for skill in skills
+                if isinstance(skill, str) and skill.strip() and len(skill.strip()) <= 50
+            ))
+        fields['skills'] = skills or None
         
-        return LLMExtractor.call_qwen_api(prompt, max_tokens=300)
+        fields['summary'] = clean_str(result_json.get('summary'))
+        return fields
     
     @staticmethod
-    def extract_all_info(resume_text: str) -> Dict:
+    def extract_combined_with_llm(resume_text: Union[str, ResumeDocument],
+                                  max_chars: Optional[int] = 2000) -> Dict:
+        """
+        一次 LLM 调用提取全部字段（基本信息、可选信息、技能和摘要）
+        
+        Args:
+            resume_text: 简历文本或 ResumeDocument
+            max_chars: 提示词中最多包含的简历字符数，None 表示不截断（分块提取时块已受 token 预算限制）
+            
+        Returns:
+            validate_fields 的结果；调用或解析失败时所有字段均为 None
+        """
+        resume_text = ResumeDocument.of(resume_text).text
+        prompt = f"""请从以下简历文本中提取信息，并以JSON格式返回（如果找不到某项信息，值设为null）：
+- name: 姓名
+- phone: 电话号码（仅返回数字和-）
+- email: 邮箱地址
+- address: 地址
+- job_intention: 求职意向（职位名称）
+- work_experience_years: 工作年限（返回数字）
+- education_background: 学历背景（如：本科、硕士等）
+- skills: 技能和专业技术栈（编程语言、框架、工具等）的数组
+- summary: 简洁的简历摘要（不超过100字），总结候选人的主要资质和特点
+
+简历文本：
+{resume_text[:max_chars]}
+
+返回格式如下（仅返回JSON，不要其他文本）：
+{{"name": "...", "phone": "...", "email": "...", "address": "...", "job_intention": "...", "work_experience_years": ..., "education_background": "...", "skills": ["技能1", "技能2"], "summary": "..."}}"""
+        
+        result_text = LLMExtractor.call_qwen_api(prompt, max_tokens=1500)
+        result_json = None
+        
+        if result_text:
+            try:
+                json_match = re.search(r'\{.*\}', result_text, re.DOTALL)
+                if json_match:
+                    result_json = json.loads(json_match.group())
+            except json.JSONDecodeError:
+                pass
+            if isinstance(result_json, dict):
+                LLMExtractor.cache_response(prompt, result_text, max_tokens=1500)
+        
+        return LLMExtractor.validate_fields(result_json)
+    
+    @staticmethod
+    def merge_chunk_fields(chunk_fields: List[Dict]) -> Dict:
+        """
+        合并各块的提取结果（不再调用 LLM）
+        
+        - 技能按原文顺序拼接，按词表规范名称去重
+        - 工作年限取最大值（每块只看到部分经历）
+        - 学历取最高的一项
+        - 其余字段取第一个非空值（块按原文顺序，简历头部的联系方式在前）
+        
+        Args:
+            chunk_fields: 各块 validate_fields 的结果，按原文顺序；超时的块可为空字典
+        
+        Returns:
+            与 validate_fields 相同结构的字典
+        """
+        fields = {}
+        for field in BASE_INFO_FIELDS + ('job_intention', 'summary'):
+            fields[field] = next(
+                (chunk[field] for chunk in chunk_fields if chunk.get(field) is not None), None
+            )
+        
+        years = [chunk['work_experience_years'] for chunk in chunk_fields
+                 if chunk.get('work_experience_years') is not None]
+        fields['work_experience_years'] = max(years) if years else None
+        
+        def degree_rank(education):
+            for rank, degree in enumerate(DEGREE_RANKING):
+                if degree in education:
+                    return rank
+            return len(DEGREE_RANKING)
+        
+        # 学历相同时 min 保留第一个
+        educations = [chunk['education_background'] for chunk in chunk_fields
+                      if chunk.get('education_background') is not None]
+        fields['education_background'] = min(educations, key=degree_rank) if educations else None
+        
+        skills = {}
+        for chunk in chunk_fields:
+            for skill in chunk.get('skills') or []:
+                canonical = SKILL_TAXONOMY.canonical(skill)
+                skills.setdefault(canonical.lower(), canonical)
+        fields['skills'] = list(skills.values()) or None
+        
+        return fields
+    
+    @staticmethod
+    def extract_chunked_with_llm(resume_text: Union[str, ResumeDocument]) -> Dict:
+        """
+        分块提取：按分段切分为不超过 token 预算的块，各块并发调用 LLM 后合并
+        
+        Args:
+            resume_text: 简历文本或 ResumeDocument
+        
+        Returns:
+            与 validate_fields 相同结构的字典
+        """
+        chunks = TextChunker.split(resume_text)
+        if not chunks:
+            return LLMExtractor.validate_fields(None)
+        
+        with ThreadPoolExecutor(max_workers=min(len(chunks), LLM_MAX_CONCURRENCY)) as executor:
+            futures = [
+                submit_with_context(executor, LLMExtractor.extract_combined_with_llm, chunk, None)
+                for chunk in chunks
+            ]
+            chunk_fields = [future.result() for future in futures]
+        return LLMExtractor.merge_chunk_fields(chunk_fields)
+    
+    @staticmethod
+    def _parse_batch_response(result_text: Optional[str], count: int) -> Dict[int, Dict]:
+        """
+        解析批量提取返回的 JSON 数组
+        
+        Returns:
+            简历 id → validate_fields 结果；缺失、id 无效或格式错误的条目不包含在内
+        """
+        if not result_text:
+            return {}
+        try:
+            json_match = re.search(r'\[.*\]', result_text, re.DOTALL)
+            items = json.loads(json_match.group()) if json_match else None
+        except json.JSONDecodeError:
+            return {}
+        if not isinstance(items, list):
+            return {}
+        
+        parsed = {}
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            try:
+                item_id = int(item.get('id'))
+            except (TypeError, ValueError):
+                continue
+            if 0 <= item_id < count and item_id not in parsed:
+                parsed[item_id] = LLMExtractor.validate_fields(item)
+        return parsed
+    
+    @staticmethod
+    def extract_batch_with_llm(resume_texts: List[Union[str, ResumeDocument]]) -> List[Dict]:
+        """
+        一次 LLM 调用提取多份简历的全部字段
+        
+        每份简历在提示词中带有编号，返回的 JSON 数组按编号对应回各简历；
+        响应中缺失或格式错误的简历单独调用 extract_combined_with_llm 重试。
+        
+        Args:
+            resume_texts: 简历文本或 ResumeDocument 列表
+        
+        Returns:
+            与输入顺序一致的 validate_fields 结果列表
+        """
+        texts = [ResumeDocument.of(resume_text).text for resume_text in resume_texts]
+        if not texts:
+            return []
+        if len(texts) == 1:
+            return [LLMExtractor.extract_combined_with_llm(texts[0])]
+        
+        resumes = '\n\n'.join(
+            f"=== 简历 id={index} ===\n{text[:2000]}" for index, text in enumerate(texts)
+        )
+        prompt = f"""以下是 {len(texts)} 份简历，每份以 "=== 简历 id=编号 ===" 开头。请分别提取每份简历的信息（如果找不到某项信息，值设为null）：
+- id: 简历编号（与开头的编号一致）
+- name: 姓名
+- phone: 电话号码（仅返回数字和-）
+- email: 邮箱地址
+- address: 地址
+- job_intention: 求职意向（职位名称）
+- work_experience_years: 工作年限（返回数字）
+- education_background: 学历背景（如：本科、硕士等）
+- skills: 技能和专业技术栈（编程语言、框架、工具等）的数组
+- summary: 简洁的简历摘要（不超过100字），总结候选人的主要资质和特点
+
+{resumes}
+
+以JSON数组返回，每份简历一个元素（仅返回JSON数组，不要其他文本）：
+[{{"id": 0, "name": "...", "phone": "...", "email": "...", "address": "...", "job_intention": "...", "work_experience_years": ..., "education_background": "...", "skills": ["技能1", "技能2"], "summary": "..."}}]"""
+        
+        max_tokens = min(6000, 500 * len(texts))
+        result_text = LLMExtractor.call_qwen_api(prompt, max_tokens=max_tokens)
+        parsed = LLMExtractor._parse_batch_response(result_text, len(texts))
+        
+        missing = [index for index in range(len(texts)) if index not in parsed]
+        if not missing:
+            LLMExtractor.cache_response(prompt, result_text, max_tokens=max_tokens)
+        else:
+            print(f"[LLMExtractor] 批量提取中 {len(missing)}/{len(texts)} 份简历缺失或格式错误，单独重试")
+            with ThreadPoolExecutor(max_workers=min(len(missing), LLM_MAX_CONCURRENCY)) as executor:
+                futures = [
+                    submit_with_context(executor, LLMExtractor.extract_combined_with_llm, texts[index])
+                    for index in missing
+                ]
+                parsed.update(zip(missing, (future.result() for future in futures)))
+        
+        return [parsed[index] for index in range(len(texts))]
+    
+    @staticmethod
+    def extract_all_info(resume_text: Union[str, ResumeDocument]) -> Dict:
         """
         使用 LLM 提取所有信息
         
@@ -240,13 +613,43 @@ class LLMExtractor:
         Returns:
             包含所有信息的字典
         """
-        # 清洗文本
-        cleaned_text = clean_text(resume_text)
+        # 清洗文本并构建文档模型
+        if isinstance(resume_text, ResumeDocument):
+            document = resume_text
+        else:
+            document = ResumeDocument(clean_text(resume_text))
+        
+        if LLM_EXTRACTION_MODE in ('combined', 'chunked', 'batched'):
+            if LLM_EXTRACTION_MODE == 'chunked':
+                fields = LLMExtractor.extract_chunked_with_llm(document)
+            elif LLM_EXTRACTION_MODE == 'batched':
+                fields = LLM_BATCHER.submit(document).result()
+            else:
+                fields = LLMExtractor.extract_combined_with_llm(document)
+            base_info = {field: fields[field] for field in BASE_INFO_FIELDS}
+            # 与分开提取时一致：电话和邮箱缺失时使用正则补全
+            missing = [field for field in ('phone', 'email') if not base_info[field]]
+            if missing:
+                base_info.update(ContactScanner.extract(document, fields=missing, phone_labels=False))
+            return {
+                'base_info': base_info,
+                'optional_info': {field: fields[field] for field in OPTIONAL_INFO_FIELDS},
+                'skills': fields['skills'] or [],
+                'keywords': extract_keywords(document.text),
+                'summary': fields['summary']
+            }
         
         return {
-            'base_info': LLMExtractor.extract_base_info_with_llm(cleaned_text),
-            'optional_info': LLMExtractor.extract_optional_info_with_llm(cleaned_text),
-            'skills': LLMExtractor.extract_skills_with_llm(cleaned_text),
-            'keywords': extract_keywords(cleaned_text),
-            'summary': LLMExtractor.generate_summary_with_llm(cleaned_text)
+            'base_info': LLMExtractor.extract_base_info_with_llm(document),
+            'optional_info': LLMExtractor.extract_optional_info_with_llm(document),
+            'skills': LLMExtractor.extract_skills_with_llm(document),
+            'keywords': extract_keywords(document.text),
+            'summary': LLMExtractor.generate_summary_with_llm(document)
         }
+
+
+# 共享客户端：所有线程复用同一个连接池
+LLM_CLIENT = LLMClient(LLMExtractor.API_URL, LLMExtractor.API_KEY, LLMExtractor.MODEL)
+
+# 共享微批处理器：batched 模式下并发到达的简历合并为一次调用
+LLM_BATCHER = MicroBatcher(LLMExtractor.extract_batch_with_llm, name='llm-batch')
@@ -0,0 +1,79 @@
+"""
+批量信息提取模块 - 输入去重后在线程池中并发提取，按完成顺序产出结果
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List
+
+from config import BATCH_EXTRACT_MAX_WORKERS
+from services.ai_hybrid_extractor import HybridExtractor
+from services.rate_limiter import PRIORITY_BATCH, llm_priority, submit_with_context
+from utils.text_cleaner import clean_many
+
+
+class BatchExtractor:
+    """批量简历文本提取器"""
+
+    @staticmethod
+    def group_duplicates(texts: List[str]) -> Dict[str, List[int]]:
+        """
+        按清洗后的文本分组，内容相同（仅空白或特殊字符不同）的输入只提取一次
+
+        Returns:
+            清洗后文本 → 输入下标列表，按首次出现的顺序排列
+        """
+        groups = {}
+        for index, cleaned in enumerate(clean_many(texts)):
+            groups.setdefault(cleaned, []).append(index)
+        return groups
+
+    @staticmethod
+    def iter_results(texts: List[str], max_workers: int = BATCH_EXTRACT_MAX_WORKERS) -> Iterator[Dict]:
+        """
+        并发提取一批简历文本
+
+        提取耗时主要在 LLM 请求上（网络 I/O），线程池使多份简历的请求重叠进行；
+        正则回退部分耗时很短，不单独使用进程池。
+
+        Args:
+            texts: 简历文本列表
+            max_workers: 线程数
+
+        Yields:
+            每个输入一条结果 {'index', 'success', 'data', 'error'}，按完成顺序产出；
+            最后产出一条 {'summary': {...}} 统计信息
+        """
+        start_time = time.time()
+        groups = BatchExtractor.group_duplicates(texts)
+        failed = 0
+
+        executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+        try:
+            # 批量任务的 LLM 调用排在交互请求之后
+            with llm_priority(PRIORITY_BATCH):
+                futures = {
+                    submit_with_context(executor, HybridExtractor.extract_all_info, cleaned): indices
+                    for cleaned, indices in groups.items()
+                }
+            for future in as_completed(futures):
+                indices = futures[future]
+                try:
+                    result = {'success': True, 'data': future.result(), 'error': None}
+                except Exception as e:
+                    result = {'success': False, 'data': None, 'error': str(e)}
+                    failed += len(indices)
+
+                for index in indices:
+                    yield {'index': index, **result}
+        finally:
+            # 客户端提前断开时取消尚未开始的任务
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        yield {
+            'summary': {
+                'total': len(texts),
+                'unique': len(groups),
+                'failed': failed,
+                'elapsed_ms': round((time.time() - start_time) * 1000, 1)
+            }
+        }
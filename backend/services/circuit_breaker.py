@@ -0,0 +1,194 @@
+"""
+熔断器模块 - 按滑动窗口内的错误率和 p95 延迟熔断 LLM 调用，熔断期间直接走正则提取
+"""
+import threading
+import time
+from collections import deque
+from typing import Dict
+
+from config import (
+    LLM_BREAKER_ENABLED, LLM_BREAKER_WINDOW_SECONDS, LLM_BREAKER_MIN_CALLS,
+    LLM_BREAKER_ERROR_RATE, LLM_BREAKER_P95_MS, LLM_BREAKER_OPEN_SECONDS,
+    LLM_BREAKER_HALF_OPEN_PROBES
+)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+def _p95(values):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+
+
+class CircuitBreaker:
+    """
+    三态熔断器
+
+    closed：正常放行，记录每次调用的结果和耗时；窗口内调用数达到下限后，
+            错误率或 p95 延迟超过阈值即熔断
+    open：拒绝调用，冷却时间结束后转为 half_open
+    half_open：只放行少量探测调用，全部成功则恢复，任意一次失败重新熔断
+    """
+
+    def __init__(self, name: str,
+                 window_seconds: float = LLM_BREAKER_WINDOW_SECONDS,
+                 min_calls: int = LLM_BREAKER_MIN_CALLS,
+                 error_rate: float = LLM_BREAKER_ERROR_RATE,
+                 p95_ms: float = LLM_BREAKER_P95_MS,
+                 open_seconds: float = LLM_BREAKER_OPEN_SECONDS,
+                 half_open_probes: int = LLM_BREAKER_HALF_OPEN_PROBES):
+        """
+        Args:
+            name: 名称（用于日志）
+            window_seconds: 滑动窗口长度（秒）
+            min_calls: 窗口内至少多少次调用才评估是否熔断
+            error_rate: 错误率阈值（0~1）
+            p95_ms: p95 延迟阈值（毫秒），0 表示不按延迟熔断；探测调用超过该值也视为失败
+            open_seconds: 熔断后等待多久开始探测（秒）
+            half_open_probes: 半开状态下放行的探测次数，全部成功才恢复
+        """
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = max(1, min_calls)
+        self.error_rate = error_rate
+        self.p95_ms = p95_ms
+        self.open_seconds = open_seconds
+        self.half_open_probes = max(1, half_open_probes)
+
+        self._lock = threading.Lock()
+        self._calls = deque()  # (完成时间, 是否成功, 耗时毫秒)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes_started = 0
+        self._probes_succeeded = 0
+        self._totals = {'trips': 0, 'rejected': 0}
+        self._last_trip_reason = None
+
+    def _prune(self, now: float):
+        cutoff = now - self.window_seconds
+        while self._calls and self._calls[0][0] < cutoff:
+            self._calls.popleft()
+
+    def _refresh(self, now: float):
+        """冷却时间结束后由 open 转为 half_open（调用方持有锁）"""
+        if self._state == OPEN and now - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes_started = 0
+            self._probes_succeeded = 0
+            print(f"[CircuitBreaker] {self.name} 进入半开状态，开始探测")
+
+    def _trip(self, now: float, reason: str):
+        self._state = OPEN
+        self._opened_at = now
+        self._calls.clear()
+        self._totals['trips'] += 1
+        self._last_trip_reason = reason
+        print(f"[CircuitBreaker] {self.name} 熔断 {self.open_seconds} 秒: {reason}")
+
+    def is_open(self) -> bool:
+        """
+        是否处于熔断状态（冷却时间内）；不占用探测名额，供调用方提前选择备选方案
+        """
+        with self._lock:
+            self._refresh(time.monotonic())
+            return self._state == OPEN
+
+    def allow_request(self) -> bool:
+        """
+        调用前检查是否放行；半开状态下放行即占用一个探测名额
+        """
+        with self._lock:
+            self._refresh(time.monotonic())
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._probes_started < self.half_open_probes:
+                self._probes_started += 1
+                return True
+            self._totals['rejected'] += 1
+            return False
+
+    def cancel_request(self):
+        """
+        已放行的调用最终没有发出（如限流排队超时）时调用，归还半开状态占用的探测名额
+        """
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes_started > 0:
+                self._probes_started -= 1
+
+    def record(self, ok: bool, latency_ms: float):
+        """
+        记录一次已放行调用的结果
+
+        Args:
+            ok: 是否成功
+            latency_ms: 耗时（毫秒）
+        """
+        now = time.monotonic()
+        slow = self.p95_ms > 0 and latency_ms > self.p95_ms
+        with self._lock:
+            if self._state == HALF_OPEN:
+                if not ok or slow:
+                    reason = '探测失败' if not ok else f'探测耗时 {latency_ms:.0f}ms'
+                    self._trip(now, reason)
+                    return
+                self._probes_succeeded += 1
+                if self._probes_succeeded >= self.half_open_probes:
+                    self._state = CLOSED
+                    self._calls.clear()
+                    print(f"[CircuitBreaker] {self.name} 探测成功，恢复调用")
+                return
+
+            if self._state == OPEN:
+                # 熔断前已发出的调用，结果不再计入窗口
+                return
+
+            self._calls.append((now, ok, latency_ms))
+            self._prune(now)
+            if len(self._calls) < self.min_calls:
+                return
+
+            errors = sum(1 for _, call_ok, _ in self._calls if not call_ok)
+            rate = errors / len(self._calls)
+            if rate >= self.error_rate:
+                self._trip(now, f'错误率 {rate:.0%}（{errors}/{len(self._calls)}）')
+                return
+            if self.p95_ms > 0:
+                p95 = _p95([latency for _, _, latency in self._calls])
+                if p95 > self.p95_ms:
+                    self._trip(now, f'p95 延迟 {p95:.0f}ms')
+
+    def get_state(self) -> Dict:
+        """
+        当前状态和窗口统计
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._refresh(now)
+            self._prune(now)
+            calls = list(self._calls)
+            state = {
+                'state': self._state,
+                'trips': self._totals['trips'],
+                'rejected': self._totals['rejected'],
+                'last_trip_reason': self._last_trip_reason,
+                'retry_in_seconds': (
+                    round(max(0.0, self.open_seconds - (now - self._opened_at)), 1)
+                    if self._state == OPEN else None
+                )
+            }
+
+        errors = sum(1 for _, ok, _ in calls if not ok)
+        state['window'] = {
+            'calls': len(calls),
+            'error_rate': round(errors / len(calls), 4) if calls else None,
+            'latency_ms_p95': _p95([latency for _, _, latency in calls])
+        }
+        return state
+
+
+# LLM 调用共享的熔断器，未启用时为 None
+LLM_BREAKER = CircuitBreaker('LLM') if LLM_BREAKER_ENABLED else None
@@ -0,0 +1,105 @@
+"""
+联系方式扫描模块 - 预编译的电话、邮箱、姓名和地址模式，按字段优先级查找，命中即停
+"""
+import re
+from typing import Dict, Iterable, Optional
+
+from services.resume_document import ResumeDocument
+from utils.text_cleaner import normalize_phone, normalize_email
+
+PHONE_PATTERN = re.compile(r'1[3-9]\d{9}|0\d{2,3}\d{7,8}')
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+
+# 同一字段内按优先级排列，取第一个命中（且通过校验）的模式
+PHONE_LABEL_PATTERNS = [
+    re.compile(r'电话[：:]\s*([0-9\-\s]+)', re.IGNORECASE),
+    re.compile(r'tel[：:]\s*([0-9\-\s]+)', re.IGNORECASE),
+    re.compile(r'phone[：:]\s*([0-9\-\s]+)', re.IGNORECASE),
+]
+NAME_PATTERNS = [
+    re.compile(r'姓名[：:]\s*([^\s\n，,]+)', re.IGNORECASE),
+    re.compile(r'name[：:]\s*([^\s\n]+)', re.IGNORECASE),
+    re.compile(r'^([^\s\n，,]+)\s*[\u4e00-\u9fa5]', re.IGNORECASE),  # 开头为名字
+]
+ADDRESS_PATTERNS = [
+    re.compile(r'地址[：:]\s*([^\n]+)', re.IGNORECASE),
+    re.compile(r'address[：:]\s*([^\n]+)', re.IGNORECASE),
+    re.compile(r'现住地[：:]\s*([^\n]+)', re.IGNORECASE),
+]
+
+BASE_INFO_FIELDS = ('name', 'phone', 'email', 'address')
+
+
+def _search(text: str, contact_ranges, pattern: re.Pattern) -> Optional[re.Match]:
+    """
+    先在 contact 分段中查找，均未命中时再查全文（与 ResumeDocument.search 一致）
+    """
+    for start, end in contact_ranges:
+        match = pattern.search(text, start, end)
+        if match:
+            return match
+    return pattern.search(text)
+
+
+def _is_valid_name(name: str) -> bool:
+    return 2 <= len(name) <= 20 and not name.isdigit()
+
+
+class ContactScanner:
+    """基本信息（姓名、电话、邮箱、地址）的正则提取器，三个提取器共用"""
+
+    @staticmethod
+    def extract(resume_text, fields: Iterable[str] = BASE_INFO_FIELDS,
+                phone_labels: bool = True) -> Dict:
+        """
+        提取基本信息，优先在 contact 分段中查找
+
+        每个字段找到第一个有效候选后即停止，低优先级模式不会被执行。
+
+        Args:
+            resume_text: 简历文本或 ResumeDocument
+            fields: 需要提取的字段
+            phone_labels: 未找到手机/固话号码时，是否使用"电话：""tel:""phone:"标签后的号码
+
+        Returns:
+            字段 → 值的字典，未找到的字段为 None
+        """
+        document = ResumeDocument.of(resume_text)
+        text = document.text
+        contact_ranges = document.sections.get('contact', [])
+        result = {field: None for field in fields}
+
+        if 'phone' in result:
+            match = _search(text, contact_ranges, PHONE_PATTERN)
+            if match:
+                result['phone'] = normalize_phone(match.group())
+            elif phone_labels:
+                for pattern in PHONE_LABEL_PATTERNS:
+                    match = _search(text, contact_ranges, pattern)
+                    if match:
+                        result['phone'] = normalize_phone(match.group(1))
+                        break
+
+        if 'email' in result:
+            match = _search(text, contact_ranges, EMAIL_PATTERN)
+            if match:
+                result['email'] = normalize_email(match.group())
+
+        if 'name' in result:
+            for pattern in NAME_PATTERNS:
+                match = _search(text, contact_ranges, pattern)
+                if match:
+                    potential_name = match.group(1).strip()
+                    # 验证名字长度
+                    if _is_valid_name(potential_name):
+                        result['name'] = potential_name
+                        break
+
+        if 'address' in result:
+            for pattern in ADDRESS_PATTERNS:
+                match = _search(text, contact_ranges, pattern)
+                if match:
+                    result['address'] = match.group(1).strip()
+                    break
+
+        return result
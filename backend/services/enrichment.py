@@ -0,0 +1,102 @@
+"""
+后台补全模块 - 上传接口先返回正则结果，LLM 提取在后台线程中完成后更新记录
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from config import ENRICHMENT_MAX_WORKERS
+
+PENDING = 'pending'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class EnrichmentQueue:
+    """
+    后台补全任务队列
+
+    每个简历 ID 维护一个版本号，任务完成后递增并唤醒等待者，
+    供轮询接口和 SSE 推送判断记录是否已更新。
+    """
+
+    def __init__(self, max_workers: int = ENRICHMENT_MAX_WORKERS):
+        """
+        Args:
+            max_workers: 同时执行的补全任务数
+        """
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='enrich')
+        self._condition = threading.Condition()
+        self._versions = {}
+        self._running = set()
+        self._stats = {'submitted': 0, 'done': 0, 'failed': 0}
+
+    def submit(self, resume_id: str, task: Callable[[], Any],
+               on_done: Callable[[Optional[Any], Optional[Exception]], None]) -> bool:
+        """
+        提交补全任务
+
+        Args:
+            resume_id: 简历 ID
+            task: 无参数的提取函数
+            on_done: 完成回调 (结果, 异常)，在后台线程中调用，负责更新记录
+
+        Returns:
+            False 表示该简历已有进行中的任务，未重复提交
+        """
+        with self._condition:
+            if resume_id in self._running:
+                return False
+            self._running.add(resume_id)
+            self._stats['submitted'] += 1
+        self._executor.submit(self._run, resume_id, task, on_done)
+        return True
+
+    def _run(self, resume_id, task, on_done):
+        result, error = None, None
+        try:
+            result = task()
+        except Exception as e:
+            error = e
+            print(f"[Enrichment] {resume_id} 后台提取失败: {e}")
+
+        try:
+            on_done(result, error)
+        except Exception as e:
+            error = error or e
+            print(f"[Enrichment] {resume_id} 更新记录失败: {e}")
+
+        with self._condition:
+            self._running.discard(resume_id)
+            self._versions[resume_id] = self._versions.get(resume_id, 0) + 1
+            self._stats['failed' if error else 'done'] += 1
+            self._condition.notify_all()
+
+    def version(self, resume_id: str) -> int:
+        """简历记录的当前版本号"""
+        with self._condition:
+            return self._versions.get(resume_id, 0)
+
+    def wait_for_update(self, resume_id: str, version: int, timeout: float) -> int:
+        """
+        等待简历记录的版本号超过 version，或超时
+
+        Returns:
+            当前版本号
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._versions.get(resume_id, 0) > version, timeout)
+            return self._versions.get(resume_id, 0)
+
+    def get_stats(self) -> Dict:
+        """
+        任务统计
+        """
+        with self._condition:
+            stats = dict(self._stats)
+            stats['running'] = len(self._running)
+        return stats
+
+
+# 共享实例
+ENRICHMENT_QUEUE = EnrichmentQueue()
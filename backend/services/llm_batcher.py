@@ -0,0 +1,116 @@
+"""
+微批处理模块 - 收集几毫秒内并发提交的请求，合并为一批交给批处理函数
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List
+
+from config import LLM_BATCH_SIZE, LLM_BATCH_WAIT_MS, LLM_MAX_CONCURRENCY
+from services.rate_limiter import PriorityExecutor, current_priority, llm_priority
+
+
+class MicroBatcher:
+    """
+    微批处理器
+
+    后台线程取到第一个请求后最多再等待 max_wait_ms，期间到达的请求（不超过 max_batch_size 个）
+    组成一批，在线程池中调用批处理函数；等待期间不会阻塞已组好的批次。
+    """
+
+    def __init__(self, handler: Callable[[List[Any]], List[Any]],
+                 max_batch_size: int = LLM_BATCH_SIZE,
+                 max_wait_ms: float = LLM_BATCH_WAIT_MS,
+                 max_workers: int = LLM_MAX_CONCURRENCY,
+                 name: str = 'batcher'):
+        """
+        Args:
+            handler: 批处理函数，接收请求列表，返回等长、顺序一致的结果列表
+            max_batch_size: 每批最多的请求数
+            max_wait_ms: 取到第一个请求后最多等待的时间（毫秒）
+            max_workers: 每类优先级（交互 / 批量）同时执行的批次数
+            name: 线程名前缀
+        """
+        self.handler = handler
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.name = name
+
+        self._queue = queue.Queue()
+        self._executor = PriorityExecutor(max_workers, thread_name_prefix=name)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stats = {'submitted': 0, 'batches': 0, 'batched_items': 0, 'failed_batches': 0}
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._collect, name=f'{self.name}-collector', daemon=True)
+                self._thread.start()
+
+    def submit(self, item: Any) -> Future:
+        """
+        提交一个请求
+
+        Returns:
+            Future，结果为批处理函数对该请求的返回值
+        """
+        future = Future()
+        with self._lock:
+            self._stats['submitted'] += 1
+        self._queue.put((item, future, current_priority()))
+        self._ensure_started()
+        return future
+
+    def _collect(self):
+        while True:
+            batch = [self._queue.get()]
+            expires_at = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = expires_at - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0
+                                 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            # 含交互请求的批次不排在批量任务的批次之后
+            self._executor.submit(self._dispatch, batch, priority=min(priority for _, _, priority in batch))
+
+    def _dispatch(self, batch):
+        # 调用方已取消（如超过截止时间）的请求不再处理
+        batch = [entry for entry in batch if entry[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        with self._lock:
+            self._stats['batches'] += 1
+            self._stats['batched_items'] += len(batch)
+
+        try:
+            # 批中包含交互请求时按交互优先级调用
+            with llm_priority(min(priority for _, _, priority in batch)):
+                results = self.handler([item for item, _, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(f'批处理返回 {len(results)} 个结果，应为 {len(batch)} 个')
+        except Exception as e:
+            with self._lock:
+                self._stats['failed_batches'] += 1
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            future.set_result(result)
+
+    def get_stats(self) -> Dict:
+        """
+        批处理统计：提交数、批次数和平均批大小
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats['avg_batch_size'] = (
+            round(stats['batched_items'] / stats['batches'], 2) if stats['batches'] else None
+        )
+        stats['queued'] = self._queue.qsize()
+        return stats
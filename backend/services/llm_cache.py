@@ -0,0 +1,191 @@
+"""
+LLM 响应缓存模块 - 以 (模型, 提示词, 参数) 的哈希为键，持久化在本地 SQLite 中
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from config import LLM_CACHE_ENABLED, LLM_CACHE_PATH, LLM_CACHE_TTL_HOURS, LLM_CACHE_MAX_ENTRIES
+
+# 超出容量时一次淘汰到容量的这个比例，避免每次写入都触发淘汰
+EVICT_TO_RATIO = 0.9
+
+
+class LLMResponseCache:
+    """
+    持久化的 LLM 响应缓存
+
+    进程重启或冷启动后仍可命中；过期条目在读取时删除，
+    条目数超过上限时按最近访问时间淘汰（LRU）。
+
+    SQLite 连接不能跨 fork 使用（如 ingest.py 的进程池），每个进程在首次访问时各自打开连接；
+    多个进程共用同一个文件，条目数以数据库中的实际行数为准。
+    """
+
+    def __init__(self, path: str, ttl_hours: float = LLM_CACHE_TTL_HOURS,
+                 max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        """
+        Args:
+            path: SQLite 文件路径
+            ttl_hours: 条目有效期（小时）
+            max_entries: 最大条目数
+        """
+        self.path = path
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'writes': 0, 'expired': 0, 'evictions': 0}
+        self._conn = None
+        self._pid = None
+        # fork 时从父进程继承的连接：保留引用但不再使用，避免子进程关闭父进程仍在使用的连接
+        self._inherited = []
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        # 建表使用临时连接，初始化失败（如只读文件系统）时由 _create_cache 禁用缓存
+        conn = sqlite3.connect(path, isolation_level=None)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS llm_cache ('
+                ' key TEXT PRIMARY KEY,'
+                ' model TEXT,'
+                ' response TEXT NOT NULL,'
+                ' created_at REAL NOT NULL,'
+                ' last_access REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_llm_cache_access ON llm_cache (last_access)')
+        finally:
+            conn.close()
+
+        if hasattr(os, 'register_at_fork'):
+            # 父进程中其他线程可能正持有锁，子进程使用新锁
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        当前进程的连接，首次使用或 fork 后重新打开（调用方持有锁）
+        """
+        pid = os.getpid()
+        if self._conn is None or self._pid != pid:
+            if self._conn is not None:
+                self._inherited.append(self._conn)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._pid = pid
+        return self._conn
+
+    def _count(self) -> int:
+        return self._connection().execute('SELECT COUNT(*) FROM llm_cache').fetchone()[0]
+
+    @staticmethod
+    def make_key(model: str, prompt: str, params: Optional[Dict] = None) -> str:
+        """
+        生成缓存键：模型、提示词和生成参数的 SHA-256
+        """
+        data = json.dumps(
+            {'model': model, 'prompt': prompt, 'params': params or {}},
+            sort_keys=True, ensure_ascii=False
+        )
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        读取缓存，未命中或已过期返回 None
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                'SELECT response, created_at FROM llm_cache WHERE key = ?', (key,)
+            ).fetchone()
+
+            if row is None:
+                self._stats['misses'] += 1
+                return None
+
+            response, created_at = row
+            if now - created_at >= self.ttl_seconds:
+                conn.execute('DELETE FROM llm_cache WHERE key = ?', (key,))
+                self._stats['expired'] += 1
+                self._stats['misses'] += 1
+                return None
+
+            conn.execute('UPDATE llm_cache SET last_access = ? WHERE key = ?', (now, key))
+            self._stats['hits'] += 1
+            return response
+
+    def set(self, key: str, response: str, model: Optional[str] = None):
+        """
+        写入缓存，超出容量时淘汰最久未访问的条目
+        """
+        now = time.time()
+        with self._lock:
+            self._connection().execute(
+                'INSERT OR REPLACE INTO llm_cache (key, model, response, created_at, last_access) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (key, model, response, now, now)
+            )
+            self._stats['writes'] += 1
+
+            # 其他进程也在写入同一文件，按实际行数判断是否超出容量
+            if self._count() > self.max_entries:
+                self._evict()
+
+    def _evict(self):
+        """
+        先删除过期条目，仍超出容量时按 last_access 淘汰（调用方持有锁）
+        """
+        conn = self._connection()
+        cutoff = time.time() - self.ttl_seconds
+        expired = conn.execute('DELETE FROM llm_cache WHERE created_at <= ?', (cutoff,)).rowcount
+        self._stats['expired'] += expired
+
+        size = self._count()
+        target = int(self.max_entries * EVICT_TO_RATIO)
+        if size > target:
+            evicted = conn.execute(
+                'DELETE FROM llm_cache WHERE key IN '
+                '(SELECT key FROM llm_cache ORDER BY last_access ASC LIMIT ?)',
+                (size - target,)
+            ).rowcount
+            self._stats['evictions'] += evicted
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._connection().execute('DELETE FROM llm_cache')
+
+    def get_stats(self) -> Dict:
+        """
+        命中统计
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = self._count()
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else None
+        return stats
+
+
+def _create_cache() -> Optional[LLMResponseCache]:
+    if not LLM_CACHE_ENABLED:
+        return None
+    try:
+        return LLMResponseCache(LLM_CACHE_PATH)
+    except (OSError, sqlite3.Error) as e:
+        # 只读文件系统等情况下不使用缓存
+        print(f"LLM 响应缓存初始化失败，已禁用: {e}")
+        return None
+
+
+# 共享实例，未启用或初始化失败时为 None
+LLM_CACHE = _create_cache()
@@ -0,0 +1,313 @@
+"""
+LLM HTTP 客户端模块 - 复用连接池的会话、带抖动的指数退避重试和调用指标
+"""
+import json
+import random
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import (
+    LLM_POOL_SIZE, LLM_CONNECT_TIMEOUT, LLM_READ_TIMEOUT, LLM_MAX_RETRIES,
+    LLM_BACKOFF_BASE, LLM_BACKOFF_MAX
+)
+
+# 需要重试的 HTTP 状态码：限流和服务端临时错误
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# 保留最近多少次调用的指标
+METRICS_WINDOW = 1000
+
+
+class LLMStreamError(Exception):
+    """流式调用失败（未收到响应，或输出过程中中断）"""
+
+
+def _percentile(values, percent):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class LLMClient:
+    """
+    通义千问（DashScope）文本生成接口的客户端
+
+    所有线程共享一个 requests.Session，连接池中的 keep-alive 连接被复用，
+    避免每次调用都重新进行 TCP 和 TLS 握手。
+    """
+
+    def __init__(self, api_url: str, api_key: str, model: str,
+                 pool_size: int = LLM_POOL_SIZE,
+                 connect_timeout: float = LLM_CONNECT_TIMEOUT,
+                 read_timeout: float = LLM_READ_TIMEOUT,
+                 max_retries: int = LLM_MAX_RETRIES,
+                 backoff_base: float = LLM_BACKOFF_BASE,
+                 backoff_max: float = LLM_BACKOFF_MAX):
+        """
+        Args:
+            api_url: 接口地址（可指向本地桩服务器）
+            api_key: API Key
+            model: 模型名称
+            pool_size: 每个主机的最大连接数，应不小于并发调用数
+            connect_timeout / read_timeout: 建立连接和读取响应的超时（秒）
+            max_retries: 429、5xx 和网络错误的最大重试次数
+            backoff_base / backoff_max: 指数退避的初始值和上限（秒），同时限制 Retry-After
+        """
+        self.api_url = api_url
+        self.api_key = api_key
+        self.model = model
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.session = requests.Session()
+        # 重试由本类处理（需要读取 Retry-After 并记录指标），适配器自身不重试
+        self.adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size,
+                                   max_retries=0, pool_block=False)
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+
+        self._lock = threading.Lock()
+        self._calls = deque(maxlen=METRICS_WINDOW)
+        self._totals = {'calls': 0, 'succeeded': 0, 'failed': 0, 'retries': 0}
+
+    def _backoff_delay(self, attempt: int, response=None) -> float:
+        """
+        计算第 attempt 次重试前的等待时间：优先使用 Retry-After，否则为带完全抖动的指数退避
+        """
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                try:
+                    delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                except (TypeError, ValueError):
+                    delay = None
+            if delay is not None:
+                return min(max(0.0, delay), self.backoff_max)
+
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _record(self, started: float, retries: int, status, ok: bool, error: Optional[str]):
+        call = {
+            'latency_ms': round((time.perf_counter() - started) * 1000, 1),
+            'retries': retries,
+            'status': status,
+            'ok': ok,
+            'error': error
+        }
+        with self._lock:
+            self._calls.append(call)
+            self._totals['calls'] += 1
+            self._totals['succeeded' if ok else 'failed'] += 1
+            self._totals['retries'] += retries
+        return call
+
+    def _build_payload(self, prompt: str, max_tokens: int, temperature: float) -> Dict:
+        return {
+            "model": self.model,
+            "input": {
+                "messages": [
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ]
+            },
+            "parameters": {
+                "max_tokens": max_tokens,
+                "temperature": temperature
+            }
+        }
+
+    def _post(self, payload: Dict, extra_headers: Optional[Dict] = None, stream: bool = False):
+        """
+        发送请求，429、5xx 和网络错误时退避重试
+
+        Returns:
+            (最后一次的响应或 None, 重试次数, 错误信息)
+        """
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            **(extra_headers or {})
+        }
+
+        response = None
+        error = None
+        attempt = 0
+        while True:
+            response = None
+            try:
+                response = self.session.post(
+                    self.api_url, headers=headers, json=payload, timeout=self.timeout, stream=stream
+                )
+                if response.status_code not in RETRY_STATUS_CODES:
+                    break
+                error = f'HTTP {response.status_code}'
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                error = f'{type(e).__name__}: {str(e)[:200]}'
+            except requests.RequestException as e:
+                # URL 配置错误、重定向过多等重试也不会成功，直接返回失败
+                error = f'{type(e).__name__}: {str(e)[:200]}'
+                break
+
+            if attempt >= self.max_retries:
+                break
+            if response is not None:
+                # 流式请求未读取响应体，重试前释放连接以便复用
+                response.close()
+            delay = self._backoff_delay(attempt, response)
+            attempt += 1
+            print(f"[LLM API] {error}，{delay:.2f} 秒后第 {attempt} 次重试")
+            time.sleep(delay)
+
+        return response, attempt, error
+
+    def generate(self, prompt: str, max_tokens: int = 1000, temperature: float = 0.3) -> Optional[str]:
+        """
+        调用文本生成接口
+
+        Args:
+            prompt: 提示词
+            max_tokens: 最大生成长度
+            temperature: 采样温度
+
+        Returns:
+            生成的文本；重试耗尽或响应格式错误时返回 None
+        """
+        started = time.perf_counter()
+        response, attempt, error = self._post(self._build_payload(prompt, max_tokens, temperature))
+
+        status = response.status_code if response is not None else None
+        if status != 200:
+            if response is not None:
+                error = f'HTTP {status} - {response.text[:200]}'
+            self._record(started, attempt, status, False, error)
+            print(f"[LLM API] 调用失败: {error}")
+            return None
+
+        try:
+            content = response.json()["output"]["choices"][0]["message"]["content"]
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            self._record(started, attempt, status, False, f'响应格式错误: {e}')
+            print(f"[LLM API] 响应格式错误: {response.text[:200]}")
+            return None
+
+        call = self._record(started, attempt, status, True, None)
+        print(f"[LLM API] 成功获取响应（{call['latency_ms']}ms，重试 {attempt} 次）: {content[:100]}")
+        return content
+
+    @staticmethod
+    def _parse_stream_event(data: str) -> str:
+        """
+        解析一条增量输出事件，返回本次新增的文本
+        """
+        event = json.loads(data)
+        if event.get("code") and not event.get("output"):
+            # 输出过程中服务端返回的错误事件
+            raise ValueError(f'{event.get("code")}: {event.get("message")}')
+        output = event.get("output") or {}
+        choices = output.get("choices")
+        if choices:
+            return choices[0].get("message", {}).get("content") or ''
+        return output.get("text") or ''
+
+    def stream(self, prompt: str, max_tokens: int = 1000, temperature: float = 0.3) -> Iterator[str]:
+        """
+        以 SSE 增量输出方式调用文本生成接口，逐段产出生成的文本
+
+        只在收到响应前重试；开始产出后连接中断或响应格式错误时抛出 LLMStreamError，
+        调用方据此丢弃已产出的部分结果。
+
+        Args:
+            prompt: 提示词
+            max_tokens: 最大生成长度
+            temperature: 采样温度
+
+        Yields:
+            每次新增的文本片段
+        """
+        payload = self._build_payload(prompt, max_tokens, temperature)
+        payload["parameters"]["incremental_output"] = True
+        payload["parameters"]["result_format"] = "message"
+
+        started = time.perf_counter()
+        response, attempt, error = self._post(
+            payload, {"X-DashScope-SSE": "enable", "Accept": "text/event-stream"}, stream=True
+        )
+        if response is not None:
+            # text/event-stream 未声明 charset 时 requests 按 ISO-8859-1 解码，接口输出始终为 UTF-8
+            response.encoding = 'utf-8'
+
+        status = response.status_code if response is not None else None
+        if status != 200:
+            if response is not None:
+                error = f'HTTP {status} - {response.text[:200]}'
+            self._record(started, attempt, status, False, error)
+            print(f"[LLM API] 流式调用失败: {error}")
+            raise LLMStreamError(error)
+
+        chunks = 0
+        try:
+            for line in response.iter_lines(decode_unicode=True):
+                # SSE 格式：id:/event:/data: 行，事件之间以空行分隔；只关心 data 行
+                if not line or not line.startswith('data:'):
+                    continue
+                text = self._parse_stream_event(line[5:].strip())
+                if text:
+                    chunks += 1
+                    yield text
+        except (requests.RequestException, ValueError, AttributeError, IndexError) as e:
+            error = f'流式响应中断: {type(e).__name__}: {str(e)[:200]}'
+            self._record(started, attempt, status, False, error)
+            print(f"[LLM API] {error}")
+            raise LLMStreamError(error) from e
+        finally:
+            response.close()
+
+        call = self._record(started, attempt, status, True, None)
+        print(f"[LLM API] 流式响应完成（{call['latency_ms']}ms，{chunks} 段，重试 {attempt} 次）")
+
+    def connections_opened(self) -> int:
+        """
+        连接池累计新建的连接数（每个连接对应一次 TCP/TLS 握手）
+        """
+        pools = self.adapter.poolmanager.pools
+        return sum(pools[key].num_connections for key in pools.keys())
+
+    def get_metrics(self) -> Dict:
+        """
+        调用指标：累计次数、最近调用的延迟分位数、状态码分布和新建连接数
+        """
+        with self._lock:
+            calls = list(self._calls)
+            totals = dict(self._totals)
+
+        latencies = [call['latency_ms'] for call in calls]
+        status_counts = {}
+        for call in calls:
+            key = str(call['status']) if call['status'] is not None else 'network_error'
+            status_counts[key] = status_counts.get(key, 0) + 1
+
+        return {
+            **totals,
+            'connections_opened': self.connections_opened(),
+            'recent': {
+                'count': len(calls),
+                'latency_ms_avg': round(sum(latencies) / len(latencies), 1) if latencies else None,
+                'latency_ms_p50': _percentile(latencies, 50),
+                'latency_ms_p95': _percentile(latencies, 95),
+                'status_counts': status_counts
+            }
+        }
@@ -1,60 +1,306 @@
 """
 PDF 解析模块
 """
+import io
 import os
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
 import pdfplumber
-from utils.text_cleaner import clean_text, extract_segments
+from pdfminer.converter import PDFPageAggregator
+from pdfminer.layout import LTChar, LTContainer
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from config import (
+    MAX_FILE_SIZE, PDF_ENGINE, PDF_PARALLEL_WORKERS, PDF_PARALLEL_MIN_PAGES
+)
+from utils.text_cleaner import clean_text, extract_segments, join_clean
+
+# PDF 文件头魔数
+PDF_MAGIC = b'%PDF'
+
+# 流式读取的块大小
+READ_CHUNK_SIZE = 64 * 1024
+
+# 可选的解析引擎：accurate 为 pdfplumber 版面分析，fast 为 pdfminer 文本层直读
+ENGINES = ('accurate', 'fast')
+
+# fast 引擎输出中可识别字符占比低于该值时视为乱码
+MIN_READABLE_RATIO = 0.85
+
+
+def _open_pdf(source):
+    """
+    打开 PDF，source 可以是文件路径、字节串（bytes/bytearray/memoryview）或文件对象
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    return pdfplumber.open(source)
+
+
+def _looks_garbled(text):
+    """
+    判断 fast 引擎的输出是否为空或乱码（缺少 ToUnicode 映射时常见 (cid:N) 和替换字符）
+    """
+    if not text or not text.strip():
+        return True
+    if '(cid:' in text or '\ufffd' in text:
+        return True
+    
+    readable = sum(
+        1 for ch in text
+        if ch.isalnum() or ch.isspace() or ch in '-+()（）@.#_,:;，。：；、/'
+    )
+    return readable / len(text) < MIN_READABLE_RATIO
+
+
+class _PageTextExtractor:
+    """按引擎提取单页文本，fast 引擎输出异常时回退到 accurate"""
+    
+    def __init__(self, engine='accurate'):
+        if engine not in ENGINES:
+            raise ValueError(f'未知的 PDF 解析引擎: {engine}')
+        self.engine = engine
+        if engine == 'fast':
+            self.resource_manager = PDFResourceManager(caching=True)
+            self.device = PDFPageAggregator(self.resource_manager, laparams=None)
+            self.interpreter = PDFPageInterpreter(self.resource_manager, self.device)
+    
+    def _fast_text(self, page):
+        """
+        直接读取文本层字符，仅根据坐标补充换行和空格，跳过版面分析
+        """
+        self.interpreter.process_page(page.page_obj)
+        parts = []
+        self._collect_chars(self.device.get_result(), parts, None)
+        return ''.join(parts)
+    
+    def _collect_chars(self, items, parts, prev):
+        for item in items:
+            if isinstance(item, LTChar):
+                if prev is not None:
+                    if abs(item.y0 - prev.y0) > prev.height * 0.5:
+                        parts.append('\n')
+                    elif item.x0 - prev.x1 > prev.width * 0.3:
+                        parts.append(' ')
+                parts.append(item.get_text())
+                prev = item
+            elif isinstance(item, LTContainer):
+                prev = self._collect_chars(item, parts, prev)
+        return prev
+    
+    def extract(self, page):
+        """
+        提取并清理单页文本
+        
+        Returns:
+            (清理后的文本, 实际使用的引擎)
+        """
+        if self.engine == 'fast':
+            page_text = self._fast_text(page)
+            if not _looks_garbled(page_text):
+                return clean_text(page_text), 'fast'
+        
+        return clean_text(page.extract_text()), 'accurate'
+
+
+def _extract_page_range(source, start, end, engine='accurate'):
+    """
+    提取指定页码范围 [start, end) 内的页面文本（进程池任务）
+
+    Args:
+        source: PDF 文件路径或 PDF 字节串
+        start: 起始页索引（从 0 开始）
+        end: 结束页索引（不包含）
+        engine: 解析引擎
+
+    Returns:
+        页面列表，每项包含 page_num、清理后的 text 和实际使用的 engine
+    """
+    pages = []
+    extractor = _PageTextExtractor(engine)
+    with _open_pdf(source) as pdf:
+        for index in range(start, end):
+            page_text, used_engine = extractor.extract(pdf.pages[index])
+            pages.append({
+                'page_num': index + 1,
+                'text': page_text,
+                'engine': used_engine
+            })
+    return pages
 
 
 class PDFParser:
     """PDF 解析器"""
     
     @staticmethod
-    def extract_text(pdf_path):
+    def _resolve_workers(total_pages, max_workers=None):
         """
-        从 PDF 文件中提取文本
+        根据页数和配置计算实际使用的进程数，页数较少时返回 1（串行）
+        """
+        if max_workers is None:
+            max_workers = PDF_PARALLEL_WORKERS or os.cpu_count() or 1
+        
+        if max_workers <= 1 or total_pages < PDF_PARALLEL_MIN_PAGES:
+            return 1
+        
+        return min(max_workers, total_pages)
+    
+    @staticmethod
+    def _extract_pages_parallel(source, total_pages, workers, engine='accurate'):
+        """
+        将页码切分为连续区间，交给进程池并行提取，并按页码顺序拼回
+        """
+        # 内存中的 PDF 需转换为 bytes 才能传给子进程
+        if isinstance(source, (bytearray, memoryview)):
+            source = bytes(source)
+        elif hasattr(source, 'getvalue'):
+            source = source.getvalue()
+        
+        chunk_size = -(-total_pages // workers)  # 向上取整
+        ranges = [
+            (start, min(start + chunk_size, total_pages))
+            for start in range(0, total_pages, chunk_size)
+        ]
+        
+        with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+            futures = [
+                executor.submit(_extract_page_range, source, start, end, engine)
+                for start, end in ranges
+            ]
+            # 按提交顺序收集结果，保证页码顺序与串行一致
+            pages = []
+            for future in futures:
+                pages.extend(future.result())
+        
+        return pages
+    
+    @staticmethod
+    def _iter_open_pages(pdf, max_pages=None, max_chars=None, engine='accurate'):
+        """
+        在已打开的 PDF 上逐页提取并清理文本，达到预算后停止
+        """
+        total_chars = 0
+        extractor = _PageTextExtractor(engine)
+        
+        for page_num, page in enumerate(pdf.pages, 1):
+            if max_pages is not None and page_num > max_pages:
+                break
+            
+            # 提取页面文本并清理
+            cleaned_text, used_engine = extractor.extract(page)
+            
+            yield {
+                'page_num': page_num,
+                'text': cleaned_text,
+                'engine': used_engine
+            }
+            
+            total_chars += len(cleaned_text) + 1
+            if max_chars is not None and total_chars >= max_chars:
+                break
+    
+    @staticmethod
+    def iter_pages(source, max_pages=None, max_chars=None, engine=None):
+        """
+        逐页提取 PDF 文本的生成器，达到页数或字符预算后停止解析后续页面
         
         Args:
-            pdf_path: PDF 文件路径
+            source: PDF 文件路径、字节串或文件对象
+            max_pages: 最多解析的页数，None 表示不限制
+            max_chars: 累计字符数达到该值后停止，None 表示不限制
+            engine: 解析引擎（accurate / fast），None 表示使用 PDF_ENGINE 配置
+            
+        Yields:
+            页面字典，包含 page_num、清理后的 text 和实际使用的 engine
+        """
+        with _open_pdf(source) as pdf:
+            yield from PDFParser._iter_open_pages(
+                pdf, max_pages, max_chars, engine or PDF_ENGINE
+            )
+    
+    @staticmethod
+    def build_result(pages, total_pages, engine):
+        """
+        由逐页结果组装解析返回值
+        
+        raw_text 由已清洗的各页经 join_clean 拼接（CleanText，后续提取器不会再次清洗），
+        与 /api/extract 对同一文本整体清洗的结果一致；各页文本保留在 pages 中
+        """
+        return {
+            'success': True,
+            'data': {
+                'raw_text': join_clean(page['text'] for page in pages),
+                'pages': pages,
+                'total_pages': total_pages,
+                'truncated': len(pages) < total_pages,
+                'engine': engine
+            },
+            'error': None
+        }
+    
+    @staticmethod
+    def parse(source, max_workers=None, max_pages=None, max_chars=None, engine=None):
+        """
+        打开一次 PDF，完成校验（非空）并提取文本
+        
+        Args:
+            source: PDF 文件路径、字节串（bytes/bytearray/memoryview）
+                或文件对象（如 BytesIO）
+            max_workers: 并行提取的最大进程数，None 表示使用配置值，
+                1 表示强制串行；页数少于 PDF_PARALLEL_MIN_PAGES 时始终串行
+            max_pages: 最多解析的页数，None 表示解析全部页面
+            max_chars: 累计字符数达到该值后停止解析（仅串行模式），
+                None 表示不限制
+            engine: 解析引擎，accurate 为 pdfplumber 版面分析，fast 为文本层直读
+                （输出为空或乱码的页面自动回退到 accurate），None 表示使用 PDF_ENGINE 配置
             
         Returns:
-            提取的文本内容
+            提取的文本内容；设置了预算且提前停止时 truncated 为 True
         """
+        engine = engine or PDF_ENGINE
         try:
             text_content = {
-                'raw_text': '',
                 'pages': [],
                 'total_pages': 0
             }
             
-            with pdfplumber.open(pdf_path) as pdf:
+            with _open_pdf(source) as pdf:
                 text_content['total_pages'] = len(pdf.pages)
+                if text_content['total_pages'] == 0:
+                    return {
+                        'success': False,
+                        'data': None,
+                        'error': 'PDF 文件为空'
+                    }
+                
+                pages_to_parse = text_content['total_pages']
+                if max_pages is not None:
+                    pages_to_parse = min(pages_to_parse, max_pages)
                 
-                for page_num, page in enumerate(pdf.pages, 1):
-                    # 提取页面文本
-                    page_text = page.extract_text()
-                    
-                    # 清理文本
-                    cleaned_text = clean_text(page_text)
-                    
-                    text_content['pages'].append({
-                        'page_num': page_num,
-                        'text': cleaned_text
-                    })
-                    
-                    text_content['raw_text'] += cleaned_text + '\n'
+                # 字符预算需要逐页判断，只能串行
+                workers = 1 if max_chars is not None else PDFParser._resolve_workers(
+                    pages_to_parse, max_workers
+                )
+                
+                if workers <= 1:
+                    text_content['pages'] = list(
+                        PDFParser._iter_open_pages(pdf, max_pages, max_chars, engine)
+                    )
             
-            return {
-                'success': True,
-                'data': text_content,
-                'error': None
-            }
+            if workers > 1:
+                text_content['pages'] = PDFParser._extract_pages_parallel(
+                    source, pages_to_parse, workers, engine
+                )
+            
+            return PDFParser.build_result(
+                text_content['pages'], text_content['total_pages'], engine
+            )
         
         except FileNotFoundError:
             return {
                 'success': False,
                 'data': None,
-                'error': f'文件不存在: {pdf_path}'
+                'error': f'文件不存在: {source}'
             }
         except Exception as e:
             return {
@@ -63,6 +309,72 @@ class PDFParser:
                 'error': f'PDF 解析错误: {str(e)}'
             }
     
+    @staticmethod
+    def extract_text(pdf_path, max_workers=None, max_pages=None, max_chars=None,
+                     engine=None):
+        """
+        从 PDF 文件中提取文本
+        
+        Args:
+            pdf_path: PDF 文件路径
+            max_workers / max_pages / max_chars / engine: 同 parse
+            
+        Returns:
+            提取的文本内容
+        """
+        return PDFParser.parse(pdf_path, max_workers, max_pages, max_chars, engine)
+    
+    @staticmethod
+    def read_stream(stream, max_size=MAX_FILE_SIZE, content_length=None):
+        """
+        流式读取上传的 PDF 到内存，同时计算 SHA-256
+        
+        在缓冲整个文件之前先检查声明的长度和 %PDF 文件头，
+        读取过程中超过 max_size 立即停止。
+        
+        Args:
+            stream: 可读的二进制流（如 request.files['file'].stream）
+            max_size: 允许的最大字节数
+            content_length: 客户端声明的长度，可选
+            
+        Returns:
+            {'success', 'data': {'buffer', 'sha256', 'size'}, 'error'}
+        """
+        if content_length and content_length > max_size:
+            return {'success': False, 'data': None, 'error': '文件过大'}
+        
+        head = stream.read(len(PDF_MAGIC))
+        if not head:
+            return {'success': False, 'data': None, 'error': '文件为空'}
+        if head != PDF_MAGIC:
+            return {'success': False, 'data': None, 'error': '不是有效的 PDF 文件'}
+        
+        buffer = io.BytesIO()
+        sha256 = hashlib.sha256(head)
+        buffer.write(head)
+        size = len(head)
+        
+        while True:
+            chunk = stream.read(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_size:
+                return {'success': False, 'data': None, 'error': '文件过大'}
+            sha256.update(chunk)
+            buffer.write(chunk)
+        
+        buffer.seek(0)
+        return {
+            'success': True,
+            'data': {
+                'buffer': buffer,
+                'sha256': sha256.hexdigest(),
+                'size': size
+            },
+            'error': None
+        }
+    
     @staticmethod
     def validate_pdf(file_path):
         """
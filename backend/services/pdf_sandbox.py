@@ -0,0 +1,202 @@
+"""
+PDF 沙箱解析模块 - 在受监控的子进程中解析，限制 CPU、内存和时间
+"""
+import os
+import signal
+import multiprocessing
+
+try:
+    import resource
+except ImportError:  # Windows 不支持 resource 模块
+    resource = None
+
+from config import (
+    PDF_ENGINE, PDF_PARSE_TIMEOUT, PDF_PAGE_TIMEOUT, PDF_MAX_MEMORY_MB,
+    PDF_MAX_CPU_SECONDS
+)
+from services.pdf_parser import PDFParser, _open_pdf
+
+# 超出 RLIMIT_CPU 软/硬限制时子进程收到的信号
+CPU_LIMIT_SIGNALS = {
+    getattr(signal, name) for name in ('SIGXCPU', 'SIGKILL') if hasattr(signal, name)
+}
+
+
+class PageTimeoutError(Exception):
+    """单页解析超出时间预算"""
+
+
+def _raise_page_timeout(signum, frame):
+    raise PageTimeoutError()
+
+
+def _error_result(error_type, error):
+    """
+    构造结构化的失败结果
+    """
+    return {
+        'success': False,
+        'data': None,
+        'error': error,
+        'error_type': error_type
+    }
+
+
+def _current_address_space():
+    """
+    当前进程已占用的虚拟地址空间（字节），无法读取 /proc 时返回 0
+    """
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _apply_limits(max_memory_mb, max_cpu_seconds):
+    """
+    在子进程内设置地址空间和 CPU 时间上限
+
+    子进程从 Flask 进程 fork 而来，继承了父进程已占用的地址空间（各线程的栈、已加载的模块和缓存），
+    因此地址空间上限按子进程当前的占用加上 max_memory_mb 计算，解析可用的内存不随服务进程大小变化
+    """
+    if resource is None:
+        return
+
+    if max_memory_mb:
+        limit = _current_address_space() + max_memory_mb * 1024 * 1024
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    if max_cpu_seconds:
+        # 软限制触发 SIGXCPU，硬限制多留 1 秒作为兜底
+        resource.setrlimit(
+            resource.RLIMIT_CPU, (max_cpu_seconds, max_cpu_seconds + 1)
+        )
+
+
+def _sandbox_worker(conn, source, limits, max_pages, max_chars, engine):
+    """
+    子进程入口：应用资源限制后逐页解析，结果通过管道发回父进程
+    """
+    pages = []
+    page_timeout = limits['page_timeout']
+    try:
+        _apply_limits(limits['max_memory_mb'], limits['max_cpu_seconds'])
+
+        use_alarm = bool(page_timeout) and hasattr(signal, 'setitimer')
+        if use_alarm:
+            signal.signal(signal.SIGALRM, _raise_page_timeout)
+
+        with _open_pdf(source) as pdf:
+            total_pages = len(pdf.pages)
+            if total_pages == 0:
+                conn.send(_error_result('invalid', 'PDF 文件为空'))
+                return
+
+            iterator = PDFParser._iter_open_pages(pdf, max_pages, max_chars, engine)
+            while True:
+                # 每页重新计时，超出预算时由 SIGALRM 中断当前页
+                if use_alarm:
+                    signal.setitimer(signal.ITIMER_REAL, page_timeout)
+                try:
+                    page = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    if use_alarm:
+                        signal.setitimer(signal.ITIMER_REAL, 0)
+                pages.append(page)
+
+        conn.send(PDFParser.build_result(pages, total_pages, engine))
+
+    except PageTimeoutError:
+        conn.send(_error_result(
+            'page_timeout', f'第 {len(pages) + 1} 页解析超过 {page_timeout} 秒'
+        ))
+    except MemoryError:
+        # 先释放已解析的页面，保证错误结果能够发送
+        pages.clear()
+        conn.send(_error_result('memory_limit', f'解析内存超过 {limits["max_memory_mb"]} MB'))
+    except Exception as e:
+        conn.send(_error_result('parse_error', f'PDF 解析错误: {str(e)}'))
+    finally:
+        conn.close()
+
+
+class PDFSandbox:
+    """在独立子进程中解析 PDF，失控的文档会被终止并返回结构化错误"""
+
+    @staticmethod
+    def parse(source, max_pages=None, max_chars=None, engine=None,
+              timeout=PDF_PARSE_TIMEOUT, page_timeout=PDF_PAGE_TIMEOUT,
+              max_memory_mb=PDF_MAX_MEMORY_MB, max_cpu_seconds=PDF_MAX_CPU_SECONDS):
+        """
+        在沙箱子进程中解析 PDF
+
+        Args:
+            source: PDF 文件路径、字节串或文件对象
+            max_pages / max_chars / engine: 同 PDFParser.parse。沙箱内始终逐页串行解析，
+                不使用 PDF_PARALLEL_WORKERS：单页超时依赖子进程内的 SIGALRM，CPU 和内存上限也是按进程计算的，
+                再启动进程池会绕过这些限制。需要多进程并行解析时关闭 PDF_SANDBOX_ENABLED
+            timeout: 整个文档的墙钟时间上限（秒）
+            page_timeout: 单页解析时间上限（秒），0 表示不限制
+            max_memory_mb: 子进程在启动时已占用的地址空间之外，解析最多可再使用的内存（RLIMIT_AS）
+            max_cpu_seconds: 子进程 CPU 时间上限（RLIMIT_CPU）
+
+        Returns:
+            与 PDFParser.parse 相同的结果；失败时额外包含 error_type：
+            timeout / page_timeout / cpu_limit / memory_limit / crashed / parse_error / invalid
+        """
+        # 文件对象无法跨进程传递，转换为字节串
+        if hasattr(source, 'getvalue'):
+            source = source.getvalue()
+        elif hasattr(source, 'read'):
+            source = source.read()
+        elif isinstance(source, (bytearray, memoryview)):
+            source = bytes(source)
+
+        limits = {
+            'max_memory_mb': max_memory_mb,
+            'max_cpu_seconds': max_cpu_seconds,
+            'page_timeout': page_timeout
+        }
+
+        ctx = multiprocessing.get_context()
+        receiver, sender = ctx.Pipe(duplex=False)
+        process = ctx.Process(
+            target=_sandbox_worker,
+            args=(sender, source, limits, max_pages, max_chars, engine or PDF_ENGINE),
+            daemon=True
+        )
+        process.start()
+        sender.close()
+
+        result = None
+        timed_out = False
+        try:
+            if receiver.poll(timeout):
+                result = receiver.recv()
+            else:
+                timed_out = True
+        except EOFError:
+            # 子进程未发送结果即退出（被信号终止或崩溃）
+            pass
+        finally:
+            receiver.close()
+
+        if timed_out:
+            process.kill()
+            process.join()
+            return _error_result('timeout', f'PDF 解析超过 {timeout} 秒，已终止')
+
+        process.join()
+        if result is not None:
+            return result
+
+        exitcode = process.exitcode
+        if exitcode is not None and -exitcode in CPU_LIMIT_SIGNALS:
+            return _error_result('cpu_limit', f'PDF 解析 CPU 时间超过 {max_cpu_seconds} 秒，已终止')
+        return _error_result('crashed', f'PDF 解析进程异常退出（退出码 {exitcode}）')
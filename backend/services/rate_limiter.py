@@ -0,0 +1,376 @@
+"""
+LLM 出站限流模块 - 请求数和 token 数双令牌桶、并发上限和按优先级排队
+"""
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from config import (
+    LLM_RATE_LIMIT_ENABLED, LLM_RATE_LIMIT_RPM, LLM_RATE_LIMIT_TPM, LLM_RATE_LIMIT_BURST_SECONDS,
+    LLM_RATE_LIMIT_CONCURRENCY, LLM_RATE_LIMIT_MAX_WAIT, LLM_RATE_LIMIT_REDIS, LLM_RATE_LIMIT_REDIS_TIMEOUT,
+    REDIS_ENABLED, REDIS_HOST, REDIS_PORT, REDIS_DB
+)
+
+# 优先级：数值越小越先获得配额
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 10
+
+PRIORITY_NAMES = {PRIORITY_INTERACTIVE: 'interactive', PRIORITY_BATCH: 'batch'}
+
+# 当前请求的优先级；线程池中执行时需通过 submit_with_context 传递
+_current_priority = contextvars.ContextVar('llm_priority', default=PRIORITY_INTERACTIVE)
+
+# 保留最近多少次排队的等待时间
+METRICS_WINDOW = 1000
+
+# 多个令牌桶的原子检查与扣减：KEYS 为各桶的键，ARGV 依次为每个桶的 (速率, 容量, 需求量)；
+# 任一桶不足时都不扣减，返回需要等待的秒数（字符串，避免 Lua 数字被截断为整数）
+REDIS_TAKE_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local levels = {}
+local wait = 0
+for i = 1, #KEYS do
+    local rate = tonumber(ARGV[(i - 1) * 3 + 1])
+    local capacity = tonumber(ARGV[(i - 1) * 3 + 2])
+    local amount = tonumber(ARGV[(i - 1) * 3 + 3])
+    local state = redis.call('HMGET', KEYS[i], 'level', 'ts')
+    local level = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    level = math.min(capacity, level + math.max(0, now - ts) * rate)
+    levels[i] = level
+    if level < amount then
+        wait = math.max(wait, (amount - level) / rate)
+    end
+end
+for i = 1, #KEYS do
+    local rate = tonumber(ARGV[(i - 1) * 3 + 1])
+    local capacity = tonumber(ARGV[(i - 1) * 3 + 2])
+    local level = levels[i]
+    if wait == 0 then
+        level = level - tonumber(ARGV[(i - 1) * 3 + 3])
+    end
+    redis.call('HSET', KEYS[i], 'level', tostring(level), 'ts', tostring(now))
+    redis.call('EXPIRE', KEYS[i], math.ceil(capacity / rate) + 1)
+end
+return tostring(wait)
+"""
+
+
+class RateLimitTimeout(Exception):
+    """排队超过最长等待时间"""
+
+
+def current_priority() -> int:
+    """当前上下文的 LLM 调用优先级"""
+    return _current_priority.get()
+
+
+@contextmanager
+def llm_priority(priority: int):
+    """
+    在此上下文中发起的 LLM 调用使用指定优先级（如批量任务使用 PRIORITY_BATCH）
+    """
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def submit_with_context(executor, fn, *args):
+    """
+    向线程池提交任务，并带上当前上下文（包括调用优先级）
+    """
+    return executor.submit(contextvars.copy_context().run, fn, *args)
+
+
+class PriorityExecutor:
+    """
+    按优先级分开的线程池
+
+    交互请求和批量任务共用一个先进先出的线程池时，批量任务会占满所有线程，
+    交互请求排在线程池队列中，到不了限流器的优先级队列。分开后两类任务各有线程，
+    实际发出的调用数仍由 LLM_RATE_LIMITER 的并发上限约束，并在其中按优先级排队。
+    """
+
+    def __init__(self, max_workers: int, thread_name_prefix: str):
+        self._executors = {
+            PRIORITY_INTERACTIVE: ThreadPoolExecutor(max_workers=max(1, max_workers),
+                                                     thread_name_prefix=thread_name_prefix),
+            PRIORITY_BATCH: ThreadPoolExecutor(max_workers=max(1, max_workers),
+                                               thread_name_prefix=f'{thread_name_prefix}-batch')
+        }
+
+    def submit(self, fn, *args, priority: Optional[int] = None) -> Future:
+        """
+        按优先级（默认为当前上下文的优先级）选择线程池提交任务，并带上当前上下文
+        """
+        priority = current_priority() if priority is None else priority
+        executor = self._executors[PRIORITY_INTERACTIVE if priority < PRIORITY_BATCH else PRIORITY_BATCH]
+        return submit_with_context(executor, fn, *args)
+
+
+class LocalBuckets:
+    """进程内的令牌桶组"""
+
+    def __init__(self, limits: Dict[str, tuple]):
+        """
+        Args:
+            limits: 桶名 → (每秒补充速率, 容量)
+        """
+        self.limits = limits
+        self._lock = threading.Lock()
+        now = time.monotonic()
+        self._levels = {name: capacity for name, (_, capacity) in limits.items()}
+        self._updated = {name: now for name in limits}
+
+    def take(self, amounts: Dict[str, float]) -> float:
+        """
+        所有桶都足够时一起扣减并返回 0，否则不扣减，返回需要等待的秒数
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = 0.0
+            for name, amount in amounts.items():
+                rate, capacity = self.limits[name]
+                self._levels[name] = min(capacity, self._levels[name] + (now - self._updated[name]) * rate)
+                self._updated[name] = now
+                if self._levels[name] < amount:
+                    wait = max(wait, (amount - self._levels[name]) / rate)
+            if wait == 0:
+                for name, amount in amounts.items():
+                    self._levels[name] -= amount
+            return wait
+
+
+class RedisBuckets:
+    """Redis 中的令牌桶组，多个进程共享同一份配额"""
+
+    def __init__(self, limits: Dict[str, tuple], client, prefix: str = 'llm_rate_limit'):
+        self.limits = limits
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(REDIS_TAKE_SCRIPT)
+
+    def take(self, amounts: Dict[str, float]) -> float:
+        names = list(amounts)
+        args = []
+        for name in names:
+            rate, capacity = self.limits[name]
+            args.extend([rate, capacity, amounts[name]])
+        return float(self._script(keys=[f'{self.prefix}:{name}' for name in names], args=args))
+
+
+class LLMRateLimiter:
+    """
+    LLM 出站限流器
+
+    获取许可需要同时满足：
+    1. 在等待队列中排在最前（按优先级，同优先级先到先得）
+    2. 进行中的调用数低于并发上限
+    3. 请求数桶和 token 数桶都有足够的配额
+
+    排在前面的请求等待配额时，后面的请求不会插队，避免大请求被小请求饿死。
+    """
+
+    def __init__(self, rpm: float = LLM_RATE_LIMIT_RPM, tpm: float = LLM_RATE_LIMIT_TPM,
+                 burst_seconds: float = LLM_RATE_LIMIT_BURST_SECONDS,
+                 max_concurrency: int = LLM_RATE_LIMIT_CONCURRENCY,
+                 max_wait: float = LLM_RATE_LIMIT_MAX_WAIT,
+                 redis_client=None):
+        """
+        Args:
+            rpm: 每分钟请求数上限
+            tpm: 每分钟 token 数上限（按提示词估算值加最大生成长度计）
+            burst_seconds: 桶容量相当于多少秒的配额，决定允许的突发量
+            max_concurrency: 进行中的调用数上限（每个进程）
+            max_wait: 排队的最长等待时间（秒）
+            redis_client: 提供时令牌桶存放在 Redis 中，多个进程共享配额
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_wait = max_wait
+
+        limits = {}
+        for name, per_minute in (('requests', rpm), ('tokens', tpm)):
+            if per_minute > 0:
+                rate = per_minute / 60
+                limits[name] = (rate, max(1.0, rate * burst_seconds))
+        self.limits = limits
+
+        self._buckets = LocalBuckets(limits)
+        self.backend = 'local'
+        if redis_client is not None and limits:
+            try:
+                self._buckets = RedisBuckets(limits, redis_client)
+                self.backend = 'redis'
+            except Exception as e:
+                print(f"[RateLimiter] Redis 令牌桶初始化失败，使用进程内令牌桶: {e}")
+
+        self._condition = threading.Condition()
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._active = 0
+        self._waits_ms = deque(maxlen=METRICS_WINDOW)
+        self._totals = {'acquired': 0, 'timeouts': 0, 'throttled': 0}
+        self._by_priority = {}
+
+    def _take(self, amounts: Dict[str, float]) -> float:
+        # 需求超过桶容量时按容量计，否则永远无法满足
+        amounts = {
+            name: min(amount, self.limits[name][1])
+            for name, amount in amounts.items() if name in self.limits
+        }
+        if not amounts:
+            return 0.0
+        try:
+            return self._buckets.take(amounts)
+        except Exception as e:
+            if not isinstance(self._buckets, RedisBuckets):
+                raise
+            print(f"[RateLimiter] Redis 令牌桶不可用，改用进程内令牌桶: {e}")
+            self._buckets = LocalBuckets(self.limits)
+            self.backend = 'local'
+            return self._buckets.take(amounts)
+
+    def acquire(self, tokens: float, priority: Optional[int] = None, timeout: Optional[float] = None):
+        """
+        排队获取一次调用许可，完成后必须调用 release()
+
+        Args:
+            tokens: 本次调用预计消耗的 token 数
+            priority: 优先级，默认使用当前上下文的优先级
+            timeout: 最长等待时间（秒），默认 max_wait
+
+        Raises:
+            RateLimitTimeout: 超时仍未获得许可
+        """
+        priority = current_priority() if priority is None else priority
+        timeout = self.max_wait if timeout is None else timeout
+        started = time.monotonic()
+        expires_at = started + timeout
+        entry = (priority, next(self._sequence))
+        throttled = False
+
+        with self._condition:
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    sleep_for = None
+                    if self._waiters[0] == entry and self._active < self.max_concurrency:
+                        # 先占用并发名额，再在锁外扣减配额：Redis 令牌桶需要一次网络往返，
+                        # 期间其他等待者入队、release() 和超时处理不被阻塞
+                        self._active += 1
+                        acquired = False
+                        self._condition.release()
+                        try:
+                            wait = self._take({'requests': 1, 'tokens': tokens})
+                            acquired = wait == 0
+                        finally:
+                            self._condition.acquire()
+                            if not acquired:
+                                self._active -= 1
+                                self._condition.notify_all()
+                        if acquired:
+                            # 锁外期间可能有更高优先级的请求入队，entry 不一定仍在堆顶
+                            self._waiters.remove(entry)
+                            heapq.heapify(self._waiters)
+                            break
+                        throttled = True
+                        sleep_for = wait
+
+                    remaining = expires_at - time.monotonic()
+                    if remaining <= 0:
+                        self._totals['timeouts'] += 1
+                        raise RateLimitTimeout(f'LLM 调用排队超过 {timeout} 秒')
+                    self._condition.wait(min(sleep_for, remaining) if sleep_for else remaining)
+            except BaseException:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                # 队首变化，唤醒其他等待者
+                self._condition.notify_all()
+                raise
+
+            waited_ms = (time.monotonic() - started) * 1000
+            self._waits_ms.append(waited_ms)
+            self._totals['acquired'] += 1
+            self._totals['throttled'] += int(throttled)
+            name = PRIORITY_NAMES.get(priority, str(priority))
+            self._by_priority[name] = self._by_priority.get(name, 0) + 1
+            # 新的队首可能已经可以获得许可
+            self._condition.notify_all()
+
+    def release(self):
+        """调用结束，归还并发名额"""
+        with self._condition:
+            self._active -= 1
+            self._condition.notify_all()
+
+    @contextmanager
+    def limit(self, tokens: float, priority: Optional[int] = None):
+        """
+        with 语句形式：获取许可，结束时自动归还
+        """
+        self.acquire(tokens, priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def get_metrics(self) -> Dict:
+        """
+        限流指标：队列深度、进行中的调用数、排队等待时间分位数、超时和被配额限制的次数
+        """
+        with self._condition:
+            waits = sorted(self._waits_ms)
+            metrics = {
+                'backend': self.backend,
+                'queue_depth': len(self._waiters),
+                'active': self._active,
+                'max_concurrency': self.max_concurrency,
+                **self._totals,
+                'acquired_by_priority': dict(self._by_priority)
+            }
+
+        def percentile(percent):
+            if not waits:
+                return None
+            return round(waits[min(len(waits) - 1, int(round(percent / 100 * (len(waits) - 1))))], 1)
+
+        metrics['wait_ms'] = {
+            'avg': round(sum(waits) / len(waits), 1) if waits else None,
+            'p50': percentile(50),
+            'p95': percentile(95),
+            'max': round(waits[-1], 1) if waits else None
+        }
+        return metrics
+
+
+def _create_limiter() -> Optional[LLMRateLimiter]:
+    if not LLM_RATE_LIMIT_ENABLED:
+        return None
+
+    redis_client = None
+    if LLM_RATE_LIMIT_REDIS and REDIS_ENABLED:
+        try:
+            import redis
+            # 限定超时，Redis 变慢或无响应时尽快改用进程内令牌桶，不拖住 LLM 调用
+            redis_client = redis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB, decode_responses=True,
+                                       socket_timeout=LLM_RATE_LIMIT_REDIS_TIMEOUT,
+                                       socket_connect_timeout=LLM_RATE_LIMIT_REDIS_TIMEOUT)
+            redis_client.ping()
+        except Exception as e:
+            print(f"[RateLimiter] Redis 连接失败: {e}，使用进程内令牌桶")
+            redis_client = None
+
+    return LLMRateLimiter(redis_client=redis_client)
+
+
+# 共享实例，未启用时为 None
+LLM_RATE_LIMITER = _create_limiter()
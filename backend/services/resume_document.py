@@ -0,0 +1,141 @@
+"""
+简历文档模型 - 一次性构建规范化文本、小写视图、行索引和分段偏移，供各提取器共享
+"""
+import re
+from bisect import bisect_right
+from functools import cached_property
+from typing import Dict, List, Optional, Tuple
+
+
+# 各分段的标题关键词。英文标题只匹配原样和全大写形式，
+# 避免把正文中的 "work experience" 误判为标题
+SECTION_HEADINGS = {
+    'contact': ['联系方式', '个人信息', '基本信息', 'Contact', 'Personal Information'],
+    'education': ['教育背景', '教育经历', '学历背景', 'Education'],
+    'experience': [
+        '工作经历', '项目经历', '实习经历', '项目经验',
+        'Work Experience', 'Experience', 'Projects',
+    ],
+    'skills': ['专业技能', '技能特长', '技术栈', '技能清单', 'Skills', 'Technical Skills'],
+}
+
+
+def _build_heading_pattern():
+    """
+    将所有标题关键词编译为一个带命名分组的正则，标题需位于行首或空白之后
+    """
+    alternatives = []
+    for section, headings in SECTION_HEADINGS.items():
+        variants = set()
+        for heading in headings:
+            variants.add(re.escape(heading))
+            if heading.isascii():
+                variants.add(re.escape(heading.upper()))
+        # 长的标题优先，避免 "Experience" 抢先匹配 "Work Experience" 的后半部分
+        ordered = sorted(variants, key=len, reverse=True)
+        alternatives.append(f"(?P<{section}>{'|'.join(ordered)})")
+    return re.compile(
+        r'(?:^|(?<=\s))(?:' + '|'.join(alternatives) + r')(?=[\s：:]|$)',
+        re.MULTILINE
+    )
+
+
+HEADING_PATTERN = _build_heading_pattern()
+
+
+class ResumeDocument:
+    """解析后的简历文档，所有派生视图只计算一次"""
+
+    def __init__(self, text: str):
+        """
+        Args:
+            text: 已清洗的简历文本
+        """
+        self.text = text or ''
+
+    @staticmethod
+    def of(resume) -> 'ResumeDocument':
+        """
+        将字符串包装为 ResumeDocument，已是 ResumeDocument 时原样返回
+        """
+        if isinstance(resume, ResumeDocument):
+            return resume
+        return ResumeDocument(resume)
+
+    @cached_property
+    def text_lower(self) -> str:
+        """小写视图"""
+        return self.text.lower()
+
+    @cached_property
+    def lines(self) -> List[str]:
+        """按换行切分的行列表"""
+        return self.text.split('\n')
+
+    @cached_property
+    def line_offsets(self) -> List[int]:
+        """每一行在全文中的起始偏移"""
+        offsets = []
+        position = 0
+        for line in self.lines:
+            offsets.append(position)
+            position += len(line) + 1
+        return offsets
+
+    def line_at(self, offset: int) -> int:
+        """
+        返回字符偏移所在的行号（从 0 开始）
+        """
+        return bisect_right(self.line_offsets, offset) - 1
+
+    @cached_property
+    def sections(self) -> Dict[str, List[Tuple[int, int]]]:
+        """
+        检测到的分段及其字符区间 [start, end)
+
+        第一个标题之前的内容视为 contact（简历头部的联系方式）；
+        同一类型的分段可能出现多次。
+        """
+        sections = {name: [] for name in SECTION_HEADINGS}
+        headings = [
+            (match.start(), match.lastgroup)
+            for match in HEADING_PATTERN.finditer(self.text)
+        ]
+
+        first_start = headings[0][0] if headings else len(self.text)
+        if first_start > 0:
+            sections['contact'].append((0, first_start))
+
+        for index, (start, name) in enumerate(headings):
+            end = headings[index + 1][0] if index + 1 < len(headings) else len(self.text)
+            sections[name].append((start, end))
+
+        return sections
+
+    def section_text(self, name: str) -> str:
+        """
+        返回指定分段的文本（多个同类分段以换行拼接），未检测到时返回空字符串
+        """
+        return '\n'.join(self.text[start:end] for start, end in self.sections.get(name, []))
+
+    def search(self, pattern, *section_names: str, flags: int = 0) -> Optional[re.Match]:
+        """
+        依次在指定分段中查找，均未命中时再在全文中查找
+
+        Args:
+            pattern: 正则字符串或已编译的正则
+            section_names: 优先查找的分段名称
+            flags: pattern 为字符串时使用的正则标志
+
+        Returns:
+            re.Match 或 None（匹配偏移均相对于全文）
+        """
+        regex = pattern if isinstance(pattern, re.Pattern) else re.compile(pattern, flags)
+
+        for name in section_names:
+            for start, end in self.sections.get(name, []):
+                match = regex.search(self.text, start, end)
+                if match:
+                    return match
+
+        return regex.search(self.text)
@@ -5,6 +5,8 @@ import re
 from collections import Counter
 from difflib import SequenceMatcher
 
+from services.skill_taxonomy import SKILL_TAXONOMY
+
 
 class ResumeMatcher:
     """简历和岗位匹配器"""
@@ -14,27 +16,7 @@ class ResumeMatcher:
         """
         从岗位描述中提取关键词
         """
-        # 常见的岗位相关关键词
-        skill_keywords = [
-            'Python', 'Java', 'JavaScript', 'C++', 'C#', 'Go', 'Rust', 'PHP',
-            'React', 'Vue', 'Angular', 'Django', 'Flask', 'Spring', 'FastAPI',
-            'MySQL', 'MongoDB', 'Redis', 'PostgreSQL', 'Oracle',
-            'Docker', 'Kubernetes', 'AWS', 'GCP', 'Azure',
-            'Git', 'Linux', 'SQL', 'RESTful', 'API',
-            'HTML', 'CSS', 'Webpack', 'Node.js', 'Express',
-            'TensorFlow', 'PyTorch', 'Keras', 'Scikit-learn',
-            'MQ', 'Kafka', 'RabbitMQ', 'Elasticsearch',
-            '微服务', '分布式', '高并发', '数据分析', '机器学习',
-            'AI', 'NLP', '深度学习', '计算机视觉', '大数据',
-            '实习', '校招', '社招', '全职', '兼职', '远程',
-        ]
-        
-        keywords = []
-        for keyword in skill_keywords:
-            if keyword.lower() in job_description.lower():
-                keywords.append(keyword)
-        
-        return list(set(keywords))
+        return SKILL_TAXONOMY.find_job_keywords(job_description)
     
     @staticmethod
     def calculate_skill_match(resume_skills, job_keywords):
@@ -118,9 +100,14 @@ class ResumeMatcher:
         # 提取岗位关键词
         job_keywords = ResumeMatcher.extract_job_keywords(job_description)
         
+        # 简历技能统一为规范名称（别名或 LLM 返回的不同写法）后再与岗位关键词比较
+        resume_skills = list(dict.fromkeys(
+            SKILL_TAXONOMY.canonical(skill) for skill in resume_info.get('skills', [])
+        ))
+
         # 计算各项匹配度
         skill_match = ResumeMatcher.calculate_skill_match(
-            resume_info.get('skills', []),
+            resume_skills,
             job_keywords
         )
         
@@ -152,7 +139,7 @@ class ResumeMatcher:
             'skill_match': skill_match,
             'experience_match': experience_match,
             'text_similarity': text_similarity,
-            'matched_skills': [skill for skill in resume_info.get('skills', []) if skill in job_keywords],
+            'matched_skills': [skill for skill in resume_skills if skill in job_keywords],
             'job_keywords': job_keywords,
             'recommendation': get_recommendation(total_score)
         }
@@ -0,0 +1,160 @@
+"""
+单飞（single-flight）模块 - 相同缓存键的并发请求只计算一次，其余请求等待并共享结果
+"""
+import json
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Tuple
+
+from config import SINGLEFLIGHT_LOCK_TTL, SINGLEFLIGHT_POLL_INTERVAL, SINGLEFLIGHT_WAIT_TIMEOUT
+
+# 仅当锁仍属于自己时才删除，避免误删锁过期后其他进程重新获取的锁
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class _Call:
+    """进程内一次进行中的计算"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    合并相同缓存键的并发计算
+
+    进程内：第一个请求执行计算，同一键的后续请求等待它完成并共享结果（或异常）。
+    跨进程（CacheManager 使用 Redis 时）：以 SET NX EX 获取短期锁，获得锁的进程计算并写入缓存，
+    其他进程轮询缓存直到结果出现；锁释放或过期后仍无结果时重新竞争。
+    """
+
+    def __init__(self, cache_manager,
+                 lock_ttl: float = SINGLEFLIGHT_LOCK_TTL,
+                 poll_interval: float = SINGLEFLIGHT_POLL_INTERVAL,
+                 wait_timeout: float = SINGLEFLIGHT_WAIT_TIMEOUT):
+        """
+        Args:
+            cache_manager: CacheManager，计算结果写入其中
+            lock_ttl: Redis 锁的过期时间（秒），应大于单次计算的最长耗时
+            poll_interval: 等待其他进程时轮询缓存的间隔（秒）
+            wait_timeout: 等待其他进程的最长时间（秒），超时后自行计算
+        """
+        self.cache_manager = cache_manager
+        self.lock_ttl = lock_ttl
+        self.poll_interval = poll_interval
+        self.wait_timeout = wait_timeout
+
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._stats = {'computed': 0, 'shared_local': 0, 'shared_remote': 0, 'wait_timeouts': 0}
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def do(self, key: str, compute: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        执行或等待 key 对应的计算，结果写入缓存
+
+        Args:
+            key: 缓存键（CacheManager.generate_key 生成）
+            compute: 无参数的计算函数
+
+        Returns:
+            (结果, 是否与其他请求共享)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.done.wait()
+            self._count('shared_local')
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        shared = False
+        try:
+            call.result, shared = self._do_across_workers(key, compute)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, shared
+
+    def _compute_and_cache(self, key, compute):
+        result = compute()
+        self.cache_manager.set(key, result)
+        self._count('computed')
+        return result
+
+    @staticmethod
+    def _load(value):
+        # Redis 中存的是 JSON 字符串，本地缓存中是原对象
+        return json.loads(value) if isinstance(value, str) else value
+
+    def _do_across_workers(self, key, compute):
+        client = self.cache_manager.redis_client if self.cache_manager.use_redis else None
+        if client is None:
+            return self._compute_and_cache(key, compute), False
+
+        lock_key = f'{key}:lock'
+        token = uuid.uuid4().hex
+        expires_at = time.monotonic() + self.wait_timeout
+
+        while True:
+            try:
+                acquired = client.set(lock_key, token, nx=True, ex=max(1, int(self.lock_ttl)))
+            except Exception as e:
+                print(f"[SingleFlight] Redis 加锁失败，直接计算: {e}")
+                return self._compute_and_cache(key, compute), False
+
+            if acquired:
+                try:
+                    return self._compute_and_cache(key, compute), False
+                finally:
+                    try:
+                        client.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+                    except Exception as e:
+                        print(f"[SingleFlight] Redis 释放锁失败: {e}")
+
+            # 其他进程正在计算：轮询缓存，锁消失仍无结果时重新竞争
+            while time.monotonic() < expires_at:
+                time.sleep(self.poll_interval)
+                value = self.cache_manager.get(key)
+                if value:
+                    self._count('shared_remote')
+                    return self._load(value), True
+                try:
+                    if not client.exists(lock_key):
+                        break
+                except Exception:
+                    break
+            else:
+                print(f"[SingleFlight] 等待其他进程超过 {self.wait_timeout} 秒，自行计算")
+                self._count('wait_timeouts')
+                return self._compute_and_cache(key, compute), False
+
+    def get_stats(self) -> Dict:
+        """
+        统计：自行计算次数、与本进程/其他进程共享结果的次数
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['in_flight'] = len(self._calls)
+        return stats
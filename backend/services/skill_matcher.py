@@ -0,0 +1,131 @@
+"""
+技能关键词匹配模块 - 基于 Aho-Corasick 自动机，一次线性扫描找出全部技能
+"""
+from collections import deque
+from typing import Iterable, List, Tuple
+
+from services.resume_document import ResumeDocument
+
+
+def _is_ascii_alnum(ch):
+    return ch.isascii() and ch.isalnum()
+
+
+def _is_ascii_alpha(ch):
+    return ch.isascii() and ch.isalpha()
+
+
+def _continues_word(text, start):
+    """
+    start 之前是否紧接同一个英文词：字母数字，或 "Node.js" 这类带点的名称
+    """
+    previous = text[start - 1]
+    if _is_ascii_alnum(previous):
+        return True
+    return previous == '.' and start > 1 and _is_ascii_alnum(text[start - 2])
+
+
+class SkillMatcher:
+    """
+    多模式匹配器：所有关键词及别名编译进一个 Aho-Corasick 自动机，扫描耗时与文本长度成线性
+
+    英文关键词按词边界匹配（"Go" 不会命中 "Google"，"AI" 不会命中 "email"，"js" 不会命中 "Node.js"），
+    仅在关键词首/尾为字母数字时检查对应一侧；关键词后紧跟数字视为边界（"Python3"、"Vue3"）。
+    中文关键词不检查边界。
+    """
+
+    def __init__(self, terms: Iterable[Tuple[str, str]]):
+        """
+        Args:
+            terms: (匹配词, 规范名称) 序列，别名与规范名称各占一项；匹配不区分大小写，
+                结果返回规范名称
+        """
+        self._goto = [{}]
+        self._fail = [0]
+        self._outputs = [[]]
+
+        for term, canonical in terms:
+            term = term.strip().lower()
+            if term:
+                self._add(term, canonical)
+        self._build_failure_links()
+
+    @property
+    def state_count(self):
+        """自动机状态数"""
+        return len(self._goto)
+
+    def _add(self, term, canonical):
+        state = 0
+        for ch in term:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+
+        self._outputs[state].append((
+            len(term),
+            canonical,
+            _is_ascii_alnum(term[0]),
+            _is_ascii_alnum(term[-1]),
+        ))
+
+    def _build_failure_links(self):
+        """
+        按广度优先计算失配指针，并合并后缀状态的输出
+        """
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+
+    def find_all(self, text) -> List[str]:
+        """
+        找出文本中出现的所有关键词
+
+        Args:
+            text: 文本或 ResumeDocument（复用其小写视图）
+
+        Returns:
+            去重后的规范名称列表，按首次出现的位置排序
+        """
+        if isinstance(text, ResumeDocument):
+            text_lower = text.text_lower
+        else:
+            text_lower = (text or '').lower()
+
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        length = len(text_lower)
+
+        found = {}
+        state = 0
+        for index, ch in enumerate(text_lower):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+
+            for term_length, canonical, check_left, check_right in outputs[state]:
+                if canonical in found:
+                    continue
+                start = index - term_length + 1
+                if check_left and start > 0 and _continues_word(text_lower, start):
+                    continue
+                if check_right and index + 1 < length and _is_ascii_alpha(text_lower[index + 1]):
+                    continue
+                found[canonical] = start
+
+        return sorted(found, key=found.get)
+
@@ -0,0 +1,142 @@
+"""
+技能词表模块 - 从 JSON 文件加载技能及别名，编译为匹配索引，文件变更后自动热加载
+"""
+import json
+import os
+import threading
+import time
+from typing import List
+
+from config import SKILL_TAXONOMY_PATH, SKILL_TAXONOMY_RELOAD_SECONDS
+from services.skill_matcher import SkillMatcher
+
+# 只用于岗位描述关键词、不计入简历技能的类别
+JOB_ONLY_CATEGORY = 'job'
+
+
+class _TaxonomyIndex:
+    """一个版本的词表编译结果，构建完成后只读，可被多线程共享"""
+
+    def __init__(self, entries, mtime=None):
+        skill_terms = []
+        job_terms = []
+        canonical = {}
+
+        for entry in entries:
+            name = (entry.get('name') or '').strip()
+            if not name:
+                continue
+            terms = [name] + [alias for alias in entry.get('aliases', []) if alias]
+            pairs = [(term, name) for term in terms]
+
+            job_terms.extend(pairs)
+            if entry.get('category') != JOB_ONLY_CATEGORY:
+                skill_terms.extend(pairs)
+            for term in terms:
+                canonical.setdefault(term.strip().lower(), name)
+
+        self.mtime = mtime
+        self.entry_count = len(entries)
+        self.term_count = len(canonical)
+        self.skills = SkillMatcher(skill_terms)
+        self.job_keywords = SkillMatcher(job_terms)
+        self.canonical = canonical
+
+
+class SkillTaxonomy:
+    """
+    技能词表
+
+    索引在后台按需重建：每次查询最多每 reload_interval 秒检查一次文件修改时间，
+    变更后重新编译并整体替换，正在进行的查询继续使用旧索引。
+    新文件加载失败时保留旧索引。
+    """
+
+    def __init__(self, path: str, reload_interval: float = SKILL_TAXONOMY_RELOAD_SECONDS):
+        """
+        Args:
+            path: 词表 JSON 文件路径
+            reload_interval: 检查文件变更的最小间隔（秒），0 表示不自动重载
+        """
+        self.path = path
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._index = _TaxonomyIndex([])
+        self._last_check = time.monotonic()
+        self.reload()
+
+    @staticmethod
+    def load_entries(path: str) -> list:
+        """
+        读取词表文件
+
+        Returns:
+            词条列表，每项包含 name、category、aliases
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        entries = data.get('entries') if isinstance(data, dict) else data
+        if not isinstance(entries, list):
+            raise ValueError('词表格式错误：缺少 entries 列表')
+        return entries
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        重新加载词表文件
+
+        Args:
+            force: 为 True 时即使文件未修改也重新编译
+
+        Returns:
+            是否加载了新版本
+        """
+        with self._lock:
+            self._last_check = time.monotonic()
+            try:
+                mtime = os.path.getmtime(self.path)
+                if not force and mtime == self._index.mtime:
+                    return False
+                started = time.perf_counter()
+                index = _TaxonomyIndex(self.load_entries(self.path), mtime)
+            except Exception as e:
+                print(f"技能词表加载失败，继续使用当前版本: {str(e)}")
+                return False
+
+            self._index = index
+            print(f"技能词表已加载: {index.entry_count} 个词条，{index.term_count} 个匹配词，"
+                  f"耗时 {(time.perf_counter() - started) * 1000:.1f}ms")
+            return True
+
+    def _current(self) -> _TaxonomyIndex:
+        """
+        返回当前索引，到达检查间隔时先检测文件变更
+        """
+        if self.reload_interval and time.monotonic() - self._last_check >= self.reload_interval:
+            # 已有线程在检查时直接使用当前索引，不阻塞查询
+            if not self._lock.locked():
+                self.reload()
+        return self._index
+
+    def find_skills(self, text) -> List[str]:
+        """
+        从文本或 ResumeDocument 中提取技能（规范名称）
+        """
+        return self._current().skills.find_all(text)
+
+    def find_job_keywords(self, text) -> List[str]:
+        """
+        从岗位描述中提取关键词（规范名称，包含 job 类别）
+        """
+        return self._current().job_keywords.find_all(text)
+
+    def canonical(self, name: str) -> str:
+        """
+        将技能名称或别名转换为规范名称，词表中没有时原样返回
+        """
+        if not name:
+            return name
+        return self._current().canonical.get(name.strip().lower(), name)
+
+
+# 共享实例
+SKILL_TAXONOMY = SkillTaxonomy(SKILL_TAXONOMY_PATH)
@@ -0,0 +1,111 @@
+"""
+文本分块模块 - 按分段边界将简历切分为不超过 token 预算的块，供 LLM 分块提取
+"""
+import re
+from typing import List, Tuple, Union
+
+from config import LLM_CHUNK_TOKENS, LLM_CHUNK_MAX_COUNT
+from services.resume_document import ResumeDocument
+
+# 中日韩文字和全角标点，通义千问分词器中大致每字一个 token
+CJK_PATTERN = re.compile('[\u3000-\u303f\u3400-\u4dbf\u4e00-\u9fff\uff00-\uffef]')
+
+# 其他字符（英文、数字、空白）大致每 4 个字符一个 token
+ASCII_CHARS_PER_TOKEN = 4
+
+# 分段过长时的切分位置：句末标点或换行之后，其次是空白之后
+SENTENCE_BOUNDARY = re.compile(r'(?<=[。！？；;!?\n])')
+WORD_BOUNDARY = re.compile(r'(?<=\s)')
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    粗略估算文本的 token 数（不加载分词器，宁多勿少）
+    """
+    if not text:
+        return 0
+    cjk = len(CJK_PATTERN.findall(text))
+    return cjk + -(-(len(text) - cjk) // ASCII_CHARS_PER_TOKEN)
+
+
+class TextChunker:
+    """按分段边界切分简历文本"""
+
+    @staticmethod
+    def _section_spans(document: ResumeDocument) -> List[Tuple[int, int]]:
+        """
+        所有分段的字符区间，按起始位置排序；分段从标题开始到下一个标题为止，合起来覆盖全文
+        """
+        spans = sorted(span for spans in document.sections.values() for span in spans)
+        return spans or [(0, len(document.text))]
+
+    @staticmethod
+    def _split_oversized(text: str, max_tokens: int) -> List[str]:
+        """
+        超出预算的分段依次在句子边界、空白处切开，单句仍超出时按字符硬切
+
+        清洗后的文本换行已合并为空格，因此不按行切分；各片段保留原有的分隔符，拼接后与原文一致
+        """
+        pieces = []
+        for sentence in SENTENCE_BOUNDARY.split(text):
+            if estimate_tokens(sentence) <= max_tokens:
+                pieces.append(sentence)
+                continue
+            for word in WORD_BOUNDARY.split(sentence):
+                while estimate_tokens(word) > max_tokens:
+                    # 按最坏情况（每字一个 token）切分，保证每段不超出预算
+                    pieces.append(word[:max_tokens])
+                    word = word[max_tokens:]
+                pieces.append(word)
+        return [piece for piece in pieces if piece]
+
+    @staticmethod
+    def split(resume_text: Union[str, ResumeDocument],
+              max_tokens: int = LLM_CHUNK_TOKENS,
+              max_chunks: int = LLM_CHUNK_MAX_COUNT) -> List[str]:
+        """
+        将简历文本切分为多个块
+
+        相邻分段依次装入同一个块，直到再加入下一段会超出 token 预算；
+        单个分段超出预算时在句子边界处切开。
+
+        Args:
+            resume_text: 已清洗的简历文本或 ResumeDocument
+            max_tokens: 每块的 token 预算
+            max_chunks: 最多返回的块数，超出部分丢弃（控制单份简历的调用次数）
+
+        Returns:
+            块文本列表（按原文顺序）；文本为空时返回空列表
+        """
+        document = ResumeDocument.of(resume_text)
+        if not document.text.strip():
+            return []
+        max_tokens = max(1, max_tokens)
+
+        pieces = []
+        for start, end in TextChunker._section_spans(document):
+            section = document.text[start:end]
+            if estimate_tokens(section) <= max_tokens:
+                pieces.append(section)
+            else:
+                pieces.extend(TextChunker._split_oversized(section, max_tokens))
+
+        chunks = []
+        current = []
+        current_tokens = 0
+        for piece in pieces:
+            tokens = estimate_tokens(piece)
+            if current and current_tokens + tokens > max_tokens:
+                chunks.append(''.join(current))
+                current = []
+                current_tokens = 0
+            current.append(piece)
+            current_tokens += tokens
+        if current:
+            chunks.append(''.join(current))
+
+        chunks = [chunk.strip() for chunk in chunks if chunk.strip()]
+        if max_chunks and len(chunks) > max_chunks:
+            print(f"[TextChunker] 简历切分为 {len(chunks)} 块，超出上限 {max_chunks}，丢弃末尾 {len(chunks) - max_chunks} 块")
+            chunks = chunks[:max_chunks]
+        return chunks
@@ -0,0 +1,67 @@
+"""
+测试公共配置：启动本地 LLM 桩服务器，并在导入后端模块前通过环境变量指向它
+"""
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, 'benchmarks'))
+
+from llm_stub_server import StubOptions, start_stub_server
+
+STUB_OPTIONS = StubOptions(latency_ms=0)
+_server, _url = start_stub_server(STUB_OPTIONS)
+
+# 关闭响应缓存、重试、共享熔断器和 Redis，各测试的结果只取决于桩服务器的故障注入参数
+os.environ.update({
+    'LLM_API_URL': _url,
+    'LLM_API_KEY': 'stub-key',
+    'LLM_CACHE_ENABLED': 'False',
+    'LLM_MAX_RETRIES': '0',
+    'LLM_BREAKER_ENABLED': 'False',
+    'LLM_RATE_LIMIT_ENABLED': 'False',
+    'REDIS_ENABLED': 'False',
+    'PROGRESSIVE_UPLOAD': 'False'
+})
+
+
+@pytest.fixture
+def stub_options():
+    """桩服务器的故障注入参数，测试结束后恢复为全部成功"""
+    yield STUB_OPTIONS
+    STUB_OPTIONS.error_rate = 0.0
+    STUB_OPTIONS.rate_limit_rate = 0.0
+    STUB_OPTIONS.malformed_rate = 0.0
+
+
+def build_pdf(pages):
+    """
+    生成只含文本层的最小 PDF（Helvetica，每页若干行 ASCII 文本）
+
+    Args:
+        pages: 每页的文本行列表
+    """
+    objects = ['<< /Type /Catalog /Pages 2 0 R >>', None,
+               '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for lines in pages:
+        content = 'BT /F1 11 Tf 72 720 Td 14 TL ' + ' '.join(f'({line}) Tj T*' for line in lines) + ' ET'
+        objects.append(f'<< /Length {len(content)} >>\nstream\n{content}\nendstream')
+        objects.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {len(objects)} 0 R '
+                       f'/Resources << /Font << /F1 3 0 R >> >> >>')
+        kids.append(f'{len(objects)} 0 R')
+    objects[1] = f'<< /Type /Pages /Kids [{" ".join(kids)}] /Count {len(kids)} >>'
+
+    data = b'%PDF-1.4\n'
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += f'{number} 0 obj\n{body}\nendobj\n'.encode('latin-1')
+    xref = len(data)
+    data += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode('latin-1')
+    data += b''.join(f'{offset:010d} 00000 n \n'.encode('latin-1') for offset in offsets)
+    data += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode('latin-1')
+    return data
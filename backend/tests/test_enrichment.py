@@ -0,0 +1,80 @@
+"""
+后台补全：LLM 失败时记录为 failed，不把纯正则结果写入缓存
+"""
+import itertools
+
+import pytest
+
+import app as app_module
+from services import ai_hybrid_extractor
+from services.ai_hybrid_extractor import HybridExtractor
+from services.circuit_breaker import CircuitBreaker
+from services.enrichment import DONE, FAILED, PENDING, ENRICHMENT_QUEUE
+from services.resume_document import ResumeDocument
+from utils.text_cleaner import clean_text
+
+RESUME_TEXT = ('张三\n电话：13912345678\n邮箱：zhangsan@example.com\n求职意向：后端开发工程师\n'
+               '工作经历\n某科技公司 后端开发 3年 负责订单系统\n专业技能\nPython Django MySQL Redis\n'
+               '教育背景\n某大学 计算机科学 本科\n')
+
+_ids = itertools.count()
+
+
+def run_enrichment():
+    """提交一次后台补全并等待完成，返回 (简历记录, 缓存键)"""
+    resume_id = f'resume_test_{next(_ids)}'
+    cache_key = f'resume:{resume_id}'
+    resume_data = {
+        'resume_id': resume_id,
+        'resume_text': RESUME_TEXT,
+        'extracted_info': HybridExtractor.extract_regex_info(RESUME_TEXT),
+        'enrichment_status': PENDING
+    }
+    version = ENRICHMENT_QUEUE.version(resume_id)
+    app_module.start_enrichment(resume_data, ResumeDocument(clean_text(RESUME_TEXT)), cache_key)
+    assert ENRICHMENT_QUEUE.wait_for_update(resume_id, version, timeout=30) > version
+    return resume_data, cache_key
+
+
+@pytest.fixture(params=['combined', 'separate', 'chunked', 'batched'])
+def extraction_mode(request, monkeypatch):
+    monkeypatch.setattr(ai_hybrid_extractor, 'LLM_EXTRACTION_MODE', request.param)
+    return request.param
+
+
+def test_enrichment_done_writes_cache(stub_options, extraction_mode):
+    resume_data, cache_key = run_enrichment()
+
+    assert resume_data['enrichment_status'] == DONE
+    assert resume_data['extracted_info']['base_info']['name'] == '桩候选人'
+    assert app_module.cache_manager.get(cache_key) is resume_data
+
+
+def test_enrichment_llm_errors_marked_failed(stub_options, extraction_mode):
+    stub_options.error_rate = 1.0
+    resume_data, cache_key = run_enrichment()
+
+    assert resume_data['enrichment_status'] == FAILED
+    assert resume_data['extracted_info']['base_info']['phone'] == '13912345678'
+    assert app_module.cache_manager.get(cache_key) is None
+
+
+def test_enrichment_breaker_open_marked_failed(stub_options, monkeypatch):
+    breaker = CircuitBreaker('test', min_calls=1)
+    breaker.record(False, 1)
+    assert breaker.is_open()
+    monkeypatch.setattr(ai_hybrid_extractor, 'LLM_BREAKER', breaker)
+
+    requests_before = stub_options.stats['requests']
+    resume_data, cache_key = run_enrichment()
+
+    assert resume_data['enrichment_status'] == FAILED
+    assert app_module.cache_manager.get(cache_key) is None
+    assert stub_options.stats['requests'] == requests_before
+
+
+def test_extract_all_info_falls_back_by_default(stub_options):
+    stub_options.error_rate = 1.0
+    result = HybridExtractor.extract_all_info(RESUME_TEXT)
+
+    assert result['base_info']['phone'] == '13912345678'
@@ -0,0 +1,18 @@
+"""
+LLM 客户端：流式响应的解码
+"""
+from llm_stub_server import StubOptions, start_stub_server
+
+from services.llm_client import LLMClient
+
+
+def test_stream_decodes_utf8_without_charset():
+    options = StubOptions(latency_ms=0, stream_chunks=3, stream_charset=None)
+    server, url = start_stub_server(options)
+    try:
+        client = LLMClient(url, 'stub-key', 'qwen-plus', max_retries=0)
+        text = ''.join(client.stream('请生成简历摘要'))
+    finally:
+        server.shutdown()
+
+    assert text.endswith(' 片段1 片段2')
@@ -0,0 +1,55 @@
+"""
+LLM 出站限流器：Redis 令牌桶变慢或出错时不阻塞其他调用方
+"""
+import threading
+import time
+
+from services.rate_limiter import LLMRateLimiter
+
+
+class FakeRedis:
+    """只实现 register_script 的 Redis 客户端，脚本调用延迟 delay 秒后返回 0 或抛出 error"""
+
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    def register_script(self, script):
+        def run(keys, args):
+            self.calls += 1
+            time.sleep(self.delay)
+            if self.error is not None:
+                raise self.error
+            return '0'
+        return run
+
+
+def test_slow_redis_does_not_block_release_and_metrics():
+    limiter = LLMRateLimiter(redis_client=FakeRedis(delay=0.5), max_concurrency=2)
+    assert limiter.backend == 'redis'
+
+    holder = threading.Thread(target=limiter.acquire, args=(100,))
+    holder.start()
+    time.sleep(0.1)
+
+    # 另一个线程正在等待 Redis 返回，锁不应被占用
+    started = time.monotonic()
+    limiter.get_metrics()
+    assert time.monotonic() - started < 0.2
+
+    holder.join()
+    limiter.release()
+    assert limiter.get_metrics()['active'] == 0
+
+
+def test_redis_error_falls_back_to_local_buckets():
+    redis_client = FakeRedis(error=ConnectionError('redis down'))
+    limiter = LLMRateLimiter(redis_client=redis_client)
+
+    with limiter.limit(100):
+        pass
+
+    assert redis_client.calls == 1
+    assert limiter.backend == 'local'
+    assert limiter.get_metrics()['acquired'] == 1
@@ -4,23 +4,78 @@
 import re
 import jieba
 
+# 需要移除的字符：保留中英文、数字和基本标点之外的所有字符
+_REMOVE_CHARS_PATTERN = re.compile(r'[^\w\s\u4e00-\u9fa5\-+()（）@.#+._]+')
+
+# 连续空白（含换行）合并为单个空格
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+class CleanText(str):
+    """
+    已清洗文本的标记类型，clean_text 遇到该类型时直接返回，避免重复清洗
+    """
+    __slots__ = ()
+
+
 def clean_text(text):
     """
     清洗简历文本
+    
+    使用预编译的正则：先移除特殊字符，再合并空白。
+    返回 CleanText，再次传入时不会重复清洗。
     """
+    if isinstance(text, CleanText):
+        return text
     if not text:
-        return ""
+        return CleanText("")
     
     # 移除特殊字符但保留中英文、数字和基本标点
-    text = re.sub(r'[^\w\s\u4e00-\u9fa5\-+()（）@.#+._]', '', text)
+    text = _REMOVE_CHARS_PATTERN.sub('', text)
     
-    # 移除多余空格
-    text = re.sub(r'\s+', ' ', text)
+    # 合并多余空白（换行也会被合并为空格）
+    text = _WHITESPACE_PATTERN.sub(' ', text)
     
-    # 移除换行符前后的空格
-    text = re.sub(r'\s*\n\s*', '\n', text)
+    return CleanText(text.strip())
+
+
+def clean_many(texts):
+    """
+    批量清洗文本，重复的输入只清洗一次
     
-    return text.strip()
+    Args:
+        texts: 文本的可迭代对象
+        
+    Returns:
+        与输入顺序一致的 CleanText 列表
+    """
+    cleaned = {}
+    results = []
+    for text in texts:
+        if isinstance(text, CleanText):
+            results.append(text)
+            continue
+        key = text or ''
+        if key not in cleaned:
+            cleaned[key] = clean_text(key)
+        results.append(cleaned[key])
+    return results
+
+
+def join_clean(texts):
+    """
+    拼接分别清洗的多段文本（如 PDF 各页）
+    
+    结果与对拼接后的原文整体调用 clean_text 相同，上传 PDF 和直接提交文本得到一致的文本，
+    之后再次清洗（如经 JSON 序列化丢失 CleanText 标记）也不会改变
+    
+    Args:
+        texts: 文本的可迭代对象（未清洗的会先清洗）
+        
+    Returns:
+        CleanText
+    """
+    return CleanText(' '.join(text for text in clean_many(texts) if text))
 
 
 def extract_segments(text, min_length=20):
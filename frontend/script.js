@@ -156,6 +156,8 @@ async function uploadResume() {
 
     const formData = new FormData();
     formData.append('file', file);
+    // 渐进式上传：先返回基础解析结果，AI 解析结果随后推送
+    formData.append('progressive', 'true');
 
     showStatus('uploadStatus', 'loading', '上传中...');
 
@@ -168,11 +170,17 @@ async function uploadResume() {
         const result = await response.json();
 
         if (result.success) {
-            showStatus('uploadStatus', 'success', '上传成功！');
             currentResumeId = result.data.resume_id;
             displayUploadResult(result.data);
             document.getElementById('uploadResult').classList.remove('hidden');
             fileInput.value = '';
+
+            if (result.data.enrichment_status === 'pending') {
+                showStatus('uploadStatus', 'loading', '上传成功，AI 解析中...');
+                watchEnrichment(result.data.resume_id);
+            } else {
+                showStatus('uploadStatus', 'success', '上传成功！');
+            }
             
             // 刷新简历列表
             setTimeout(listResumes, 500);
@@ -185,6 +193,55 @@ async function uploadResume() {
     }
 }
 
+// 等待后台 AI 解析完成：优先使用 SSE，不支持或连接失败时轮询
+function watchEnrichment(resumeId) {
+    if (window.EventSource) {
+        const source = new EventSource(`${API_BASE_URL}/resume/${resumeId}/events`);
+        source.addEventListener('resume', (event) => {
+            const data = JSON.parse(event.data);
+            if (data.enrichment_status !== 'pending') {
+                source.close();
+                applyEnrichment(data);
+            }
+        });
+        source.addEventListener('end', () => source.close());
+        source.onerror = () => {
+            source.close();
+            pollEnrichment(resumeId, 0);
+        };
+        return;
+    }
+    pollEnrichment(resumeId, 0);
+}
+
+async function pollEnrichment(resumeId, attempt) {
+    if (attempt >= 30 || currentResumeId !== resumeId) return;
+
+    try {
+        const response = await fetch(`${API_BASE_URL}/resume/${resumeId}`);
+        const result = await response.json();
+        if (result.success && result.data.enrichment_status !== 'pending') {
+            applyEnrichment(result.data);
+            return;
+        }
+    } catch (error) {
+        console.error('查询解析状态错误:', error);
+    }
+    setTimeout(() => pollEnrichment(resumeId, attempt + 1), 2000);
+}
+
+// 用 AI 解析结果替换基础解析结果
+function applyEnrichment(data) {
+    if (currentResumeId !== data.resume_id) return;
+
+    if (data.enrichment_status === 'done') {
+        displayUploadResult({ ...data.extracted_info, resume_id: data.resume_id });
+        showStatus('uploadStatus', 'success', 'AI 解析完成');
+    } else {
+        showStatus('uploadStatus', 'error', 'AI 解析失败，显示的是基础解析结果');
+    }
+}
+
 // 显示上传结果
 function displayUploadResult(data) {
     // 基本信息
@@ -222,10 +279,53 @@ function displayUploadResult(data) {
         : '<p style="color: #999;">未提取到关键词</p>';
     document.getElementById('keywords').innerHTML = keywordsHtml;
 
+    // 摘要
+    const summaryElement = document.getElementById('summary');
+    if (data.summary) {
+        summaryElement.textContent = data.summary;
+    } else {
+        summaryElement.innerHTML = '<p style="color: #999;">暂无摘要</p>';
+    }
+
     // 简历 ID
     document.getElementById('resumeIdInfo').textContent = `简历 ID: ${currentResumeId}`;
 }
 
+// 流式生成 AI 摘要：逐段显示 LLM 输出，最终以 done 事件中的完整摘要为准
+function streamSummary() {
+    if (!currentResumeId) return;
+    if (!window.EventSource) {
+        showStatus('uploadStatus', 'error', '当前浏览器不支持流式摘要');
+        return;
+    }
+
+    const resumeId = currentResumeId;
+    const summaryElement = document.getElementById('summary');
+    summaryElement.textContent = '';
+    showStatus('uploadStatus', 'loading', 'AI 摘要生成中...');
+
+    const source = new EventSource(`${API_BASE_URL}/resume/${resumeId}/summary/stream`);
+    source.addEventListener('token', (event) => {
+        if (currentResumeId !== resumeId) return;
+        summaryElement.textContent += JSON.parse(event.data).text;
+    });
+    source.addEventListener('done', (event) => {
+        source.close();
+        if (currentResumeId !== resumeId) return;
+        const data = JSON.parse(event.data);
+        summaryElement.textContent = data.summary || '暂无摘要';
+        if (data.source === 'llm') {
+            showStatus('uploadStatus', 'success', 'AI 摘要生成完成');
+        } else {
+            showStatus('uploadStatus', 'error', 'AI 摘要生成失败，显示的是基础摘要');
+        }
+    });
+    source.onerror = () => {
+        source.close();
+        showStatus('uploadStatus', 'error', 'AI 摘要连接中断');
+    };
+}
+
 // 简历匹配
 async function matchResume() {
     const resumeSelect = document.getElementById('resumeSelect');
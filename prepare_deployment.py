@@ -64,6 +64,13 @@ def create_deployment_package():
         shutil.copytree(src_utils, dst_utils)
         print(f"   ✓ utils/")
     
+    # 复制 data 目录（技能词表）
+    src_data = backend_dir / 'data'
+    dst_data = package_dir / 'data'
+    if src_data.exists():
+        shutil.copytree(src_data, dst_data)
+        print(f"   ✓ data/")
+    
     # 安装 Python 依赖
     print("\n📦 安装 Python 依赖...")
     requirements = backend_dir / 'requirements.txt'